@@ -15,10 +15,17 @@ class Settings(BaseSettings):
     PORT: int = 8000
     RELOAD: bool = True
     
+    @property
+    def SERVERLESS(self) -> bool:
+        """Running as a serverless function (Vercel sets VERCEL=1); nothing may outlive a request"""
+        return bool(os.getenv("VERCEL"))
+    
     # Security Settings
     SECRET_KEY: str = "your-super-secret-key-change-this-in-production"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 1440
+    ENABLE_PROFILE_CLAIMS: bool = True  # Honour {"profile_claims": true} at login (its snapshot bridges profile-cache staleness across workers)
+    PROFILE_TOKEN_EXPIRE_MINUTES: int = 15  # Lifetime of profile-carrying access tokens; renew via /auth/refresh
     
     # CORS Settings - FIXED
     ALLOWED_ORIGINS_STR: str = "http://localhost:3000,http://localhost:3001,http://127.0.0.1:3000"
@@ -36,6 +43,14 @@ def ALLOWED_ORIGINS(self) -> List[str]:
     # Database Settings
     MONGODB_URL: str = "mongodb://localhost:27017"
     DATABASE_NAME: str = "recipe_recommendation_db"
+    MONGODB_POOL_PROFILE: str = "serverless"  # serverless | container | high_throughput (see app/database/pool_profiles.py)
+    MONGODB_MAX_POOL_SIZE: int = 0  # 0 = the profile's value
+    MONGODB_MIN_POOL_SIZE: int = 0  # 0 = the profile's value (connections opened ahead of demand)
+    MONGODB_WAIT_QUEUE_TIMEOUT_MS: int = 0  # 0 = the profile's value
+    MONGODB_COMPRESSORS: str = ""  # e.g. "zstd,zlib"; "none" turns compression off; empty = the profile's value
+    DB_HEARTBEAT_INTERVAL_SECONDS: float = 10.0  # Background ping cadence; requests themselves never ping
+    DB_HEARTBEAT_TIMEOUT_SECONDS: float = 3.0
+    DB_RECONNECT_AFTER_FAILURES: int = 3  # Consecutive failed probes before the next request rebuilds the client
     
     # AI Model Settings
     GEMINI_API_KEY: str = "your-gemini-api-key-here"
@@ -50,6 +65,7 @@ def ALLOWED_ORIGINS(self) -> List[str]:
     MODEL_CONFIDENCE_THRESHOLD: float = 0.5
     MAX_INGREDIENTS_DETECTED: int = 15
     MAX_RECIPE_GENERATION_RETRIES: int = 3
+    ENABLE_STRUCTURED_OUTPUT: bool = True  # JSON mode + response schema instead of an example blob in the prompt
     
     # File Upload Settings
     MAX_FILE_SIZE: int = 10 * 1024 * 1024
@@ -63,17 +79,98 @@ def ALLOWED_ORIGINS(self) -> List[str]:
     ENABLE_EMAIL_NOTIFICATIONS: bool = False
     ENABLE_ANALYTICS: bool = True
     ENABLE_BATCH_PROCESSING: bool = True
+    BATCH_MAX_SLOTS: int = 14
+    BATCH_MAX_PARALLEL: int = 3  # Concurrent model calls per batch request
+    BATCH_PACK_SIZE: int = 3  # Small slots packed into one structured call (1 disables packing)
+    BATCH_PACK_MAX_INGREDIENTS: int = 6
     ENABLE_RECIPE_CACHING: bool = True
+    RECIPE_CACHE_TTL_SECONDS: int = 6 * 60 * 60
+    RECIPE_CACHE_MAX_ENTRIES: int = 1000
+    ENABLE_CLOSE_MATCH: bool = True  # Serve a stored recipe with a similar ingredient set (MinHash/LSH)
+    CLOSE_MATCH_THRESHOLD: float = 0.6  # Minimum Jaccard similarity of ingredient sets
+    CLOSE_MATCH_NUM_PERM: int = 64
+    CLOSE_MATCH_BANDS: int = 12  # 12 bands x 5 rows: ~98% recall at Jaccard >= 0.6 (see benchmark)
+    CLOSE_MATCH_MAX_ENTRIES: int = 5000
+    CLOSE_MATCH_BACKGROUND_REFRESH: bool = True  # Generate the exact recipe in the background after a close match
+    ENABLE_RECIPE_POOL: bool = True  # Pre-generate popular requests during quiet hours
+    RECIPE_POOL_TOP_K: int = 20
+    RECIPE_POOL_VARIANTS: int = 3
+    RECIPE_POOL_TTL_SECONDS: int = 7 * 24 * 60 * 60
+    RECIPE_POOL_LOOKBACK_DAYS: int = 30
+    RECIPE_POOL_SCAN_LIMIT: int = 5000
+    RECIPE_POOL_QUIET_HOURS: str = "1-6"  # UTC, [start, end)
+    RECIPE_POOL_CHECK_INTERVAL_SECONDS: int = 15 * 60
+    RECIPE_POOL_MIN_CALL_INTERVAL_SECONDS: float = 5.0
+    RECIPE_POOL_MAX_BUSY_WORKERS: int = 1  # Back off while more LLM calls than this are in flight
+    ENABLE_RECIPE_JOBS: bool = False  # POST /recipes/jobs: queue a generation and poll or stream its result (needs a long-running worker)
+    RECIPE_JOB_CONCURRENCY: int = 2  # Jobs run at once per process
+    RECIPE_JOB_LEASE_SECONDS: int = 60  # A job whose worker stops renewing for this long is picked up again
+    RECIPE_JOB_POLL_INTERVAL: float = 2.0  # Seconds between queue checks when idle (and between status re-reads)
+    RECIPE_JOB_MAX_ATTEMPTS: int = 3
+    RECIPE_JOB_MAX_PENDING_PER_USER: int = 5  # Queued or running jobs per account before 429s
+    RECIPE_JOB_RESULT_TTL_SECONDS: int = 7 * 24 * 60 * 60  # Finished jobs are removed after this (history is kept)
+    RECIPE_JOB_MAX_WAIT_SECONDS: int = 25  # Longest long-poll (?wait=) and per-connection event stream
     ENABLE_USER_RECOMMENDATIONS: bool = True
     ENABLE_MOOD_ANALYSIS: bool = True
     
     # Performance Settings
-    MAX_CONCURRENT_REQUESTS: int = 100
-    REQUEST_TIMEOUT: int = 30
+    ENABLE_ADMISSION_CONTROL: bool = True
+    MAX_CONCURRENT_REQUESTS: int = 16  # Expensive (LLM / audio) requests running at once per worker; cheap endpoints are not counted
+    MAX_CONCURRENT_REQUESTS_PER_USER: int = 2  # Running per account; as many again may queue
+    ADMISSION_QUEUE_SIZE: int = 32  # Expensive requests waiting per worker before 429s
+    REQUEST_TIMEOUT: int = 30  # Longest an expensive request waits for admission before a 503
     DATABASE_CONNECTION_TIMEOUT: int = 10
+    ENABLE_HISTORY_WRITE_BEHIND: bool = False  # Answer /recipes/generate before its history and mood-log writes complete
+    ENABLE_PROFILE_CACHE: bool = True  # Serve user documents from memory on generation and /users/me
+    PROFILE_CACHE_TTL_SECONDS: int = 60  # Bounds staleness after an update made by another worker
+    PROFILE_CACHE_MAX_ENTRIES: int = 10000
+    PROFILE_CACHE_INVALIDATION: str = "none"  # none | change_stream: drop entries as soon as any worker updates a user
+    ENABLE_WRITE_BUFFER: bool = False  # Batch history and mood-log inserts per process (long-running servers only)
+    WRITE_BUFFER_MAX_DOCS: int = 100  # Flush once this many inserts are waiting
+    WRITE_BUFFER_FLUSH_MS: int = 250  # ...or this long after the first one arrived
+    LLM_EXECUTOR_MAX_WORKERS: int = 8  # Dedicated threads for blocking Gemini SDK calls
+    LLM_PRIORITY_MODE: str = "strict"  # strict | weighted: how waiting calls are picked across priority classes
+    LLM_PRIORITY_WEIGHTS: str = "8,4,1"  # weighted mode shares for interactive_short, interactive_long, background
+    LLM_BACKGROUND_MAX_WORKERS: int = 1  # Executor threads background work (pool pre-generation) may hold at once
+    LLM_RESERVED_SHORT_WORKERS: int = 1  # Executor threads kept for interactive_short calls (typed-ingredient extraction)
+    AI_INIT_PROBE: str = "deferred"  # eager: test call before first answer | deferred: test call in background | skip
+    AI_WARM_ON_FIRST_REQUEST: bool = True  # Start AI service init in the background on a process's first request
+    
+    # Metrics (Prometheus text format at /metrics)
+    ENABLE_METRICS: bool = True
+    METRICS_TOKEN: str = ""  # When set, /metrics requires "Authorization: Bearer <token>"
+    
+    # AI Call Retry Policies (per-attempt deadline, jittered backoff, hedging)
+    RETRY_BASE_DELAY: float = 0.5
+    RETRY_MAX_DELAY: float = 8.0
+    RECIPE_ATTEMPT_TIMEOUT: float = 20.0
+    ENABLE_HEDGED_REQUESTS: bool = True
+    HEDGE_PERCENTILE: float = 0.95
+    TEXT_EXTRACTION_ATTEMPT_TIMEOUT: float = 7.0
+    TEXT_EXTRACTION_TOTAL_TIMEOUT: float = 15.0
+    TEXT_EXTRACTION_MAX_ATTEMPTS: int = 2
+    AUDIO_EXTRACTION_ATTEMPT_TIMEOUT: float = 20.0
+    AUDIO_EXTRACTION_TOTAL_TIMEOUT: float = 30.0
+    AUDIO_EXTRACTION_MAX_ATTEMPTS: int = 2
+    
+    # AI Circuit Breaker (opens on error rate or slow-call rate, serves fallbacks while open)
+    CIRCUIT_BREAKER_WINDOW: int = 20
+    CIRCUIT_BREAKER_MIN_CALLS: int = 5
+    CIRCUIT_BREAKER_ERROR_RATE: float = 0.5
+    CIRCUIT_BREAKER_SLOW_CALL_SECONDS: float = 15.0
+    CIRCUIT_BREAKER_SLOW_CALL_RATE: float = 0.8
+    CIRCUIT_BREAKER_OPEN_SECONDS: float = 30.0
+    AI_REINIT_BASE_DELAY: float = 5.0
+    AI_REINIT_MAX_DELAY: float = 300.0
     
     # Development
-    MOCK_AI_RESPONSES: bool = False
+    LLM_PROVIDER: str = "gemini"  # gemini | mock (in-process stand-in) | mock_http (stand-in server at MOCK_AI_URL)
+    MOCK_AI_RESPONSES: bool = False  # Shorthand for LLM_PROVIDER=mock
+    MOCK_AI_URL: str = "http://127.0.0.1:8765"
+    MOCK_AI_LATENCY_MS: float = 1500.0  # Median latency of a recipe-sized call; short calls take a fraction
+    MOCK_AI_LATENCY_SIGMA: float = 0.4  # Log-normal spread (0 = constant latency)
+    MOCK_AI_ERROR_RATE: float = 0.0  # Share of calls failing like an overloaded model
+    MOCK_AI_SEED: int = 42
     
     class Config:
         env_file = ".env"
@@ -0,0 +1,222 @@
+# backend/app/core/metrics.py - PROMETHEUS TEXT-FORMAT METRICS (NO CLIENT LIBRARY)
+import bisect
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Tuple
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+# (name, type, help, [(labels, value), ...]) built at scrape time from existing stats()
+MetricFamily = Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(labels: Dict[str, Any]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class _Metric:
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple[str, ...], Any] = {}
+
+    def _key(self, labels: Dict[str, Any]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in sorted(items):
+            lines.extend(self._samples(dict(zip(self.labelnames, key)), value))
+        return lines
+
+    def _samples(self, labels: Dict[str, str], value: Any) -> List[str]:
+        return [f"{self.name}{_format_labels(labels)} {_format_value(value)}"]
+
+class Counter(_Metric):
+    type = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+class Histogram(_Metric):
+    """Fixed buckets; ``observe`` is a bisect and three additions under a lock"""
+
+    type = "histogram"
+    DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # Per-bucket (non-cumulative) counts plus one overflow slot, then sum
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            state[0][index] += 1
+            state[1] += value
+
+    def _samples(self, labels: Dict[str, str], value: Any) -> List[str]:
+        counts, total = value[0][:], value[1]
+        lines, cumulative = [], 0
+        for bound, count in zip(self.buckets + (float("inf"),), counts):
+            cumulative += count
+            lines.append(f"{self.name}_bucket{_format_labels({**labels, 'le': _format_value(bound)})} {cumulative}")
+        lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(total)}")
+        lines.append(f"{self.name}_count{_format_labels(labels)} {cumulative}")
+        return lines
+
+class Registry:
+    def __init__(self):
+        self.metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self.metrics.append(metric)
+        return metric
+
+    def render(self, families: Iterable[MetricFamily] = ()) -> str:
+        lines: List[str] = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        for name, kind, documentation, samples in families:
+            lines += [f"# HELP {name} {documentation}", f"# TYPE {name} {kind}"]
+            lines += [f"{name}{_format_labels(labels)} {_format_value(value)}" for labels, value in samples]
+        return "\n".join(lines) + "\n"
+
+REGISTRY = Registry()
+
+LLM_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 15.0, 30.0, 60.0)
+MONGO_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+HTTP_REQUEST_DURATION = REGISTRY.register(Histogram(
+    "http_request_duration_seconds",
+    "Time from request start until the response body is complete, by route template",
+    ("method", "route", "status")
+))
+LLM_CALL_DURATION = REGISTRY.register(Histogram(
+    "llm_call_duration_seconds",
+    "Model call latency on the LLM executor by call site, excluding queue wait",
+    ("call_site", "outcome"),
+    LLM_BUCKETS
+))
+LLM_QUEUE_WAIT = REGISTRY.register(Histogram(
+    "llm_queue_wait_seconds",
+    "Time a model call waited for an LLM executor thread, by call site and priority class",
+    ("call_site", "priority"),
+    LLM_BUCKETS
+))
+LLM_TOKENS = REGISTRY.register(Counter(
+    "llm_tokens_total",
+    "Prompt and output tokens reported by the model",
+    ("call_site", "kind")
+))
+MONGO_COMMAND_DURATION = REGISTRY.register(Histogram(
+    "mongodb_command_duration_seconds",
+    "MongoDB command round trip by collection and command",
+    ("collection", "command", "outcome"),
+    MONGO_BUCKETS
+))
+ADMISSION_WAIT = REGISTRY.register(Histogram(
+    "admission_queue_wait_seconds",
+    "Time expensive requests spent queued for admission",
+    ("outcome",),
+    LLM_BUCKETS
+))
+ADMISSION_REJECTED = REGISTRY.register(Counter(
+    "admission_rejected_total",
+    "Expensive requests turned away by admission control",
+    ("reason",)
+))
+
+def metrics_enabled() -> bool:
+    return get_settings().ENABLE_METRICS
+
+def record_llm_usage(call_site: str, response: Any):
+    """Count tokens from a Gemini-style response or final stream chunk"""
+    usage = getattr(response, "usage_metadata", None)
+    if usage is None:
+        return
+    prompt_tokens = getattr(usage, "prompt_token_count", 0) or 0
+    output_tokens = getattr(usage, "candidates_token_count", 0) or 0
+    if prompt_tokens:
+        LLM_TOKENS.inc(prompt_tokens, call_site=call_site, kind="prompt")
+    if output_tokens:
+        LLM_TOKENS.inc(output_tokens, call_site=call_site, kind="output")
+
+class MetricsMiddleware:
+    """Per-route latency histogram; labels use the route template so ids don't explode cardinality"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            HTTP_REQUEST_DURATION.observe(
+                time.perf_counter() - started,
+                method=scope["method"],
+                route=getattr(route, "path", "unmatched"),
+                status=status["code"]
+            )
+
+def counter_family(name: str, documentation: str, samples: List[Tuple[Dict[str, str], float]]) -> MetricFamily:
+    return (name, "counter", documentation, samples)
+
+def gauge_family(name: str, documentation: str, samples: List[Tuple[Dict[str, str], float]]) -> MetricFamily:
+    return (name, "gauge", documentation, samples)
+
+def collect(sources: Iterable[Callable[[], Iterable[MetricFamily]]]) -> List[MetricFamily]:
+    """Run scrape-time collectors; one failing source must not blank the whole scrape"""
+    families: List[MetricFamily] = []
+    for source in sources:
+        try:
+            families.extend(source())
+        except Exception as e:
+            logger.warning(f"Metrics collector {getattr(source, '__name__', source)} failed: {str(e)}")
+    return families
+
+def render(sources: Iterable[Callable[[], Iterable[MetricFamily]]] = ()) -> str:
+    return REGISTRY.render(collect(sources))
+
+_process_started = time.time()
+
+def process_families() -> List[MetricFamily]:
+    return [gauge_family("process_start_time_seconds", "Unix time the process started", [({}, _process_started)])]
@@ -0,0 +1,73 @@
+# backend/app/database/pool_profiles.py - MONGODB CONNECTION POOL PROFILES PER DEPLOYMENT SHAPE
+from typing import Any, Dict, Optional, Tuple
+
+from pymongo import ReadPreference, WriteConcern
+
+# Regenerable on a miss: an acknowledged write lost in a failover costs one model call at most
+_REGENERABLE = ("recipe_cache", "recipe_pool")
+
+POOL_PROFILES: Dict[str, Dict[str, Any]] = {
+    # One connection per function instance, closed when idle (Vercel)
+    "serverless": {
+        "client": {"maxPoolSize": 1, "minPoolSize": 0, "maxIdleTimeMS": 30000},
+        "collections": {}
+    },
+    # Long-lived uvicorn workers: concurrent requests get their own connections, a couple kept warm
+    "container": {
+        "client": {
+            "maxPoolSize": 10,
+            "minPoolSize": 2,
+            "maxIdleTimeMS": 120000,
+            "waitQueueTimeoutMS": 5000,
+            "compressors": "zlib"
+        },
+        "collections": {
+            name: {"write_concern": WriteConcern(w=1)} for name in _REGENERABLE
+        }
+    },
+    # Busy dedicated workers: a large warm pool, fail fast when it is exhausted,
+    # shared caches read from secondaries
+    "high_throughput": {
+        "client": {
+            "maxPoolSize": 50,
+            "minPoolSize": 10,
+            "maxIdleTimeMS": 300000,
+            "waitQueueTimeoutMS": 2000,
+            "compressors": "zlib"
+        },
+        "collections": {
+            **{
+                name: {"write_concern": WriteConcern(w=1), "read_preference": ReadPreference.SECONDARY_PREFERRED}
+                for name in _REGENERABLE
+            },
+            # Mood logs only feed trends; history, users, favorites and jobs stay on majority
+            "mood_logs": {"write_concern": WriteConcern(w=1)}
+        }
+    }
+}
+
+def resolve_pool_profile(settings, name: Optional[str] = None) -> Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+    """Client keyword arguments and per-collection options for ``MONGODB_POOL_PROFILE`` (or ``name``).
+
+    The ``MONGODB_*`` pool settings override the profile when set.
+    """
+    name = name or settings.MONGODB_POOL_PROFILE
+    if name not in POOL_PROFILES:
+        raise ValueError(f"Unknown MONGODB_POOL_PROFILE '{name}' (expected one of {', '.join(POOL_PROFILES)})")
+    profile = POOL_PROFILES[name]
+
+    client_options = dict(profile["client"])
+    if settings.MONGODB_MAX_POOL_SIZE > 0:
+        client_options["maxPoolSize"] = settings.MONGODB_MAX_POOL_SIZE
+    if settings.MONGODB_MIN_POOL_SIZE > 0:
+        client_options["minPoolSize"] = settings.MONGODB_MIN_POOL_SIZE
+    # pymongo rejects a warm pool larger than the pool itself
+    client_options["minPoolSize"] = min(client_options["minPoolSize"], client_options["maxPoolSize"])
+    if settings.MONGODB_WAIT_QUEUE_TIMEOUT_MS > 0:
+        client_options["waitQueueTimeoutMS"] = settings.MONGODB_WAIT_QUEUE_TIMEOUT_MS
+    if settings.MONGODB_COMPRESSORS:
+        if settings.MONGODB_COMPRESSORS == "none":
+            client_options.pop("compressors", None)
+        else:
+            client_options["compressors"] = settings.MONGODB_COMPRESSORS
+    return client_options, profile["collections"]
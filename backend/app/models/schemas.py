@@ -26,6 +26,11 @@ class CuisineEnum(str, Enum):
     MEDITERRANEAN = "mediterranean"
     ANY = "any"
 
+class DetailLevelEnum(str, Enum):
+    BRIEF = "brief"
+    STANDARD = "standard"
+    DETAILED = "detailed"
+
 class DietaryPreferenceEnum(str, Enum):
     VEGETARIAN = "vegetarian"
     VEGAN = "vegan"
@@ -72,6 +77,10 @@ def validate_password(cls, v):
 class UserLogin(BaseModel):
     email: EmailStr
     password: str
+    profile_claims: bool = False  # Short-lived access token carrying the profile, plus a refresh token
+
+class TokenRefresh(BaseModel):
+    refresh_token: str
 
 class UserResponse(BaseModel):
     id: str
@@ -103,6 +112,8 @@ class RecipeResponse(BaseModel):
     nutrition_info: NutritionInfo
     tags: List[str] = []
     mood_message: Optional[str] = None  # NEW FIELD - Personalized mood message
+    match_score: Optional[float] = None  # Set when served as a close match for a similar ingredient set
+    fallback: bool = False  # Generic placeholder served while the AI is unavailable
     generated_at: datetime = datetime.utcnow()
     
 class RecipeRequest(BaseModel):
@@ -111,6 +122,9 @@ class RecipeRequest(BaseModel):
     cuisine_preference: Optional[CuisineEnum] = CuisineEnum.ANY
     max_prep_time: Optional[int] = None
     servings: Optional[int] = 2
+    detail_level: DetailLevelEnum = DetailLevelEnum.STANDARD
+    force_fresh: bool = False  # Skip the recipe cache and always call the model
+    allow_close_match: bool = False  # Opt in to a stored recipe for a similar ingredient set (may use ingredients not listed)
     
     @validator('ingredients')
     def validate_ingredients(cls, v):
@@ -118,6 +132,44 @@ def validate_ingredients(cls, v):
             raise ValueError('At least one ingredient is required')
         return v
 
+class BatchRecipeRequest(BaseModel):
+    """Several recipe slots (e.g. a week of dinners) generated in one request"""
+    slots: List[RecipeRequest]
+    
+    @validator('slots')
+    def validate_slots(cls, v):
+        if len(v) < 1:
+            raise ValueError('At least one slot is required')
+        return v
+
+class BatchRecipeSlotResult(BaseModel):
+    index: int
+    recipe: Optional[RecipeResponse] = None
+    history_id: Optional[str] = None
+    error: Optional[str] = None
+
+class BatchRecipeResponse(BaseModel):
+    results: List[BatchRecipeSlotResult]
+    succeeded: int
+    failed: int
+
+class RecipeJobCreated(BaseModel):
+    """Returned by POST /recipes/jobs; poll status_url or subscribe to events_url"""
+    job_id: str
+    status: str
+    status_url: str
+    events_url: str
+
+class RecipeJobResponse(BaseModel):
+    job_id: str
+    status: str  # queued | running | succeeded | failed
+    attempts: int = 0
+    created_at: datetime
+    updated_at: datetime
+    recipe: Optional[RecipeResponse] = None
+    history_id: Optional[str] = None
+    error: Optional[str] = None
+
 # NEW: Voice/Audio ingredient detection
 class VoiceIngredientRequest(BaseModel):
     """Request model for text-based ingredient extraction"""
@@ -0,0 +1,102 @@
+# backend/app/routers/analytics.py - USER ANALYTICS
+from fastapi import APIRouter, HTTPException, Depends
+import logging
+
+from app.database.mongodb import get_database
+from app.routers.deps import get_current_user
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(tags=["analytics"])
+
+# ============== ANALYTICS ==============
+
+@router.get("/analytics/dashboard")
+async def get_user_dashboard(
+    current_user: str = Depends(get_current_user),
+    db = Depends(get_database)
+):
+    """Get dashboard data"""
+    try:
+        history = await db.get_recipe_history(current_user, limit=100)
+        mood_trends = await db.get_mood_trends(current_user, days=30)
+        ingredient_stats = await db.get_ingredient_usage_stats(current_user)
+        
+        favorites_cursor = db.database.favorites.find({"user_id": current_user})
+        favorites = await favorites_cursor.to_list(length=None)
+        
+        total_recipes = len(history)
+        
+        cuisine_counts = {}
+        for recipe_doc in history:
+            recipe = recipe_doc.get("recipe", {})
+            if recipe:
+                cuisine = recipe.get("cuisine_type", "unknown")
+                cuisine_counts[cuisine] = cuisine_counts.get(cuisine, 0) + 1
+        
+        most_used_cuisine = max(cuisine_counts.items(), key=lambda x: x[1])[0] if cuisine_counts else None
+        
+        cooking_times = [
+            recipe_doc.get("recipe", {}).get("total_time", 0) 
+            for recipe_doc in history 
+            if recipe_doc.get("recipe", {}).get("total_time")
+        ]
+        avg_cooking_time = sum(cooking_times) / len(cooking_times) if cooking_times else 0
+        
+        recent_recipes = [
+            {
+                "id": str(recipe_doc.get("_id")),
+                "title": recipe_doc.get("recipe", {}).get("title", "Unknown"),
+                "created_at": recipe_doc.get("created_at"),
+                "mood": recipe_doc.get("mood")
+            }
+            for recipe_doc in history[:5]
+        ]
+        
+        return {
+            "total_recipes_generated": total_recipes,
+            "total_favorites": len(favorites),
+            "mood_trends_count": len(mood_trends),
+            "unique_ingredients_used": len(ingredient_stats),
+            "most_used_cuisine": most_used_cuisine,
+            "avg_cooking_time_minutes": round(avg_cooking_time, 1),
+            "top_ingredients": ingredient_stats[:10],
+            "recent_recipes": recent_recipes
+        }
+    except Exception as e:
+        logger.error(f"Dashboard error: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/analytics/mood-trends")
+async def get_mood_trends(
+    current_user: str = Depends(get_current_user),
+    db = Depends(get_database),
+    days: int = 30
+):
+    """Get mood trends"""
+    try:
+        trends = await db.get_mood_trends(current_user, days)
+        return {
+            "trends": trends,
+            "period_days": days,
+            "total_entries": len(trends)
+        }
+    except Exception as e:
+        logger.error(f"Mood trends error: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/analytics/ingredient-stats")
+async def get_ingredient_statistics(
+    current_user: str = Depends(get_current_user),
+    db = Depends(get_database)
+):
+    """Get ingredient stats"""
+    try:
+        stats = await db.get_ingredient_usage_stats(current_user)
+        return {
+            "ingredients": stats,
+            "total_unique_ingredients": len(stats)
+        }
+    except Exception as e:
+        logger.error(f"Ingredient stats error: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
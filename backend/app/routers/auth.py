@@ -0,0 +1,370 @@
+# backend/app/routers/auth.py - AUTHENTICATION AND USER PROFILE
+from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi.responses import HTMLResponse
+import logging
+import os
+
+from app.database.mongodb import get_database
+from app.models.schemas import (
+    UserCreate, UserResponse, UserLogin, UserProfile,
+    EmailVerification,
+    ResendVerification,
+    PasswordResetRequest,
+    PasswordReset,
+    PasswordChange,
+    TokenRefresh
+)
+from app.routers.deps import get_auth_service, get_current_user, get_token_payload
+from app.services.profile_claims import PROFILE_CLAIM
+from app.utils.exceptions import CustomException
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(tags=["auth"])
+
+# ============== AUTHENTICATION ==============
+
+@router.post("/auth/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
+async def register_user(user_data: UserCreate, db = Depends(get_database)):
+    """Register a new user"""
+    try:
+        auth_service = get_auth_service()
+        user = await auth_service.create_user(user_data, db)
+        return UserResponse(
+            id=str(user["_id"]),
+            email=user["email"],
+            name=user["name"],
+            dietary_preferences=user["dietary_preferences"],
+            allergies=user["allergies"],
+            health_goals=user["health_goals"],
+            created_at=user["created_at"]
+        )
+    except CustomException as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    except Exception as e:
+        logger.error(f"Registration error: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/auth/login")
+async def login_user(user_credentials: UserLogin, db = Depends(get_database)):
+    """Login user and get access token"""
+    try:
+        auth_service = get_auth_service()
+        result = await auth_service.authenticate_user(user_credentials, db)
+        return result
+    except CustomException as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    except Exception as e:
+        logger.error(f"Login error: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/auth/refresh")
+async def refresh_token(data: TokenRefresh, db = Depends(get_database)):
+    """Exchange a refresh token for a new profile-carrying access token"""
+    try:
+        auth_service = get_auth_service()
+        return await auth_service.refresh_access_token(data.refresh_token, db)
+    except CustomException as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    except Exception as e:
+        logger.error(f"Token refresh error: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/auth/verify-email")
+async def verify_email(data: EmailVerification, db = Depends(get_database)):
+    """Verify user email with token"""
+    try:
+        auth_service = get_auth_service()
+        result = await auth_service.verify_email(data.token, db)
+        return result
+    except CustomException as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    except Exception as e:
+        logger.error(f"Email verification error: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/auth/resend-verification")
+async def resend_verification(data: ResendVerification, db = Depends(get_database)):
+    """Resend verification email"""
+    try:
+        auth_service = get_auth_service()
+        await auth_service.resend_verification_email(data.email, db)
+        return {
+            "message": "If an account exists with this email, a verification link has been sent."
+        }
+    except CustomException as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    except Exception as e:
+        logger.error(f"Resend verification error: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/auth/forgot-password")
+async def forgot_password(data: PasswordResetRequest, db = Depends(get_database)):
+    """Request password reset email"""
+    try:
+        auth_service = get_auth_service()
+        await auth_service.request_password_reset(data.email, db)
+        return {
+            "message": "If an account exists with this email, password reset instructions have been sent."
+        }
+    except Exception as e:
+        logger.error(f"Forgot password error: {str(e)}")
+        return {
+            "message": "If an account exists with this email, password reset instructions have been sent."
+        }
+
+@router.post("/auth/reset-password")
+async def reset_password(data: PasswordReset, db = Depends(get_database)):
+    """Reset password with token"""
+    try:
+        auth_service = get_auth_service()
+        success = await auth_service.reset_password(data.token, data.new_password, db)
+        if success:
+            return {
+                "message": "Password reset successful. You can now login with your new password."
+            }
+        else:
+            raise HTTPException(status_code=400, detail="Password reset failed")
+    except CustomException as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    except Exception as e:
+        logger.error(f"Reset password error: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/auth/change-password")
+async def change_password(
+    data: PasswordChange,
+    current_user: str = Depends(get_current_user),
+    db = Depends(get_database)
+):
+    """Change password (when logged in)"""
+    try:
+        auth_service = get_auth_service()
+        success = await auth_service.change_password(
+            current_user,
+            data.current_password,
+            data.new_password,
+            db
+        )
+        if success:
+            return {"message": "Password changed successfully"}
+        else:
+            raise HTTPException(status_code=400, detail="Password change failed")
+    except CustomException as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    except Exception as e:
+        logger.error(f"Change password error: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+# GET variant for the link in verification emails
+@router.get("/auth/verify-email")
+async def verify_email_get(token: str, db = Depends(get_database)):
+    """Verify user email with token (GET - for email links)"""
+    try:
+        auth_service = get_auth_service()
+        result = await auth_service.verify_email(token, db)
+        
+        # Return HTML redirect for better UX
+        html_content = f"""
+        <!DOCTYPE html>
+        <html>
+        <head>
+            <meta charset="utf-8">
+            <meta http-equiv="refresh" content="0;url={os.getenv('FRONTEND_URL', 'http://localhost:3000')}/verify-email?token={token}&success=true">
+            <title>Email Verified - MoodMunch</title>
+            <style>
+                body {{
+                    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
+                    display: flex;
+                    align-items: center;
+                    justify-content: center;
+                    min-height: 100vh;
+                    margin: 0;
+                    background: linear-gradient(135deg, #fce4ec 0%, #f3e5f5 50%, #e8eaf6 100%);
+                }}
+                .container {{
+                    text-align: center;
+                    padding: 40px;
+                    background: white;
+                    border-radius: 20px;
+                    box-shadow: 0 10px 40px rgba(0,0,0,0.1);
+                    max-width: 400px;
+                }}
+                .spinner {{
+                    width: 50px;
+                    height: 50px;
+                    border: 4px solid #f3f3f3;
+                    border-top: 4px solid #D946A6;
+                    border-radius: 50%;
+                    animation: spin 1s linear infinite;
+                    margin: 0 auto 20px;
+                }}
+                @keyframes spin {{
+                    0% {{ transform: rotate(0deg); }}
+                    100% {{ transform: rotate(360deg); }}
+                }}
+                h1 {{
+                    color: #D946A6;
+                    margin-bottom: 10px;
+                }}
+                p {{
+                    color: #666;
+                }}
+            </style>
+        </head>
+        <body>
+            <div class="container">
+                <div class="spinner"></div>
+                <h1>✅ Email Verified!</h1>
+                <p>Redirecting you to MoodMunch...</p>
+                <p style="font-size: 12px; color: #999; margin-top: 20px;">
+                    If you're not redirected, <a href="{os.getenv('FRONTEND_URL', 'http://localhost:3000')}/login">click here</a>
+                </p>
+            </div>
+        </body>
+        </html>
+        """
+        
+        return HTMLResponse(content=html_content)
+        
+    except CustomException as e:
+        # Return error HTML
+        html_content = f"""
+        <!DOCTYPE html>
+        <html>
+        <head>
+            <meta charset="utf-8">
+            <meta http-equiv="refresh" content="3;url={os.getenv('FRONTEND_URL', 'http://localhost:3000')}/resend-verification">
+            <title>Verification Error - MoodMunch</title>
+            <style>
+                body {{
+                    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
+                    display: flex;
+                    align-items: center;
+                    justify-content: center;
+                    min-height: 100vh;
+                    margin: 0;
+                    background: linear-gradient(135deg, #fce4ec 0%, #f3e5f5 50%, #e8eaf6 100%);
+                }}
+                .container {{
+                    text-align: center;
+                    padding: 40px;
+                    background: white;
+                    border-radius: 20px;
+                    box-shadow: 0 10px 40px rgba(0,0,0,0.1);
+                    max-width: 400px;
+                }}
+                h1 {{
+                    color: #EF4444;
+                    margin-bottom: 10px;
+                }}
+                p {{
+                    color: #666;
+                    margin-bottom: 20px;
+                }}
+                .btn {{
+                    display: inline-block;
+                    padding: 12px 24px;
+                    background: linear-gradient(135deg, #D946A6 0%, #9333EA 100%);
+                    color: white;
+                    text-decoration: none;
+                    border-radius: 10px;
+                    font-weight: 600;
+                }}
+            </style>
+        </head>
+        <body>
+            <div class="container">
+                <h1>❌ Verification Failed</h1>
+                <p>{e.detail}</p>
+                <p style="font-size: 14px; color: #999;">Redirecting to request a new link...</p>
+                <a href="{os.getenv('FRONTEND_URL', 'http://localhost:3000')}/resend-verification" class="btn">
+                    Request New Link
+                </a>
+            </div>
+        </body>
+        </html>
+        """
+        return HTMLResponse(content=html_content, status_code=e.status_code)
+    except Exception as e:
+        logger.error(f"Email verification error: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+# ============== USER PROFILE ==============
+
+@router.get("/users/me", response_model=UserResponse)
+async def get_current_user_profile(
+    current_user: str = Depends(get_current_user),
+    db = Depends(get_database)
+):
+    """Get current user profile"""
+    try:
+        user = await db.get_user_by_id(current_user)
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
+        
+        return UserResponse(
+            id=str(user["_id"]),
+            email=user["email"],
+            name=user["name"],
+            dietary_preferences=user.get("dietary_preferences", []),
+            allergies=user.get("allergies", []),
+            health_goals=user.get("health_goals", []),
+            created_at=user["created_at"]
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Get profile error: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.put("/users/me")
+async def update_user_profile(
+    profile_update: UserProfile,
+    current_user: str = Depends(get_current_user),
+    token_payload: dict = Depends(get_token_payload),
+    db = Depends(get_database)
+):
+    """Update user profile"""
+    try:
+        update_data = profile_update.dict(exclude_unset=True)
+        
+        if "dietary_preferences" in update_data:
+            update_data["dietary_preferences"] = [
+                pref.value if hasattr(pref, 'value') else pref 
+                for pref in update_data["dietary_preferences"]
+            ]
+        
+        if "health_goals" in update_data:
+            update_data["health_goals"] = [
+                goal.value if hasattr(goal, 'value') else goal 
+                for goal in update_data["health_goals"]
+            ]
+        
+        updated_user = await db.update_user_profile(current_user, update_data)
+        
+        if not updated_user:
+            raise HTTPException(status_code=404, detail="User not found")
+        
+        response = {
+            "message": "Profile updated",
+            "user": {
+                "id": str(updated_user["_id"]),
+                "email": updated_user["email"],
+                "name": updated_user["name"],
+                "dietary_preferences": updated_user.get("dietary_preferences", []),
+                "allergies": updated_user.get("allergies", []),
+                "health_goals": updated_user.get("health_goals", [])
+            }
+        }
+        
+        # A profile-carrying token now holds the old profile; hand back one with the new snapshot
+        if PROFILE_CLAIM in token_payload:
+            response["token"] = get_auth_service().create_profile_access_token(updated_user)
+        
+        return response
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Update profile error: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,92 @@
+# backend/app/routers/deps.py - SHARED DEPENDENCIES FOR THE API ROUTERS
+from fastapi import Depends, HTTPException, status
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+import logging
+
+from app.core.config import get_settings
+from app.utils.lazy_service import LazyService
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+security = HTTPBearer()
+
+# Service modules are imported by these factories, not at module load: the Gemini SDK
+# alone outweighs the rest of the app on a serverless cold start
+
+def _create_recipe_service():
+    from app.services.recipe_service import RecipeService
+    return RecipeService()
+
+def _create_voice_service():
+    from app.services.voice_ingredient_service import VoiceIngredientService
+    return VoiceIngredientService()
+
+def _start_recipe_pool(service):
+    from app.services.recipe_pool import get_recipe_pool
+    get_recipe_pool().ensure_running(service)
+
+def _start_recipe_jobs(service):
+    # Long-running workers pick up jobs left queued by other (or earlier) processes
+    from app.services.recipe_jobs import get_recipe_job_worker
+    get_recipe_job_worker().ensure_running(get_recipe_service)
+
+# Global instances - lazy initialized
+_auth_service = None
+recipe_service_slot = LazyService("Recipe service", _create_recipe_service, settings.AI_INIT_PROBE)
+voice_service_slot = LazyService("Voice service", _create_voice_service, settings.AI_INIT_PROBE)
+recipe_service_slot.on_ready(_start_recipe_pool)
+recipe_service_slot.on_ready(_start_recipe_jobs)
+
+def get_auth_service():
+    global _auth_service
+    if _auth_service is None:
+        from app.services.auth_service import AuthService
+        _auth_service = AuthService()
+    return _auth_service
+
+async def get_recipe_service():
+    return await recipe_service_slot.get()
+
+async def get_voice_service():
+    return await voice_service_slot.get()
+
+def warm_services():
+    """Start AI service initialization in the background without blocking the caller"""
+    recipe_service_slot.warm_in_background()
+    if settings.ENABLE_VOICE_INPUT:
+        voice_service_slot.warm_in_background()
+
+async def get_token_payload(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    """Verify JWT token and return its claims (decoded once per request)"""
+    try:
+        auth_service = get_auth_service()
+        return auth_service.decode_token(credentials.credentials)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid authentication credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+async def get_current_user(payload: dict = Depends(get_token_payload)):
+    """Verify JWT token and return user ID"""
+    return payload["user_id"]
+
+async def get_token_profile(payload: dict = Depends(get_token_payload)):
+    """Profile snapshot from a profile-carrying token, or None to read the user from the database.
+
+    A snapshot older than the profile this process last saw (updated here,
+    or cached since) is not used.
+    """
+    from app.services.profile_cache import get_profile_cache
+    from app.services.profile_claims import profile_from_claims
+    
+    profile = profile_from_claims(payload)
+    if profile is None:
+        return None
+    known_version = get_profile_cache().peek_version(payload["user_id"])
+    if known_version is not None and known_version > profile["profile_version"]:
+        return None
+    return profile
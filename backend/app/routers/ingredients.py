@@ -0,0 +1,91 @@
+# backend/app/routers/ingredients.py - INGREDIENT EXTRACTION (VOICE / TEXT)
+from fastapi import APIRouter, HTTPException, Depends, File, UploadFile
+import logging
+import os
+import time
+
+from app.models.schemas import VoiceIngredientRequest, IngredientExtractionResponse
+from app.routers.deps import settings, get_current_user, get_voice_service
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(tags=["ingredients"])
+
+# ============== INGREDIENT EXTRACTION ==============
+
+@router.post("/ingredients/extract-from-audio", response_model=IngredientExtractionResponse)
+async def extract_ingredients_from_audio(
+    file: UploadFile = File(...),
+    current_user: str = Depends(get_current_user)
+):
+    """Extract ingredients from voice/audio input"""
+    temp_path = None
+    try:
+        voice_service = await get_voice_service()
+        start_time = time.time()
+        
+        if not file.content_type or not file.content_type.startswith('audio/'):
+            raise HTTPException(status_code=400, detail="File must be audio")
+        
+        content = await file.read()
+        if len(content) > settings.MAX_AUDIO_FILE_SIZE:
+            raise HTTPException(status_code=400, detail="File too large")
+        
+        os.makedirs('/tmp/audio', exist_ok=True)
+        temp_path = f'/tmp/audio/{current_user}_{int(time.time())}.wav'
+        
+        with open(temp_path, 'wb') as f:
+            f.write(content)
+        
+        ingredients = await voice_service.transcribe_and_extract_ingredients(temp_path)
+        validation_result = await voice_service.validate_ingredients(ingredients)
+        
+        processing_time = time.time() - start_time
+        
+        return IngredientExtractionResponse(
+            ingredients=ingredients,
+            validated_ingredients=validation_result["validated_ingredients"],
+            suggestions=validation_result["suggestions"],
+            processing_time=round(processing_time, 2),
+            source="audio",
+            confidence=0.90
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Audio processing error: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        if temp_path and os.path.exists(temp_path):
+            try:
+                os.remove(temp_path)
+            except:
+                pass
+
+@router.post("/ingredients/extract-from-text", response_model=IngredientExtractionResponse)
+async def extract_ingredients_from_text(
+    request: VoiceIngredientRequest,
+    current_user: str = Depends(get_current_user)
+):
+    """Extract ingredients from text input"""
+    try:
+        voice_service = await get_voice_service()
+        start_time = time.time()
+        
+        ingredients = await voice_service.extract_from_text(request.text)
+        validation_result = await voice_service.validate_ingredients(ingredients)
+        
+        processing_time = time.time() - start_time
+        
+        return IngredientExtractionResponse(
+            ingredients=ingredients,
+            validated_ingredients=validation_result["validated_ingredients"],
+            suggestions=validation_result["suggestions"],
+            transcription=request.text,
+            processing_time=round(processing_time, 2),
+            source="text",
+            confidence=0.90
+        )
+    except Exception as e:
+        logger.error(f"Text extraction error: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
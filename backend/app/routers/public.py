@@ -0,0 +1,325 @@
+# backend/app/routers/public.py - HEALTH, READINESS AND PUBLIC STATS
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import JSONResponse, PlainTextResponse
+import logging
+from datetime import datetime
+
+from app.database.mongodb import get_database
+from app.routers.deps import settings, recipe_service_slot, voice_service_slot, warm_services
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(tags=["public"])
+
+# ============== HEALTH CHECK ==============
+
+@router.get("/live")
+@router.get("/api/live")
+async def liveness_check():
+    """Liveness: the process is up and serving; touches no dependencies"""
+    return {"status": "alive", "timestamp": datetime.utcnow().isoformat()}
+
+@router.get("/ready")
+@router.get("/api/ready")
+async def readiness_check():
+    """Readiness: database reachable and the recipe model initialized and warmed up"""
+    warm_services()
+    
+    try:
+        db = await get_database()
+        db_ready = await db.health_check()
+    except Exception as e:
+        logger.error(f"Readiness database check failed: {str(e)}")
+        db_ready = False
+    
+    services = {"recipe": recipe_service_slot.status()}
+    if settings.ENABLE_VOICE_INPUT:
+        services["voice"] = voice_service_slot.status()
+    
+    ready = db_ready and recipe_service_slot.ready
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={
+            "status": "ready" if ready else "not_ready",
+            "timestamp": datetime.utcnow().isoformat(),
+            "database": db_ready,
+            "services": services
+        }
+    )
+
+@router.get("/health")
+@router.get("/api/health")
+async def health_check():
+    """System health check with stats"""
+    from app.services.llm_executor import get_llm_executor
+    from app.services.llm_provider import get_llm_provider
+    from app.services.recipe_cache import get_recipe_cache
+    from app.services.profile_cache import get_profile_cache
+    from app.services.recipe_jobs import get_recipe_job_worker
+    from app.services.recipe_pool import get_recipe_pool
+    from app.services.recipe_similarity import get_recipe_similarity_index
+    from app.utils.admission import get_admission_controller
+    from app.utils.circuit_breaker import get_gemini_circuit_breaker
+    
+    try:
+        db = await get_database()
+        db_healthy = await db.health_check()
+        
+        gemini_configured = bool(
+            settings.GEMINI_API_KEY and 
+            settings.GEMINI_API_KEY != "your-gemini-api-key-here"
+        )
+        
+        total_recipes = await db.database.recipe_history.count_documents({})
+        total_users = await db.database.users.count_documents({"is_active": True})
+        
+        pipeline = [
+            {"$match": {"rating": {"$exists": True, "$ne": None}}},
+            {"$group": {
+                "_id": None,
+                "average_rating": {"$avg": "$rating"},
+                "total_ratings": {"$sum": 1}
+            }}
+        ]
+        
+        rating_cursor = db.database.recipe_history.aggregate(pipeline)
+        rating_data = await rating_cursor.to_list(length=1)
+        
+        if rating_data and len(rating_data) > 0 and rating_data[0].get("total_ratings", 0) > 0:
+            average_rating = round(rating_data[0]["average_rating"], 1)
+        else:
+            average_rating = 4.9
+        
+        logger.info(f"Health check - Recipes: {total_recipes}, Users: {total_users}, Rating: {average_rating}")
+        
+        _recipe_service = recipe_service_slot.instance
+        _voice_service = voice_service_slot.instance
+        
+        return {
+            "status": "healthy" if db_healthy else "degraded",
+            "timestamp": datetime.utcnow().isoformat(),
+            "version": "2.0.0",
+            "checks": {
+                "database": "connected" if db_healthy else "disconnected",
+                "gemini_ai": "configured" if gemini_configured else "not_configured",
+                "voice_input": settings.ENABLE_VOICE_INPUT
+            },
+            "llm_provider": get_llm_provider().describe(),
+            "llm_executor": get_llm_executor().stats(),
+            "admission": get_admission_controller().stats(),
+            "recipe_cache": get_recipe_cache().stats(),
+            "recipe_pool": get_recipe_pool().stats(),
+            "recipe_jobs": get_recipe_job_worker().stats(),
+            "database_heartbeat": db.health_stats(),
+            "write_buffer": db.write_buffer.stats() if db.write_buffer else None,
+            "profile_cache": get_profile_cache().stats(),
+            "recipe_similarity": get_recipe_similarity_index().stats(),
+            "recipe_single_flight": _recipe_service.single_flight.stats() if _recipe_service else None,
+            "recipe_generation": _recipe_service.usage_stats() if _recipe_service else None,
+            "ai_circuit_breaker": {
+                **get_gemini_circuit_breaker().stats(),
+                "recipe_service": _recipe_service.resilience_stats() if _recipe_service else None
+            },
+            "retry_policies": {
+                "recipe_generation": _recipe_service.retry_policy.stats() if _recipe_service else None,
+                "text_extraction": _voice_service.text_policy.stats() if _voice_service else None,
+                "audio_extraction": _voice_service.audio_policy.stats() if _voice_service else None
+            },
+            "stats": {
+                "total_recipes": total_recipes,
+                "total_users": total_users,
+                "average_rating": average_rating
+            }
+        }
+    except Exception as e:
+        logger.error(f"Health check failed: {str(e)}")
+        return {
+            "status": "unhealthy",
+            "timestamp": datetime.utcnow().isoformat(),
+            "error": str(e),
+            "stats": {
+                "total_recipes": 0,
+                "total_users": 0,
+                "average_rating": 4.9
+            }
+        }
+
+# ============== METRICS ==============
+
+def _llm_families():
+    from app.core.metrics import counter_family, gauge_family
+    from app.services.llm_executor import get_llm_executor
+    from app.utils.circuit_breaker import get_gemini_circuit_breaker
+
+    executor = get_llm_executor().stats()
+    breaker = get_gemini_circuit_breaker().stats()
+    families = [
+        gauge_family("llm_executor_queue_depth", "Model calls waiting for an executor thread", [({}, executor["queue_depth"])]),
+        gauge_family("llm_executor_in_flight", "Model calls running on the executor", [({}, executor["in_flight"])]),
+        gauge_family("llm_executor_max_workers", "Executor thread count", [({}, executor["max_workers"])]),
+        gauge_family("llm_executor_class_queued", "Model calls waiting, by priority class", [
+            ({"priority": name}, stats["queued"]) for name, stats in executor["priority_classes"].items()
+        ]),
+        gauge_family("llm_executor_class_running", "Model calls running, by priority class", [
+            ({"priority": name}, stats["running"]) for name, stats in executor["priority_classes"].items()
+        ]),
+        counter_family("llm_calls_total", "Model calls submitted to the executor", [
+            ({"call_site": site}, stats["calls"]) for site, stats in executor["call_sites"].items()
+        ]),
+        gauge_family("ai_circuit_breaker_open", "1 while the AI circuit breaker is open or half-open", [
+            ({"state": breaker["state"]}, int(breaker["state"] != "closed"))
+        ]),
+        counter_family("ai_circuit_breaker_rejected_total", "Calls refused by the open breaker", [({}, breaker["rejected"])])
+    ]
+
+    policies = {}
+    if recipe_service_slot.instance:
+        policies["recipe_generation"] = recipe_service_slot.instance.retry_policy
+    if voice_service_slot.instance:
+        policies["text_extraction"] = voice_service_slot.instance.text_policy
+        policies["audio_extraction"] = voice_service_slot.instance.audio_policy
+    for field, documentation in (
+        ("attempts", "Attempts made by the AI retry policy"),
+        ("retries", "Attempts that were retries"),
+        ("timeouts", "Attempts that hit their deadline"),
+        ("failures", "Operations that failed after all attempts"),
+        ("hedges_fired", "Hedged duplicate requests fired")
+    ):
+        families.append(counter_family(f"llm_retry_{field}_total", documentation, [
+            ({"policy": name}, getattr(policy, field)) for name, policy in policies.items()
+        ]))
+    return families
+
+def _cache_families():
+    from app.core.metrics import counter_family, gauge_family
+    from app.services.profile_cache import get_profile_cache
+    from app.services.recipe_cache import get_recipe_cache
+    from app.services.recipe_pool import get_recipe_pool
+    from app.services.recipe_similarity import get_recipe_similarity_index
+
+    cache = get_recipe_cache().stats()
+    pool = get_recipe_pool().stats()
+    similarity = get_recipe_similarity_index().stats()
+    profiles = get_profile_cache().stats()
+    return [
+        counter_family("recipe_cache_lookups_total", "Recipe cache lookups by outcome", [
+            ({"result": "memory_hit"}, cache["memory_hits"]),
+            ({"result": "mongo_hit"}, cache["mongo_hits"]),
+            ({"result": "miss"}, cache["misses"])
+        ]),
+        gauge_family("recipe_cache_hit_ratio", "Share of recipe cache lookups served from either tier", [({}, cache["hit_ratio"])]),
+        gauge_family("recipe_cache_entries", "Entries in the in-process recipe cache", [({}, cache["entries"])]),
+        counter_family("recipe_pool_lookups_total", "Ready-pool lookups by outcome", [
+            ({"result": "hit"}, pool["hits"]),
+            ({"result": "miss"}, pool["misses"])
+        ]),
+        gauge_family("recipe_pool_hit_ratio", "Share of ready-pool lookups that served a recipe", [({}, pool["hit_ratio"])]),
+        counter_family("recipe_close_match_lookups_total", "Close-match index lookups by outcome", [
+            ({"result": "match"}, similarity["matches"]),
+            ({"result": "miss"}, similarity["lookups"] - similarity["matches"])
+        ]),
+        gauge_family("recipe_close_match_ratio", "Share of close-match lookups that found a recipe", [({}, similarity["match_ratio"])]),
+        counter_family("profile_cache_lookups_total", "User profile cache lookups by outcome", [
+            ({"result": "hit"}, profiles["hits"]),
+            ({"result": "miss"}, profiles["misses"])
+        ]),
+        counter_family("profile_cache_invalidations_total", "Cached profiles dropped after a write, by origin", [
+            ({"origin": "local"}, profiles["invalidations"]),
+            ({"origin": "remote"}, profiles["remote_invalidations"])
+        ]),
+        gauge_family("profile_cache_hit_ratio", "Share of user lookups served from the profile cache", [({}, profiles["hit_ratio"])]),
+        gauge_family("profile_cache_entries", "Users in the in-process profile cache", [({}, profiles["entries"])])
+    ]
+
+def _admission_families():
+    from app.core.metrics import counter_family, gauge_family
+    from app.utils.admission import get_admission_controller
+
+    admission = get_admission_controller().stats()
+    return [
+        gauge_family("admission_active", "Expensive requests running", [({}, admission["active"])]),
+        gauge_family("admission_queued", "Expensive requests waiting for admission", [({}, admission["queued"])]),
+        gauge_family("admission_max_concurrent", "Expensive requests allowed to run at once", [({}, admission["max_concurrent"])]),
+        counter_family("admission_admitted_total", "Expensive requests admitted", [({}, admission["admitted"])])
+    ]
+
+def _database_families():
+    from app.core.metrics import counter_family, gauge_family
+    from app.database.mongodb import current_database
+
+    db = current_database()
+    if db is None:
+        return []
+    heartbeat = db.health_stats()
+    return [
+        gauge_family("mongodb_up", "1 if the last heartbeat ping succeeded", [({}, int(bool(heartbeat["healthy"])))]),
+        gauge_family("mongodb_heartbeat_consecutive_failures", "Failed heartbeat pings in a row", [({}, heartbeat["consecutive_failures"])]),
+        counter_family("mongodb_heartbeat_probes_total", "Heartbeat pings by outcome", [
+            ({"result": "ok"}, heartbeat["probes"] - heartbeat["probe_failures"]),
+            ({"result": "error"}, heartbeat["probe_failures"])
+        ]),
+        counter_family("mongodb_connects_total", "Clients built by get_database(), including the first", [({}, heartbeat["connects"])])
+    ]
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics_endpoint(request: Request):
+    """Prometheus scrape target; service counters are read from their stats() at scrape time"""
+    from app.core import metrics
+
+    if not settings.ENABLE_METRICS:
+        return JSONResponse(status_code=404, content={"detail": "Not Found"})
+    if settings.METRICS_TOKEN and request.headers.get("authorization") != f"Bearer {settings.METRICS_TOKEN}":
+        return JSONResponse(status_code=401, content={"detail": "Invalid metrics token"})
+
+    body = metrics.render([metrics.process_families, _llm_families, _admission_families, _cache_families, _database_families])
+    return PlainTextResponse(body, media_type=metrics.CONTENT_TYPE)
+
+# ============== PUBLIC STATS ENDPOINT ==============
+
+@router.get("/api/public/stats")
+async def get_public_stats(db = Depends(get_database)):
+    """Get public statistics for landing page - NO AUTH REQUIRED"""
+    try:
+        # Get total recipes count
+        total_recipes = await db.database.recipe_history.count_documents({})
+        
+        # Get total users count
+        total_users = await db.database.users.count_documents({"is_active": True})
+        
+        # Calculate average rating from recipe history
+        pipeline = [
+            {"$match": {"rating": {"$exists": True, "$ne": None}}},
+            {"$group": {
+                "_id": None,
+                "average_rating": {"$avg": "$rating"},
+                "total_ratings": {"$sum": 1}
+            }}
+        ]
+        
+        rating_cursor = db.database.recipe_history.aggregate(pipeline)
+        rating_data = await rating_cursor.to_list(length=1)
+        
+        if rating_data and len(rating_data) > 0 and rating_data[0].get("total_ratings", 0) > 0:
+            average_rating = round(rating_data[0]["average_rating"], 1)
+        else:
+            # If no ratings yet, use default
+            average_rating = 4.9
+        
+        logger.info(f"Public stats - Recipes: {total_recipes}, Users: {total_users}, Rating: {average_rating}")
+        
+        return {
+            "total_recipes": total_recipes,
+            "total_users": total_users,
+            "average_rating": average_rating,
+            "timestamp": datetime.utcnow().isoformat()
+        }
+    except Exception as e:
+        logger.error(f"Error fetching public stats: {str(e)}")
+        # Return reasonable defaults if error
+        return {
+            "total_recipes": 0,
+            "total_users": 0,
+            "average_rating": 4.9,
+            "timestamp": datetime.utcnow().isoformat(),
+            "error": str(e)
+        }
@@ -0,0 +1,528 @@
+# backend/app/routers/recipes.py - RECIPE GENERATION, HISTORY, FAVORITES AND RATINGS
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Depends, Query
+from fastapi.responses import StreamingResponse
+from fastapi.encoders import jsonable_encoder
+import asyncio
+import logging
+import json
+import time
+from datetime import datetime
+
+from app.database.mongodb import get_database
+from app.models.schemas import (
+    RecipeRequest, RecipeResponse,
+    BatchRecipeRequest, BatchRecipeResponse, BatchRecipeSlotResult,
+    RecipeJobCreated, RecipeJobResponse,
+    RatingRequest
+)
+from app.routers.deps import settings, get_current_user, get_recipe_service, get_token_profile
+from app.services.recipe_history import (
+    recipe_history_document, mood_log_document,
+    generated_recipe_documents, write_generated_recipe, write_generated_recipe_behind
+)
+from app.utils.exceptions import CustomException
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(tags=["recipes"])
+
+# ============== RECIPE GENERATION ==============
+
+async def _generation_profile(db, current_user: str, token_profile):
+    """Profile for the prompt: the (cached) user, or the access token's snapshot when that is newer.
+
+    The snapshot only wins over a cache entry that predates a profile update
+    made through another worker. None when the account is gone or
+    deactivated, whatever the token carries.
+    """
+    user = await db.get_user_by_id(current_user)
+    if user is None or token_profile is None:
+        return user
+    if user.get("profile_version", 0) >= token_profile["profile_version"]:
+        return user
+    return token_profile
+
+@router.post("/recipes/generate", response_model=RecipeResponse)
+async def generate_recipe(
+    recipe_request: RecipeRequest,
+    background_tasks: BackgroundTasks,
+    current_user: str = Depends(get_current_user),
+    token_profile = Depends(get_token_profile),
+    db = Depends(get_database)
+):
+    """Generate personalized recipe"""
+    try:
+        recipe_service, user = await asyncio.gather(
+            get_recipe_service(),
+            _generation_profile(db, current_user, token_profile)
+        )
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
+        
+        recipe = await recipe_service.generate_recipe(
+            ingredients=recipe_request.ingredients,
+            mood=recipe_request.mood,
+            dietary_preferences=user.get("dietary_preferences", []),
+            allergies=user.get("allergies", []),
+            health_goals=user.get("health_goals", []),
+            cuisine_preference=recipe_request.cuisine_preference,
+            db=db,
+            force_fresh=recipe_request.force_fresh,
+            servings=recipe_request.servings or 2,
+            detail_level=recipe_request.detail_level,
+            allow_close_match=recipe_request.allow_close_match
+        )
+        
+        history, mood_log = generated_recipe_documents(current_user, recipe_request, recipe, user)
+        if settings.ENABLE_HISTORY_WRITE_BEHIND:
+            # Starts now, tracked so this user's next read of the returned id waits for it; the
+            # background task keeps the request (and a serverless instance) alive until it lands
+            write = db.write_behind(current_user, write_generated_recipe_behind(db, history, mood_log))
+            background_tasks.add_task(asyncio.wait, {write})
+        else:
+            await write_generated_recipe(db, history, mood_log)
+        
+        # A copy: the service may hand the same cached instance to other requests
+        return recipe.copy(update={"id": str(history["_id"])})
+    except HTTPException:
+        raise
+    except CustomException as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    except Exception as e:
+        logger.error(f"Recipe generation error: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+def sse_event(event: str, data) -> str:
+    """Format one Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(jsonable_encoder(data))}\n\n"
+
+@router.post("/recipes/generate/stream")
+async def generate_recipe_stream(
+    recipe_request: RecipeRequest,
+    current_user: str = Depends(get_current_user),
+    token_profile = Depends(get_token_profile),
+    db = Depends(get_database)
+):
+    """Generate personalized recipe, streaming fields as Server-Sent Events"""
+    try:
+        recipe_service = await get_recipe_service()
+        
+        user = await _generation_profile(db, current_user, token_profile)
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Recipe stream setup error: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    async def event_stream():
+        try:
+            async for event, data in recipe_service.stream_recipe(
+                ingredients=recipe_request.ingredients,
+                mood=recipe_request.mood,
+                dietary_preferences=user.get("dietary_preferences", []),
+                allergies=user.get("allergies", []),
+                health_goals=user.get("health_goals", []),
+                cuisine_preference=recipe_request.cuisine_preference,
+                db=db,
+                force_fresh=recipe_request.force_fresh,
+                servings=recipe_request.servings or 2,
+                detail_level=recipe_request.detail_level,
+                allow_close_match=recipe_request.allow_close_match
+            ):
+                if event == "recipe":
+                    history, mood_log = generated_recipe_documents(current_user, recipe_request, data, user)
+                    history_id = str(history["_id"])
+                    write = None
+                    if settings.ENABLE_HISTORY_WRITE_BEHIND:
+                        # Registered before the id goes out, so a read of it waits for the insert
+                        write = db.write_behind(current_user, write_generated_recipe_behind(db, history, mood_log))
+                    else:
+                        await write_generated_recipe(db, history, mood_log)
+                    yield sse_event("recipe", {"recipe": data.copy(update={"id": history_id}), "history_id": history_id})
+                    if write is not None:
+                        await write
+                else:
+                    yield sse_event(event, data)
+        except CustomException as e:
+            yield sse_event("error", {"status_code": e.status_code, "detail": e.detail})
+        except Exception as e:
+            logger.error(f"Recipe stream error: {str(e)}")
+            yield sse_event("error", {"status_code": 500, "detail": str(e)})
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.post("/recipes/generate/batch", response_model=BatchRecipeResponse)
+async def generate_recipe_batch(
+    batch_request: BatchRecipeRequest,
+    current_user: str = Depends(get_current_user),
+    token_profile = Depends(get_token_profile),
+    db = Depends(get_database)
+):
+    """Generate several recipes (e.g. a meal plan) in one request; failed slots are reported, not fatal"""
+    if not settings.ENABLE_BATCH_PROCESSING:
+        raise HTTPException(status_code=404, detail="Batch recipe generation is disabled")
+    if len(batch_request.slots) > settings.BATCH_MAX_SLOTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.BATCH_MAX_SLOTS} recipes per batch"
+        )
+    
+    try:
+        recipe_service = await get_recipe_service()
+        
+        user = await _generation_profile(db, current_user, token_profile)
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
+        
+        outcomes = await recipe_service.generate_batch(
+            batch_request.slots,
+            dietary_preferences=user.get("dietary_preferences", []),
+            allergies=user.get("allergies", []),
+            health_goals=user.get("health_goals", []),
+            db=db
+        )
+        
+        results = []
+        generated = []
+        for index, (slot, outcome) in enumerate(zip(batch_request.slots, outcomes)):
+            if isinstance(outcome, RecipeResponse):
+                results.append(BatchRecipeSlotResult(index=index, recipe=outcome))
+                generated.append((slot, outcome))
+            else:
+                detail = outcome.detail if isinstance(outcome, CustomException) else str(outcome)
+                logger.error(f"Batch slot {index} failed: {detail}")
+                results.append(BatchRecipeSlotResult(index=index, error=detail))
+        
+        # One insert_many per collection for the whole batch, both in flight at once
+        history_ids, _ = await asyncio.gather(
+            db.save_recipe_histories([
+                recipe_history_document(current_user, slot, recipe, user) for slot, recipe in generated
+            ]),
+            db.save_mood_logs([mood_log_document(current_user, slot) for slot, _ in generated])
+        )
+        
+        succeeded = [result for result in results if result.recipe is not None]
+        for result, history_id in zip(succeeded, history_ids):
+            result.history_id = history_id
+            result.recipe = result.recipe.copy(update={"id": history_id})
+        
+        return BatchRecipeResponse(
+            results=results,
+            succeeded=len(succeeded),
+            failed=len(results) - len(succeeded)
+        )
+    except HTTPException:
+        raise
+    except CustomException as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    except Exception as e:
+        logger.error(f"Batch recipe generation error: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+# ============== RECIPE JOBS ==============
+
+def _recipe_job_worker():
+    from app.services.recipe_jobs import get_recipe_job_worker
+    worker = get_recipe_job_worker()
+    if not worker.enabled:
+        raise HTTPException(status_code=404, detail="Recipe jobs are disabled")
+    return worker
+
+@router.post("/recipes/jobs", response_model=RecipeJobCreated, status_code=202)
+async def create_recipe_job(
+    recipe_request: RecipeRequest,
+    current_user: str = Depends(get_current_user),
+    db = Depends(get_database)
+):
+    """Queue a recipe generation and return at once; the recipe is saved to history when done"""
+    from app.services.recipe_jobs import job_document
+    worker = _recipe_job_worker()
+    
+    try:
+        pending = await db.count_pending_recipe_jobs(current_user)
+        if pending >= settings.RECIPE_JOB_MAX_PENDING_PER_USER:
+            raise HTTPException(
+                status_code=429,
+                detail="Too many recipe jobs in progress for this account. Please wait for them to finish.",
+                headers={"Retry-After": str(int(settings.RECIPE_JOB_POLL_INTERVAL * 5))}
+            )
+        
+        job_id = await db.create_recipe_job(job_document(current_user, recipe_request))
+        worker.ensure_running(get_recipe_service)
+        worker.notify_submitted()
+        
+        return RecipeJobCreated(
+            job_id=job_id,
+            status="queued",
+            status_url=f"/recipes/jobs/{job_id}",
+            events_url=f"/recipes/jobs/{job_id}/events"
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Recipe job submit error: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/recipes/jobs/{job_id}", response_model=RecipeJobResponse)
+async def get_recipe_job(
+    job_id: str,
+    wait: float = Query(0, ge=0, description="Seconds to hold the request open until the job finishes"),
+    current_user: str = Depends(get_current_user),
+    db = Depends(get_database)
+):
+    """Job status and, once it has succeeded, the recipe; ?wait= long-polls"""
+    from app.services.recipe_jobs import job_view
+    worker = _recipe_job_worker()
+    
+    try:
+        job = await worker.wait_for_job(db, job_id, current_user, min(wait, settings.RECIPE_JOB_MAX_WAIT_SECONDS))
+    except Exception as e:
+        logger.error(f"Recipe job lookup error: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+    if job is None:
+        raise HTTPException(status_code=404, detail="Recipe job not found")
+    return RecipeJobResponse(**job_view(job))
+
+@router.get("/recipes/jobs/{job_id}/events")
+async def stream_recipe_job(
+    job_id: str,
+    current_user: str = Depends(get_current_user),
+    db = Depends(get_database)
+):
+    """Job progress as Server-Sent Events: status changes, then a final recipe or error event"""
+    from app.services.recipe_jobs import TERMINAL_STATUSES, JOB_SUCCEEDED, job_view
+    worker = _recipe_job_worker()
+    
+    job = await db.get_recipe_job(job_id, current_user)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Recipe job not found")
+    
+    async def event_stream():
+        current = job
+        # Capped so a connection is not held past a serverless function's limit; clients reconnect
+        deadline = time.monotonic() + settings.RECIPE_JOB_MAX_WAIT_SECONDS
+        try:
+            yield sse_event("status", {"status": current["status"], "attempts": current.get("attempts", 0)})
+            while current["status"] not in TERMINAL_STATUSES:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    yield sse_event("timeout", {"status": current["status"]})
+                    return
+                previous = current["status"]
+                current = await worker.wait_for_job(db, job_id, current_user, min(remaining, 10), changed_from=previous)
+                if current is None:
+                    yield sse_event("error", {"status_code": 404, "detail": "Recipe job not found"})
+                    return
+                if current["status"] == previous:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield sse_event("status", {"status": current["status"], "attempts": current.get("attempts", 0)})
+            
+            view = job_view(current)
+            if current["status"] == JOB_SUCCEEDED:
+                yield sse_event("recipe", {"recipe": view["recipe"], "history_id": view["history_id"]})
+            else:
+                yield sse_event("error", {"status_code": 500, "detail": view["error"]})
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Recipe job stream error: {str(e)}")
+            yield sse_event("error", {"status_code": 500, "detail": str(e)})
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+# ============== RECIPE HISTORY ==============
+
+@router.get("/recipes/history")
+async def get_recipe_history(
+    current_user: str = Depends(get_current_user),
+    db = Depends(get_database),
+    limit: int = 10,
+    skip: int = 0
+):
+    """Get user's recipe history"""
+    try:
+        history = await db.get_recipe_history(current_user, limit, skip)
+        
+        for item in history:
+            if "_id" in item:
+                item["_id"] = str(item["_id"])
+            if "recipe" in item and "_id" in item["recipe"]:
+                item["recipe"]["_id"] = str(item["recipe"]["_id"])
+        
+        return {
+            "recipes": history,
+            "total": len(history),
+            "limit": limit,
+            "skip": skip,
+            "has_more": len(history) == limit
+        }
+    except Exception as e:
+        logger.error(f"Get history error: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/recipes/history/{recipe_id}")
+async def get_recipe_by_id(
+    recipe_id: str,
+    current_user: str = Depends(get_current_user),
+    db = Depends(get_database)
+):
+    """Get specific recipe"""
+    try:
+        from bson import ObjectId
+        
+        await db.flush_user_writes(current_user)
+        recipe = await db.database.recipe_history.find_one({
+            "_id": ObjectId(recipe_id),
+            "user_id": current_user
+        })
+        
+        if not recipe:
+            raise HTTPException(status_code=404, detail="Recipe not found")
+        
+        recipe["_id"] = str(recipe["_id"])
+        return recipe
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Get recipe error: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.delete("/recipes/history/{recipe_id}")
+async def delete_recipe(
+    recipe_id: str,
+    current_user: str = Depends(get_current_user),
+    db = Depends(get_database)
+):
+    """Delete recipe"""
+    try:
+        from bson import ObjectId
+        
+        await db.flush_user_writes(current_user)
+        result = await db.database.recipe_history.delete_one({
+            "_id": ObjectId(recipe_id),
+            "user_id": current_user
+        })
+        
+        if result.deleted_count == 0:
+            raise HTTPException(status_code=404, detail="Recipe not found")
+        
+        return {"message": "Recipe deleted"}
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Delete recipe error: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+# ============== FAVORITES ==============
+
+@router.post("/recipes/{recipe_id}/favorite")
+async def toggle_favorite_recipe(
+    recipe_id: str,
+    current_user: str = Depends(get_current_user),
+    db = Depends(get_database)
+):
+    """Toggle favorite"""
+    try:
+        is_favorited = await db.toggle_favorite_recipe(current_user, recipe_id)
+        return {
+            "recipe_id": recipe_id,
+            "is_favorited": is_favorited,
+            "message": "Added to favorites" if is_favorited else "Removed from favorites"
+        }
+    except Exception as e:
+        logger.error(f"Toggle favorite error: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/recipes/favorites")
+async def get_favorite_recipes(
+    current_user: str = Depends(get_current_user),
+    db = Depends(get_database)
+):
+    """Get favorites"""
+    try:
+        from bson import ObjectId
+        
+        favorite_cursor = db.database.favorites.find({"user_id": current_user})
+        favorite_docs = await favorite_cursor.to_list(length=None)
+        
+        if not favorite_docs:
+            return {"favorites": [], "total": 0}
+        
+        recipe_ids = []
+        for doc in favorite_docs:
+            try:
+                recipe_id = doc.get("recipe_id")
+                if recipe_id:
+                    recipe_ids.append(ObjectId(recipe_id) if isinstance(recipe_id, str) else recipe_id)
+            except:
+                continue
+        
+        if not recipe_ids:
+            return {"favorites": [], "total": 0}
+        
+        await db.flush_user_writes(current_user)
+        recipe_cursor = db.database.recipe_history.find({"_id": {"$in": recipe_ids}})
+        recipes = await recipe_cursor.to_list(length=None)
+        
+        for recipe in recipes:
+            if "_id" in recipe:
+                recipe["_id"] = str(recipe["_id"])
+        
+        return {"favorites": recipes, "total": len(recipes)}
+    except Exception as e:
+        logger.error(f"Get favorites error: {str(e)}")
+        return {"favorites": [], "total": 0, "error": str(e)}
+
+# ============== RECIPE RATING ==============
+
+@router.post("/recipes/history/{recipe_id}/rate")
+async def rate_recipe(
+    recipe_id: str,
+    rating_data: RatingRequest,
+    current_user: str = Depends(get_current_user),
+    db = Depends(get_database)
+):
+    """Rate a recipe (1-5 stars)"""
+    try:
+        from bson import ObjectId
+        
+        rating = rating_data.rating
+        
+        await db.flush_user_writes(current_user)
+        result = await db.database.recipe_history.update_one(
+            {
+                "_id": ObjectId(recipe_id),
+                "user_id": current_user
+            },
+            {
+                "$set": {
+                    "rating": rating,
+                    "rated_at": datetime.utcnow()
+                }
+            }
+        )
+        
+        if result.matched_count == 0:
+            raise HTTPException(status_code=404, detail="Recipe not found")
+        
+        return {
+            "message": "Recipe rated successfully",
+            "recipe_id": recipe_id,
+            "rating": rating
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Rate recipe error: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
@@ -10,6 +10,7 @@
 from app.core.config import get_settings
 from app.utils.exceptions import CustomException
 from app.services.email_service import EmailService
+from app.services.profile_claims import PROFILE_CLAIM, profile_snapshot
 
 logger = logging.getLogger(__name__)
 
@@ -29,15 +30,20 @@ def _verify_password(self, password: str, hashed_password: str) -> bool:
         """Verify password against hash"""
         return bcrypt.checkpw(password.encode('utf-8'), hashed_password.encode('utf-8'))
     
-    def _create_access_token(self, user_id: str) -> Dict[str, Any]:
-        """Create JWT access token"""
-        expire = datetime.utcnow() + timedelta(minutes=self.access_token_expire_minutes)
+    def _create_access_token(self, user_id: str, profile_user: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Create JWT access token; with ``profile_user``, a short-lived one carrying a profile snapshot"""
+        expire_minutes = self.access_token_expire_minutes
         to_encode = {
             "user_id": user_id,
-            "exp": expire,
             "iat": datetime.utcnow(),
             "type": "access"
         }
+        if profile_user is not None:
+            # Short-lived: profile edits from other sessions reach this token within minutes
+            expire_minutes = self.settings.PROFILE_TOKEN_EXPIRE_MINUTES
+            to_encode[PROFILE_CLAIM] = profile_snapshot(profile_user)
+        expire = datetime.utcnow() + timedelta(minutes=expire_minutes)
+        to_encode["exp"] = expire
         
         encoded_jwt = jwt.encode(
             to_encode, 
@@ -48,12 +54,33 @@ def _create_access_token(self, user_id: str) -> Dict[str, Any]:
         return {
             "access_token": encoded_jwt,
             "token_type": "bearer",
-            "expires_in": self.access_token_expire_minutes * 60,
+            "expires_in": expire_minutes * 60,
             "expires_at": expire.isoformat()
         }
     
-    def verify_token(self, token: str) -> str:
-        """Verify JWT token and return user_id"""
+    def _create_refresh_token(self, user_id: str) -> Dict[str, Any]:
+        """Long-lived token accepted only by /auth/refresh"""
+        expire = datetime.utcnow() + timedelta(minutes=self.access_token_expire_minutes)
+        encoded_jwt = jwt.encode(
+            {"user_id": user_id, "exp": expire, "iat": datetime.utcnow(), "type": "refresh"},
+            self.settings.SECRET_KEY,
+            algorithm=self.algorithm
+        )
+        return {
+            "refresh_token": encoded_jwt,
+            "refresh_expires_at": expire.isoformat()
+        }
+    
+    def create_profile_tokens(self, user: Dict[str, Any]) -> Dict[str, Any]:
+        """Access token with a profile snapshot plus the refresh token that renews it"""
+        return {**self.create_profile_access_token(user), **self._create_refresh_token(str(user["_id"]))}
+    
+    def create_profile_access_token(self, user: Dict[str, Any]) -> Dict[str, Any]:
+        """Access token carrying a snapshot of ``user``'s current profile"""
+        return self._create_access_token(str(user["_id"]), profile_user=user)
+    
+    def decode_token(self, token: str, token_type: str = "access") -> Dict[str, Any]:
+        """Verify a JWT of the given type and return its claims"""
         try:
             payload = jwt.decode(
                 token, 
@@ -61,21 +88,44 @@ def verify_token(self, token: str) -> str:
                 algorithms=[self.algorithm]
             )
             
-            user_id = payload.get("user_id")
-            if user_id is None:
+            if payload.get("user_id") is None or payload.get("type", "access") != token_type:
                 raise CustomException(status_code=401, detail="Invalid token")
             
             exp = payload.get("exp")
             if exp and datetime.utcfromtimestamp(exp) < datetime.utcnow():
                 raise CustomException(status_code=401, detail="Token expired")
             
-            return user_id
+            return payload
             
         except jwt.ExpiredSignatureError:
             raise CustomException(status_code=401, detail="Token expired")
-        except jwt.JWTError:
+        except jwt.PyJWTError:
             raise CustomException(status_code=401, detail="Invalid token")
     
+    def verify_token(self, token: str) -> str:
+        """Verify JWT token and return user_id"""
+        return self.decode_token(token)["user_id"]
+    
+    async def refresh_access_token(self, refresh_token: str, db: MongoDB) -> Dict[str, Any]:
+        """New profile-carrying access token built from the stored profile"""
+        payload = self.decode_token(refresh_token, token_type="refresh")
+        
+        try:
+            # Fresh read: a refresh is how clients pick up profile edits made elsewhere
+            user = await db.get_user_by_id(payload["user_id"], use_cache=False)
+        except Exception as e:
+            logger.error(f"Error refreshing token: {str(e)}")
+            raise CustomException(status_code=500, detail="Token refresh failed")
+        if not user:
+            raise CustomException(status_code=401, detail="Invalid token")
+        
+        # Refresh tokens issued before a password change stop working
+        changed_at = user.get("password_changed_at")
+        if changed_at and payload.get("iat") and datetime.utcfromtimestamp(payload["iat"]) < changed_at.replace(microsecond=0):
+            raise CustomException(status_code=401, detail="Token expired")
+        
+        return self.create_profile_access_token(user)
+    
     async def create_user(self, user_data: UserCreate, db: MongoDB) -> Dict[str, Any]:
         """Create a new user account with email verification"""
         try:
@@ -159,6 +209,7 @@ async def verify_email(self, token: str, db: MongoDB) -> Dict[str, Any]:
                 }
             )
             
+            db.invalidate_user(user["_id"])
             logger.info(f"Email verified: {user['email']}")
             
             return {
@@ -235,7 +286,10 @@ async def authenticate_user(self, credentials: UserLogin, db: MongoDB) -> Dict[s
                     detail="Please verify your email before logging in. Check your inbox for the verification link."
                 )
             
-            token_data = self._create_access_token(str(user["_id"]))
+            if credentials.profile_claims and self.settings.ENABLE_PROFILE_CLAIMS:
+                token_data = self.create_profile_tokens(user)
+            else:
+                token_data = self._create_access_token(str(user["_id"]))
             
             await db.database.users.update_one(
                 {"_id": user["_id"]},
@@ -350,6 +404,8 @@ async def reset_password(self, token: str, new_password: str, db: MongoDB) -> bo
                 }
             )
             
+            db.invalidate_user(user["_id"])
+            
             # Send confirmation email
             self.email_service.send_password_changed_notification(
                 email=user["email"],
@@ -368,7 +424,8 @@ async def reset_password(self, token: str, new_password: str, db: MongoDB) -> bo
     async def change_password(self, user_id: str, current_password: str, new_password: str, db: MongoDB) -> bool:
         """Change user password (when logged in)"""
         try:
-            user = await db.get_user_by_id(user_id)
+            # Fresh read: the current password is checked against the stored hash, not a cached copy
+            user = await db.get_user_by_id(user_id, use_cache=False)
             if not user:
                 raise CustomException(status_code=404, detail="User not found")
             
@@ -391,6 +448,8 @@ async def change_password(self, user_id: str, current_password: str, new_passwor
                 }
             )
             
+            db.invalidate_user(user_id)
+            
             # Send notification
             self.email_service.send_password_changed_notification(
                 email=user["email"],
@@ -1,8 +1,6 @@
-from google.cloud import vision
 import logging
 from typing import List, Dict, Any
 import asyncio
-from PIL import Image
 import io
 import os
 
@@ -114,7 +112,8 @@ async def load_model(self):
             # Set credentials path as environment variable
             os.environ['GOOGLE_APPLICATION_CREDENTIALS'] = self.settings.GOOGLE_VISION_CREDENTIALS_PATH
             
-            # Initialize Vision API client
+            # Initialize Vision API client (SDK imported on first use to keep cold starts light)
+            from google.cloud import vision
             self.vision_client = vision.ImageAnnotatorClient()
             
             # Test the connection with a simple request
@@ -174,6 +173,8 @@ async def detect_ingredients(self, image_data: bytes) -> List[str]:
     async def _detect_with_vision_api(self, image_data: bytes) -> List[str]:
         """Detect ingredients using Google Cloud Vision API"""
         try:
+            from google.cloud import vision
+            
             # Prepare image for Vision API
             image = vision.Image(content=image_data)
             
@@ -271,6 +272,8 @@ async def _mock_ingredient_detection(self, image_data: bytes) -> List[str]:
         try:
             await asyncio.sleep(0.3)
             
+            from PIL import Image
+            
             # Analyze image to provide semi-realistic results
             image = Image.open(io.BytesIO(image_data))
             width, height = image.size
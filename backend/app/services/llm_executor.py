@@ -0,0 +1,349 @@
+# backend/app/services/llm_executor.py - SHARED NON-BLOCKING LLM EXECUTION LAYER
+import asyncio
+import threading
+import time
+import logging
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, AsyncIterator, Callable, Deque, Dict, List, Optional, Tuple
+
+from app.core import metrics
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+INTERACTIVE_SHORT = "interactive_short"
+INTERACTIVE_LONG = "interactive_long"
+BACKGROUND = "background"
+PRIORITY_CLASSES = (INTERACTIVE_SHORT, INTERACTIVE_LONG, BACKGROUND)
+
+# Call sites not listed run as interactive_long. Probes gate service readiness
+# for interactive traffic and take a few tokens, so they go first.
+CALL_SITE_PRIORITY = {
+    "text_extraction": INTERACTIVE_SHORT,
+    "recipe_probe": INTERACTIVE_SHORT,
+    "voice_probe": INTERACTIVE_SHORT,
+    "recipe": INTERACTIVE_LONG,
+    "recipe_stream": INTERACTIVE_LONG,
+    "recipe_batch": INTERACTIVE_LONG,
+    "audio_extraction": INTERACTIVE_LONG,
+    "recipe_pregeneration": BACKGROUND,
+}
+
+class LLMExecutor:
+    """Runs blocking Gemini SDK calls on a dedicated, bounded set of worker threads.
+
+    The google-generativeai client is synchronous, so calling it directly from
+    an async handler freezes the event loop. Every model call goes through
+    ``run()`` instead, which keeps the loop free and tracks queue depth and
+    in-flight calls so the pool can be sized from real traffic.
+
+    Waiting calls are queued per priority class (interactive_short >
+    interactive_long > background). A free worker takes the next call by
+    class: in ``strict`` mode always the highest non-empty class, in
+    ``weighted`` mode by stride scheduling over ``LLM_PRIORITY_WEIGHTS`` so
+    lower classes still progress under sustained load. Queued background calls
+    are overtaken by any interactive call and never hold more than
+    ``LLM_BACKGROUND_MAX_WORKERS`` threads. ``LLM_RESERVED_SHORT_WORKERS``
+    threads only take interactive_short calls, so typed-ingredient extraction
+    stays fast even while every other thread is generating a recipe.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.settings = get_settings()
+        self.max_workers = max_workers or self.settings.LLM_EXECUTOR_MAX_WORKERS
+        self.priority_mode = self.settings.LLM_PRIORITY_MODE
+        self.weights = dict(zip(PRIORITY_CLASSES, _parse_weights(self.settings.LLM_PRIORITY_WEIGHTS)))
+        self.reserved_short_workers = max(0, min(self.max_workers - 1, self.settings.LLM_RESERVED_SHORT_WORKERS))
+        self.background_max_workers = max(1, min(self.max_workers, self.settings.LLM_BACKGROUND_MAX_WORKERS))
+        self._lock = threading.Lock()
+        self._work_ready = threading.Condition(self._lock)
+        self._pending: Dict[str, Deque[Tuple[Future, Callable[[], Any]]]] = {c: deque() for c in PRIORITY_CLASSES}
+        self._pass: Dict[str, float] = {c: 0.0 for c in PRIORITY_CLASSES}
+        self._running: Dict[str, int] = {c: 0 for c in PRIORITY_CLASSES}
+        self._threads: List[threading.Thread] = []
+        self._shutdown = False
+
+        self.queued = 0
+        self.in_flight = 0
+        self.peak_queue_depth = 0
+        self.peak_in_flight = 0
+        self.call_sites: Dict[str, Dict[str, float]] = {}
+        self.classes: Dict[str, Dict[str, float]] = {
+            c: {"queued": 0, "started": 0, "total_wait_seconds": 0.0, "max_wait_seconds": 0.0}
+            for c in PRIORITY_CLASSES
+        }
+
+    def _ensure_workers(self):
+        # Threads start on first use, not at import, to keep cold starts cheap
+        while len(self._threads) < self.max_workers:
+            thread = threading.Thread(
+                target=self._worker,
+                name=f"llm-worker-{len(self._threads)}",
+                daemon=True
+            )
+            self._threads.append(thread)
+            thread.start()
+
+    def _eligible(self, priority: str) -> bool:
+        if not self._pending[priority]:
+            return False
+        if priority == INTERACTIVE_SHORT:
+            return True
+        if self._running[INTERACTIVE_LONG] + self._running[BACKGROUND] >= self.max_workers - self.reserved_short_workers:
+            return False
+        return priority != BACKGROUND or self._running[BACKGROUND] < self.background_max_workers
+
+    def _next_class(self) -> Optional[str]:
+        eligible = [c for c in PRIORITY_CLASSES if self._eligible(c)]
+        if not eligible:
+            return None
+        if self.priority_mode != "weighted":
+            return eligible[0]
+        chosen = min(eligible, key=lambda c: self._pass[c])
+        self._pass[chosen] += 1.0 / self.weights[chosen]
+        return chosen
+
+    def _worker(self):
+        while True:
+            with self._work_ready:
+                priority = self._next_class()
+                while priority is None:
+                    if self._shutdown:
+                        return
+                    self._work_ready.wait()
+                    priority = self._next_class()
+                future, job = self._pending[priority].popleft()
+                self._running[priority] += 1
+
+            try:
+                # False when the caller gave up while the call was still queued
+                if future.set_running_or_notify_cancel():
+                    try:
+                        future.set_result(job())
+                    except BaseException as e:
+                        future.set_exception(e)
+            finally:
+                with self._work_ready:
+                    self._running[priority] -= 1
+                    # A background slot may have opened up for a waiting background call
+                    self._work_ready.notify()
+
+    def _submit(self, job: Callable[[], Any], priority: str) -> "asyncio.Future":
+        future: Future = Future()
+        with self._work_ready:
+            if self._shutdown:
+                raise RuntimeError("LLM executor is shut down")
+            self._ensure_workers()
+            if not self._pending[priority]:
+                # A class that sat idle must not bank credit and then burst past the busy ones
+                busy = [self._pass[c] for c in PRIORITY_CLASSES if self._pending[c]]
+                if busy:
+                    self._pass[priority] = max(self._pass[priority], min(busy))
+            self._pending[priority].append((future, job))
+            self._work_ready.notify()
+        return asyncio.wrap_future(future)
+
+    def _site(self, call_site: str) -> Dict[str, float]:
+        site = self.call_sites.get(call_site)
+        if site is None:
+            site = {
+                "calls": 0,
+                "started": 0,
+                "errors": 0,
+                "cancelled": 0,
+                "total_wait_seconds": 0.0,
+                "total_run_seconds": 0.0
+            }
+            self.call_sites[call_site] = site
+        return site
+
+    async def run(
+        self,
+        fn: Callable[..., Any],
+        *args,
+        call_site: str = "default",
+        priority: Optional[str] = None,
+        **kwargs
+    ) -> Any:
+        """Execute ``fn(*args, **kwargs)`` on the LLM pool without blocking the loop"""
+        priority = priority or CALL_SITE_PRIORITY.get(call_site, INTERACTIVE_LONG)
+        if priority not in PRIORITY_CLASSES:
+            raise ValueError(f"priority must be one of {PRIORITY_CLASSES}, got {priority!r}")
+        submitted_at = time.perf_counter()
+        state = {"started": False, "abandoned": False}
+
+        with self._lock:
+            self.queued += 1
+            self.peak_queue_depth = max(self.peak_queue_depth, self.queued)
+            self._site(call_site)["calls"] += 1
+            self.classes[priority]["queued"] += 1
+
+        def invoke():
+            with self._lock:
+                if state["abandoned"]:
+                    return None
+                state["started"] = True
+                waited = time.perf_counter() - submitted_at
+                self.queued -= 1
+                self.in_flight += 1
+                self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+                self._site(call_site)["started"] += 1
+                self._site(call_site)["total_wait_seconds"] += waited
+                klass = self.classes[priority]
+                klass["queued"] -= 1
+                klass["started"] += 1
+                klass["total_wait_seconds"] += waited
+                klass["max_wait_seconds"] = max(klass["max_wait_seconds"], waited)
+
+            started_at = time.perf_counter()
+            metrics.LLM_QUEUE_WAIT.observe(waited, call_site=call_site, priority=priority)
+            outcome = "error"
+            try:
+                result = fn(*args, **kwargs)
+                outcome = "ok"
+                metrics.record_llm_usage(call_site, result)
+                return result
+            finally:
+                run_seconds = time.perf_counter() - started_at
+                metrics.LLM_CALL_DURATION.observe(run_seconds, call_site=call_site, outcome=outcome)
+                with self._lock:
+                    self.in_flight -= 1
+                    self._site(call_site)["total_run_seconds"] += run_seconds
+
+        try:
+            return await self._submit(invoke, priority)
+        except asyncio.CancelledError:
+            with self._lock:
+                self._site(call_site)["cancelled"] += 1
+            raise
+        except Exception:
+            with self._lock:
+                self._site(call_site)["errors"] += 1
+            raise
+        finally:
+            # A caller that timed out before its job left the queue must not
+            # leave the queue-depth counter permanently inflated.
+            with self._lock:
+                if not state["started"] and not state["abandoned"]:
+                    state["abandoned"] = True
+                    self.queued -= 1
+                    self.classes[priority]["queued"] -= 1
+
+    async def stream(
+        self,
+        fn: Callable[..., Any],
+        *args,
+        call_site: str = "default",
+        priority: Optional[str] = None,
+        **kwargs
+    ) -> AsyncIterator[Any]:
+        """Iterate a blocking streaming call on the LLM pool, yielding items as they arrive"""
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        finished = object()
+        stop = threading.Event()
+
+        def publish(item: Any, error: Optional[BaseException] = None):
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, (item, error))
+            except RuntimeError:
+                stop.set()  # Event loop already closed
+
+        def produce():
+            last = None
+            try:
+                for item in fn(*args, **kwargs):
+                    if stop.is_set():
+                        break
+                    publish(item)
+                    last = item
+            except Exception as e:
+                publish(finished, e)
+                return
+            # Usage totals arrive on the final chunk; earlier chunks would double count
+            metrics.record_llm_usage(call_site, last)
+            publish(finished)
+
+        producer = asyncio.ensure_future(self.run(produce, call_site=call_site, priority=priority))
+        drained = False
+        try:
+            while True:
+                item, error = await queue.get()
+                if item is finished:
+                    drained = True
+                    if error:
+                        raise error
+                    break
+                yield item
+        finally:
+            if drained:
+                # produce() has returned; the pool job is only settling its bookkeeping
+                await producer
+            else:
+                # Consumer went away (client disconnect, parse failure): stop reading the stream
+                # and drop a call still queued for the pool; a running one ends at its next chunk
+                stop.set()
+                producer.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of pool utilisation for health and sizing"""
+        with self._lock:
+            call_sites = {}
+            for name, site in self.call_sites.items():
+                started = max(site["started"], 1)
+                call_sites[name] = {
+                    "calls": int(site["calls"]),
+                    "errors": int(site["errors"]),
+                    "cancelled": int(site["cancelled"]),
+                    "avg_wait_ms": round(site["total_wait_seconds"] / started * 1000, 1),
+                    "avg_run_ms": round(site["total_run_seconds"] / started * 1000, 1)
+                }
+
+            priority_classes = {}
+            for name, klass in self.classes.items():
+                priority_classes[name] = {
+                    "queued": int(klass["queued"]),
+                    "running": self._running[name],
+                    "started": int(klass["started"]),
+                    "avg_wait_ms": round(klass["total_wait_seconds"] / max(klass["started"], 1) * 1000, 1),
+                    "max_wait_ms": round(klass["max_wait_seconds"] * 1000, 1)
+                }
+
+            return {
+                "max_workers": self.max_workers,
+                "priority_mode": self.priority_mode,
+                "reserved_short_workers": self.reserved_short_workers,
+                "background_max_workers": self.background_max_workers,
+                "queue_depth": self.queued,
+                "in_flight": self.in_flight,
+                "peak_queue_depth": self.peak_queue_depth,
+                "peak_in_flight": self.peak_in_flight,
+                "priority_classes": priority_classes,
+                "call_sites": call_sites
+            }
+
+    def shutdown(self):
+        with self._work_ready:
+            self._shutdown = True
+            self._work_ready.notify_all()
+
+def _parse_weights(raw: str) -> List[float]:
+    """"8,4,1" -> weights for interactive_short, interactive_long, background"""
+    try:
+        weights = [max(float(w), 0.01) for w in raw.split(",")]
+    except ValueError:
+        weights = []
+    if len(weights) != len(PRIORITY_CLASSES):
+        logger.warning(f"⚠️ LLM_PRIORITY_WEIGHTS={raw!r} needs {len(PRIORITY_CLASSES)} numbers; using 8,4,1")
+        weights = [8.0, 4.0, 1.0]
+    return weights
+
+_llm_executor: Optional[LLMExecutor] = None
+
+def get_llm_executor() -> LLMExecutor:
+    """Process-wide LLM executor shared by all AI services"""
+    global _llm_executor
+    if _llm_executor is None:
+        _llm_executor = LLMExecutor()
+    return _llm_executor
@@ -0,0 +1,110 @@
+# backend/app/services/llm_provider.py - PLUGGABLE LLM BACKENDS (GEMINI / LOCAL STAND-IN)
+import logging
+from typing import Any, Dict, Optional
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+PROVIDERS = ("gemini", "mock", "mock_http")
+
+class LLMProvider:
+    """Source of model handles for the AI services.
+
+    A model handle only has to look like ``genai.GenerativeModel`` where the
+    services touch it: ``generate_content(contents, generation_config=...,
+    stream=False)`` returning objects with ``.text`` and ``.usage_metadata``
+    (an iterator of such chunks when streaming). Calls are blocking; the
+    services run them on the LLM executor.
+    """
+
+    name = "base"
+
+    def model(self, model_name: str) -> Any:
+        raise NotImplementedError
+
+    def generation_config(self, **options) -> Any:
+        """Provider-specific form of temperature, max_output_tokens, response_schema, ..."""
+        return dict(options)
+
+    def describe(self) -> Dict[str, Any]:
+        return {"name": self.name}
+
+class GeminiProvider(LLMProvider):
+    name = "gemini"
+
+    def __init__(self, api_key: str):
+        self.api_key = api_key
+        self._configured = False
+
+    def model(self, model_name: str) -> Any:
+        # Imported here, not at module load: the SDK dominates cold-start import time
+        import google.generativeai as genai
+
+        if not self._configured:
+            genai.configure(api_key=self.api_key)
+            self._configured = True
+        return genai.GenerativeModel(model_name)
+
+    def generation_config(self, **options) -> Any:
+        from google.generativeai.types import GenerationConfig
+        return GenerationConfig(**options)
+
+class MockProvider(LLMProvider):
+    """Deterministic in-process stand-in with simulated latency and errors (see mock_llm)"""
+
+    name = "mock"
+
+    def __init__(self, latency_ms: float, latency_sigma: float, error_rate: float, seed: int):
+        from app.services.mock_llm import MockBackend
+        self.backend = MockBackend(latency_ms, latency_sigma, error_rate, seed)
+
+    def model(self, model_name: str) -> Any:
+        from app.services.mock_llm import MockModel
+        return MockModel(self.backend, model_name)
+
+    def describe(self) -> Dict[str, Any]:
+        return {"name": self.name, **self.backend.describe()}
+
+class MockHTTPProvider(LLMProvider):
+    """The same stand-in served out of process: ``python -m app.services.mock_llm --port 8765``"""
+
+    name = "mock_http"
+
+    def __init__(self, url: str, timeout: float):
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+
+    def model(self, model_name: str) -> Any:
+        from app.services.mock_llm import MockHTTPModel
+        return MockHTTPModel(self.url, model_name, self.timeout)
+
+    def describe(self) -> Dict[str, Any]:
+        return {"name": self.name, "url": self.url}
+
+def create_llm_provider(name: Optional[str] = None) -> LLMProvider:
+    settings = get_settings()
+    name = name or ("mock" if settings.MOCK_AI_RESPONSES else settings.LLM_PROVIDER)
+    if name == "gemini":
+        return GeminiProvider(settings.GEMINI_API_KEY)
+    if name == "mock":
+        return MockProvider(
+            latency_ms=settings.MOCK_AI_LATENCY_MS,
+            latency_sigma=settings.MOCK_AI_LATENCY_SIGMA,
+            error_rate=settings.MOCK_AI_ERROR_RATE,
+            seed=settings.MOCK_AI_SEED
+        )
+    if name == "mock_http":
+        return MockHTTPProvider(settings.MOCK_AI_URL, timeout=settings.RECIPE_ATTEMPT_TIMEOUT)
+    raise ValueError(f"LLM_PROVIDER must be one of {PROVIDERS}, got {name!r}")
+
+_llm_provider: Optional[LLMProvider] = None
+
+def get_llm_provider() -> LLMProvider:
+    """Process-wide provider shared by all AI services"""
+    global _llm_provider
+    if _llm_provider is None:
+        _llm_provider = create_llm_provider()
+        if _llm_provider.name != "gemini":
+            logger.warning(f"⚠️ Using stand-in LLM provider: {_llm_provider.describe()}")
+    return _llm_provider
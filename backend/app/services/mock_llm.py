@@ -0,0 +1,351 @@
+# backend/app/services/mock_llm.py - DETERMINISTIC LOCAL LLM STAND-IN (IN-PROCESS AND HTTP)
+"""Offline stand-in for Gemini, for load tests and local development.
+
+Answers the prompts the services actually send - recipe (structured, prompt
+mode, packed batch), ingredient extraction from text or audio, and the
+readiness probe - with schema-valid output derived from the prompt, after a
+log-normal latency and with a configurable error rate.
+
+In process: ``LLM_PROVIDER=mock`` (or ``MOCK_AI_RESPONSES=True``).
+Out of process: run ``python -m app.services.mock_llm [--port 8765]`` and set
+``LLM_PROVIDER=mock_http`` with ``MOCK_AI_URL`` pointing at it.
+"""
+import argparse
+import hashlib
+import json
+import logging
+import math
+import random
+import re
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+STREAM_CHUNKS = 8
+
+_STAPLES = ["tomato", "onion", "garlic", "rice", "egg", "potato", "spinach", "chicken", "carrot", "lemon"]
+_DISHES = ["Bowl", "Skillet", "Stir-Fry", "Bake", "Salad", "Curry", "Soup", "Wrap", "Pasta", "Hash"]
+_MOOD_WORDS = {
+    "happy": "Sunny", "sad": "Comforting", "energetic": "Power", "tired": "Easy",
+    "stressed": "Calming", "calm": "Gentle", "excited": "Bold", "bored": "Surprise"
+}
+_QUANTITIES = ["1 cup", "2", "200g", "1/2 cup", "3 tbsp", "150g", "1", "2 cloves"]
+
+class MockLLMError(Exception):
+    """Raised for simulated model failures; the message mimics an overloaded Gemini"""
+
+class MockUsage:
+    def __init__(self, prompt_token_count: int, candidates_token_count: int):
+        self.prompt_token_count = prompt_token_count
+        self.candidates_token_count = candidates_token_count
+
+class MockResponse:
+    """Quacks like a Gemini response (or stream chunk): ``.text`` and ``.usage_metadata``"""
+
+    def __init__(self, text: str, usage: Optional[MockUsage] = None):
+        self.text = text
+        self.usage_metadata = usage
+
+def _tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+def _prompt_text(contents: Any) -> str:
+    if isinstance(contents, str):
+        return contents
+    return "\n".join(part for part in contents if isinstance(part, str))
+
+def _split_list(text: str) -> List[str]:
+    return [item.strip() for item in re.split(r",|\band\b", text) if item.strip()]
+
+def mock_recipe(rng: random.Random, ingredients: List[str], mood: str, cuisine: str, servings: int) -> Dict[str, Any]:
+    """A complete recipe dict in the shape of recipe_response_schema()"""
+    ingredients = ingredients or rng.sample(_STAPLES, 3)
+    main = ingredients[0].title()
+    prep_time = rng.choice([5, 10, 15, 20])
+    cook_time = rng.choice([10, 15, 20, 25, 30, 40])
+    cuisine = cuisine if cuisine and cuisine.lower() != "any" else rng.choice(["italian", "indian", "mexican", "asian", "american"])
+    steps = [f"Prepare the {item}: wash and chop as needed." for item in ingredients[:3]]
+    steps += [
+        "Heat oil in a pan over medium heat.",
+        f"Cook the {', '.join(ingredients)} with salt, pepper and spices until done.",
+        "Taste, adjust seasoning and serve warm."
+    ]
+    return {
+        "title": f"{_MOOD_WORDS.get(mood, 'Mood')} {main} {rng.choice(_DISHES)}",
+        "description": f"A simple {cuisine} dish built around {', '.join(ingredients)} that suits feeling {mood}.",
+        "ingredients": [f"{rng.choice(_QUANTITIES)} {item}" for item in ingredients] + ["Salt and pepper to taste", "1 tbsp oil"],
+        "instructions": steps,
+        "prep_time": prep_time,
+        "cook_time": cook_time,
+        "total_time": prep_time + cook_time,
+        "servings": servings,
+        "difficulty": rng.choice(["easy", "medium"]),
+        "cuisine_type": cuisine,
+        "nutrition_info": {
+            "calories": float(rng.randint(250, 650)),
+            "protein": float(rng.randint(8, 40)),
+            "carbs": float(rng.randint(15, 80)),
+            "fat": float(rng.randint(5, 30)),
+            "fiber": float(rng.randint(2, 12)),
+            "sugar": float(rng.randint(2, 15)),
+            "sodium": float(rng.randint(200, 900))
+        },
+        "tags": [mood, cuisine, "mock"]
+    }
+
+def mock_answer(contents: Any, generation_config: Optional[Dict[str, Any]] = None) -> Tuple[str, float]:
+    """(response text, relative cost) for a prompt; the text depends only on the contents"""
+    config = generation_config or {}
+    prompt = _prompt_text(contents)
+    rng = random.Random(hashlib.sha256(prompt.encode("utf-8")).digest())
+
+    if "Respond with 'OK'" in prompt or prompt == "Say OK":
+        return "OK", 0.1
+
+    if not isinstance(contents, str):
+        # Audio: a stable pick of staples per recording size
+        size = sum(part.get("size", len(part.get("data", b""))) for part in contents if isinstance(part, dict))
+        picker = random.Random(size)
+        return ", ".join(picker.sample(_STAPLES, picker.randint(2, 5))), 0.6
+
+    quoted = re.search(r'Extract food ingredients from: "(.*)"', prompt, re.S)
+    if quoted:
+        items = [re.sub(r"^[\d/.\s]*(?:g|kg|cups?|tbsp|tsp)?\s+", "", item).lower() for item in _split_list(quoted.group(1))]
+        return ", ".join(item for item in items if item), 0.2
+
+    servings_match = re.search(r"Servings: (\d+)", prompt)
+    servings = int(servings_match.group(1)) if servings_match else 2
+    cuisine_match = re.search(r"Cuisine: ([^.\n]+)\.", prompt)
+    cuisine = cuisine_match.group(1).strip().lower() if cuisine_match else "any"
+
+    schema = config.get("response_schema") or {}
+    if "recipes" in schema.get("properties", {}):
+        slots = re.findall(
+            r"Recipe \d+: (\w+) mood - .*?Ingredients: (.*?)\. Cuisine: ([^.]+)\. Servings: (\d+)\.", prompt
+        )
+        recipes = [
+            mock_recipe(rng, _split_list(items), mood, slot_cuisine.strip().lower(), int(slot_servings))
+            for mood, items, slot_cuisine, slot_servings in slots
+        ]
+        return json.dumps({"recipes": recipes}), 0.8 * max(len(recipes), 1)
+
+    structured = re.search(r"Create a (\w+)-mood recipe", prompt)
+    if structured:
+        mood = structured.group(1)
+        line = next((l for l in prompt.splitlines() if l.startswith("Main ingredients")), "")
+        ingredients = _split_list(line.split("): ", 1)[-1].rstrip("."))
+    else:
+        mood_match = re.search(r"CURRENT MOOD: (\w+)", prompt)
+        mood = mood_match.group(1) if mood_match else "happy"
+        section = prompt.split("AVAILABLE INGREDIENTS:", 1)[-1]
+        ingredients = re.findall(r"^\s*- (.+)$", section, re.M)
+    return json.dumps(mock_recipe(rng, ingredients, mood, cuisine, servings)), 1.0
+
+class MockBackend:
+    """Latency and failure model shared by every mock model in a process (thread-safe)"""
+
+    def __init__(self, latency_ms: float = 1500.0, latency_sigma: float = 0.4, error_rate: float = 0.0, seed: int = 42):
+        self.latency_ms = latency_ms
+        self.latency_sigma = latency_sigma
+        self.error_rate = error_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.errors = 0
+
+    def sample(self, cost: float) -> Tuple[float, bool]:
+        """(seconds, fail) for one call of the given relative cost"""
+        with self._lock:
+            self.calls += 1
+            spread = self._rng.lognormvariate(0, self.latency_sigma) if self.latency_sigma > 0 else 1.0
+            fail = self._rng.random() < self.error_rate
+            if fail:
+                self.errors += 1
+        return self.latency_ms / 1000 * cost * spread, fail
+
+    def complete(self, contents: Any, generation_config: Optional[Dict[str, Any]] = None) -> Tuple[str, MockUsage, float, bool]:
+        text, cost = mock_answer(contents, generation_config)
+        seconds, fail = self.sample(cost)
+        usage = MockUsage(_tokens(_prompt_text(contents)), _tokens(text))
+        return text, usage, seconds, fail
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "latency_ms": self.latency_ms,
+            "latency_sigma": self.latency_sigma,
+            "error_rate": self.error_rate,
+            "calls": self.calls,
+            "errors": self.errors
+        }
+
+def _chunks(text: str) -> List[str]:
+    size = max(1, math.ceil(len(text) / STREAM_CHUNKS))
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+class MockModel:
+    """In-process stand-in for ``genai.GenerativeModel``; blocks like the real SDK"""
+
+    def __init__(self, backend: MockBackend, model_name: str):
+        self.backend = backend
+        self.model_name = model_name
+
+    def generate_content(self, contents: Any, generation_config: Optional[Dict[str, Any]] = None, stream: bool = False):
+        text, usage, seconds, fail = self.backend.complete(contents, generation_config)
+        if stream:
+            return self._stream(text, usage, seconds, fail)
+        if fail:
+            time.sleep(seconds * 0.3)
+            raise MockLLMError("503 The model is overloaded. Please try again later. (mock)")
+        time.sleep(seconds)
+        return MockResponse(text, usage)
+
+    def _stream(self, text: str, usage: MockUsage, seconds: float, fail: bool) -> Iterator[MockResponse]:
+        chunks = _chunks(text)
+        for position, chunk in enumerate(chunks):
+            time.sleep(seconds / len(chunks))
+            if fail and position >= len(chunks) // 2:
+                raise MockLLMError("503 The model is overloaded. Please try again later. (mock)")
+            yield MockResponse(chunk, usage if position == len(chunks) - 1 else None)
+
+# ---- HTTP server and client ----
+
+def _encode_contents(contents: Any) -> Any:
+    if isinstance(contents, str):
+        return contents
+    # Audio bytes stay on this side; the stand-in only needs their size
+    return [
+        part if isinstance(part, str) else {"mime_type": part.get("mime_type"), "size": len(part.get("data", b""))}
+        for part in contents
+    ]
+
+def _usage_dict(usage: Optional[MockUsage]) -> Optional[Dict[str, int]]:
+    if usage is None:
+        return None
+    return {"prompt_token_count": usage.prompt_token_count, "candidates_token_count": usage.candidates_token_count}
+
+def _usage_from(data: Optional[Dict[str, int]]) -> Optional[MockUsage]:
+    return MockUsage(**data) if data else None
+
+class MockHTTPModel:
+    """``genai.GenerativeModel`` look-alike that calls a mock server over HTTP"""
+
+    def __init__(self, url: str, model_name: str, timeout: float = 20.0):
+        self.url = url
+        self.model_name = model_name
+        self.timeout = timeout
+
+    def generate_content(self, contents: Any, generation_config: Optional[Dict[str, Any]] = None, stream: bool = False):
+        body = json.dumps({
+            "model": self.model_name,
+            "contents": _encode_contents(contents),
+            "generation_config": generation_config or {},
+            "stream": stream
+        }).encode("utf-8")
+        request = urllib.request.Request(
+            f"{self.url}/v1/generate", data=body, headers={"Content-Type": "application/json"}
+        )
+        try:
+            response = urllib.request.urlopen(request, timeout=self.timeout)
+        except urllib.error.HTTPError as e:
+            raise MockLLMError(json.loads(e.read() or b"{}").get("error", f"HTTP {e.code}"))
+        if stream:
+            return self._stream(response)
+        with response:
+            data = json.loads(response.read())
+        return MockResponse(data["text"], _usage_from(data.get("usage")))
+
+    def _stream(self, response) -> Iterator[MockResponse]:
+        with response:
+            for line in response:
+                data = json.loads(line)
+                if "error" in data:
+                    raise MockLLMError(data["error"])
+                yield MockResponse(data["text"], _usage_from(data.get("usage")))
+
+class MockLLMHandler(BaseHTTPRequestHandler):
+    backend: MockBackend = None
+    protocol_version = "HTTP/1.1"
+
+    def _send_json(self, status: int, payload: Dict[str, Any]):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send_json(200, {"status": "ok", **self.backend.describe()})
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        if self.path != "/v1/generate":
+            self._send_json(404, {"error": "not found"})
+            return
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        model = MockModel(self.backend, request.get("model", "mock"))
+        contents, config = request["contents"], request.get("generation_config")
+
+        if not request.get("stream"):
+            try:
+                response = model.generate_content(contents, generation_config=config)
+            except MockLLMError as e:
+                self._send_json(503, {"error": str(e)})
+                return
+            self._send_json(200, {"text": response.text, "usage": _usage_dict(response.usage_metadata)})
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        try:
+            for chunk in model.generate_content(contents, generation_config=config, stream=True):
+                self.wfile.write(json.dumps({"text": chunk.text, "usage": _usage_dict(chunk.usage_metadata)}).encode("utf-8") + b"\n")
+                self.wfile.flush()
+        except MockLLMError as e:
+            self.wfile.write(json.dumps({"error": str(e)}).encode("utf-8") + b"\n")
+        self.close_connection = True
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+def serve(host: str, port: int, backend: MockBackend) -> ThreadingHTTPServer:
+    """Start the stand-in server on a daemon thread and return it (call .shutdown() to stop)"""
+    handler = type("BoundMockLLMHandler", (MockLLMHandler,), {"backend": backend})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="mock-llm", daemon=True).start()
+    return server
+
+def main():
+    from app.core.config import get_settings
+
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="Serve the local LLM stand-in over HTTP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=settings.MOCK_AI_LATENCY_MS)
+    parser.add_argument("--latency-sigma", type=float, default=settings.MOCK_AI_LATENCY_SIGMA)
+    parser.add_argument("--error-rate", type=float, default=settings.MOCK_AI_ERROR_RATE)
+    parser.add_argument("--seed", type=int, default=settings.MOCK_AI_SEED)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    backend = MockBackend(args.latency_ms, args.latency_sigma, args.error_rate, args.seed)
+    server = serve(args.host, args.port, backend)
+    logger.info(f"🧪 Mock LLM listening on http://{args.host}:{args.port} {backend.describe()}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
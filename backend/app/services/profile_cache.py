@@ -0,0 +1,142 @@
+# backend/app/services/profile_cache.py - PER-USER PROFILE CACHE (IN-PROCESS, TTL, WRITE-THROUGH)
+import asyncio
+import copy
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+class ProfileCache:
+    """LRU with TTL of user documents keyed by user id.
+
+    Writes made through this process (profile updates, password changes,
+    email verification) update or drop the entry straight away. Writes made
+    by other workers show up after ``PROFILE_CACHE_TTL_SECONDS``, or at once
+    with ``PROFILE_CACHE_INVALIDATION=change_stream``. That mode watches the
+    users collection and needs a replica set, which Atlas always has.
+    """
+
+    def __init__(self):
+        self.settings = get_settings()
+        self.enabled = self.settings.ENABLE_PROFILE_CACHE
+        self.ttl_seconds = self.settings.PROFILE_CACHE_TTL_SECONDS
+        self.max_entries = self.settings.PROFILE_CACHE_MAX_ENTRIES
+        self.invalidation = self.settings.PROFILE_CACHE_INVALIDATION
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._watch_task: Optional[asyncio.Task] = None
+
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.invalidations = 0
+        self.remote_invalidations = 0
+        self.evictions = 0
+
+    def get(self, user_id: str) -> Optional[Dict[str, Any]]:
+        if not self.enabled:
+            return None
+        entry = self._entries.get(user_id)
+        if entry is not None and entry[0] < time.monotonic():
+            del self._entries[user_id]
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(user_id)
+        self.hits += 1
+        # Callers format and sometimes modify the document; the cached one must stay intact
+        return copy.deepcopy(entry[1])
+
+    def peek_version(self, user_id: str) -> Optional[int]:
+        """profile_version of a live entry, without counting a lookup"""
+        entry = self._entries.get(user_id)
+        if entry is None or entry[0] < time.monotonic():
+            return None
+        return entry[1].get("profile_version", 0)
+
+    def set(self, user_id: str, user: Dict[str, Any]):
+        if not self.enabled:
+            return
+        self._entries[user_id] = (time.monotonic() + self.ttl_seconds, copy.deepcopy(user))
+        self._entries.move_to_end(user_id)
+        self.stores += 1
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, user_id: str, remote: bool = False):
+        if self._entries.pop(user_id, None) is not None:
+            if remote:
+                self.remote_invalidations += 1
+            else:
+                self.invalidations += 1
+
+    def clear(self):
+        self._entries.clear()
+
+    # ---- cross-worker invalidation ----
+
+    def ensure_watching(self):
+        """Start the change-stream listener once per process (needs a running event loop)"""
+        if not self.enabled or self.invalidation != "change_stream":
+            return
+        if self._watch_task is not None and not self._watch_task.done():
+            return
+        self._watch_task = asyncio.get_running_loop().create_task(self._watch())
+
+    async def _watch(self):
+        from pymongo.errors import OperationFailure
+
+        from app.database.mongodb import get_database
+
+        delay = 1.0
+        while True:
+            try:
+                db = await get_database()
+                pipeline = [{"$match": {"operationType": {"$in": ["update", "replace", "delete"]}}}]
+                async with db.database.users.watch(pipeline) as stream:
+                    # Changes made while no stream was open were missed
+                    self.clear()
+                    logger.info("👂 Profile cache: watching users for cross-worker invalidation")
+                    delay = 1.0
+                    async for change in stream:
+                        self.invalidate(str(change["documentKey"]["_id"]), remote=True)
+            except asyncio.CancelledError:
+                raise
+            except OperationFailure as e:
+                if e.code == 40573:  # Change streams need a replica set
+                    logger.warning("⚠️ Profile cache: change streams unavailable, relying on TTL only")
+                    self.invalidation = "none"
+                    return
+                logger.warning(f"Profile cache change stream failed: {str(e)}")
+            except Exception as e:
+                logger.warning(f"Profile cache change stream failed: {str(e)}")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 60.0)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "invalidation": self.invalidation,
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "invalidations": self.invalidations,
+            "remote_invalidations": self.remote_invalidations,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0
+        }
+
+_profile_cache: Optional[ProfileCache] = None
+
+def get_profile_cache() -> ProfileCache:
+    global _profile_cache
+    if _profile_cache is None:
+        _profile_cache = ProfileCache()
+    return _profile_cache
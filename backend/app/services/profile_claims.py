@@ -0,0 +1,44 @@
+# backend/app/services/profile_claims.py - PROFILE SNAPSHOT CARRIED IN ACCESS TOKENS
+import hashlib
+import json
+from typing import Any, Dict, List, Optional
+
+# Claim holding the snapshot; tokens without it work as before
+PROFILE_CLAIM = "prf"
+
+def allergy_hash(allergies: List[str]) -> str:
+    """Short digest of the normalized allergy list"""
+    normalized = sorted({" ".join(str(allergy).lower().split()) for allergy in allergies or []})
+    return hashlib.sha256(json.dumps(normalized).encode("utf-8")).hexdigest()[:16]
+
+def profile_snapshot(user: Dict[str, Any]) -> Dict[str, Any]:
+    """Compact form of the profile fields recipe generation reads"""
+    allergies = list(user.get("allergies", []))
+    return {
+        "v": user.get("profile_version", 0),
+        "d": list(user.get("dietary_preferences", [])),
+        "a": allergies,
+        "ah": allergy_hash(allergies),
+        "g": list(user.get("health_goals", []))
+    }
+
+def profile_from_claims(payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """The snapshot in a decoded token, shaped like a user document, or None.
+
+    A snapshot whose allergy list does not match its hash is ignored. The
+    caller then reads the profile from the database rather than risk a
+    prompt without an allergy.
+    """
+    snapshot = payload.get(PROFILE_CLAIM)
+    if not isinstance(snapshot, dict):
+        return None
+    allergies = snapshot.get("a", [])
+    if snapshot.get("ah") != allergy_hash(allergies):
+        return None
+    return {
+        "_id": payload.get("user_id"),
+        "profile_version": snapshot.get("v", 0),
+        "dietary_preferences": snapshot.get("d", []),
+        "allergies": allergies,
+        "health_goals": snapshot.get("g", [])
+    }
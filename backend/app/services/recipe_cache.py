@@ -0,0 +1,146 @@
+# backend/app/services/recipe_cache.py - TWO-TIER RECIPE RESULT CACHE
+import hashlib
+import json
+import time
+import logging
+from datetime import datetime
+from collections import OrderedDict
+from typing import List, Optional, Dict, Any, Tuple
+
+from app.models.schemas import RecipeResponse, MoodEnum
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+def _normalize_term(value: Any) -> str:
+    value = value.value if hasattr(value, 'value') else value
+    return ' '.join(str(value).lower().split())
+
+def _normalize_list(values: Optional[List[Any]]) -> List[str]:
+    return sorted({_normalize_term(v) for v in (values or []) if _normalize_term(v)})
+
+def canonical_recipe_request(
+    ingredients: List[str],
+    mood: MoodEnum,
+    cuisine_preference: Optional[str] = None,
+    dietary_preferences: Optional[List[str]] = None,
+    allergies: Optional[List[str]] = None,
+    health_goals: Optional[List[str]] = None,
+    servings: Optional[int] = 2,
+    detail_level: Any = "standard"
+) -> Dict[str, Any]:
+    """Order- and case-insensitive form of everything that shapes a generated recipe"""
+    cuisine = _normalize_term(cuisine_preference) if cuisine_preference else 'any'
+    return {
+        "ingredients": _normalize_list(ingredients),
+        "mood": _normalize_term(mood),
+        "cuisine": cuisine or 'any',
+        "dietary_preferences": _normalize_list(dietary_preferences),
+        "allergies": _normalize_list(allergies),
+        "health_goals": _normalize_list(health_goals),
+        "servings": servings or 2,
+        "detail_level": _normalize_term(detail_level or "standard")
+    }
+
+def recipe_cache_key(**request: Any) -> str:
+    canonical = canonical_recipe_request(**request)
+    payload = json.dumps(canonical, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+class RecipeCache:
+    """In-process LRU with TTL (tier one) backed by a Mongo collection (tier two)"""
+
+    def __init__(self):
+        self.settings = get_settings()
+        self.enabled = self.settings.ENABLE_RECIPE_CACHING
+        self.ttl_seconds = self.settings.RECIPE_CACHE_TTL_SECONDS
+        self.max_entries = self.settings.RECIPE_CACHE_MAX_ENTRIES
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+        self.memory_hits = 0
+        self.mongo_hits = 0
+        self.misses = 0
+        self.bypasses = 0
+        self.stores = 0
+
+    def _get_local(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, recipe_data = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return recipe_data
+
+    def _set_local(self, key: str, recipe_data: Dict[str, Any], ttl_seconds: Optional[float] = None):
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        self._entries[key] = (time.monotonic() + ttl, recipe_data)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def get(self, key: str, db=None) -> Optional[RecipeResponse]:
+        """Look up a recipe, promoting Mongo hits into the local tier"""
+        if not self.enabled:
+            return None
+
+        recipe_data = self._get_local(key)
+        if recipe_data is not None:
+            self.memory_hits += 1
+            return RecipeResponse(**recipe_data)
+
+        if db is not None:
+            try:
+                entry = await db.get_cached_recipe(key)
+                if entry:
+                    remaining = (entry["expires_at"] - datetime.utcnow()).total_seconds()
+                    if remaining > 0:
+                        self._set_local(key, entry["recipe"], remaining)
+                        self.mongo_hits += 1
+                        return RecipeResponse(**entry["recipe"])
+            except Exception as e:
+                logger.warning(f"Recipe cache lookup failed: {str(e)}")
+
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, recipe: RecipeResponse, db=None):
+        if not self.enabled:
+            return
+
+        recipe_data = recipe.dict(exclude={"id"})
+        self._set_local(key, recipe_data)
+        self.stores += 1
+
+        if db is not None:
+            try:
+                await db.save_cached_recipe(key, recipe_data, self.ttl_seconds)
+            except Exception as e:
+                logger.warning(f"Recipe cache write failed: {str(e)}")
+
+    def record_bypass(self):
+        self.bypasses += 1
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.memory_hits + self.mongo_hits + self.misses
+        hits = self.memory_hits + self.mongo_hits
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "memory_hits": self.memory_hits,
+            "mongo_hits": self.mongo_hits,
+            "misses": self.misses,
+            "bypasses": self.bypasses,
+            "stores": self.stores,
+            "hit_ratio": round(hits / lookups, 3) if lookups else 0.0
+        }
+
+_recipe_cache: Optional[RecipeCache] = None
+
+def get_recipe_cache() -> RecipeCache:
+    global _recipe_cache
+    if _recipe_cache is None:
+        _recipe_cache = RecipeCache()
+    return _recipe_cache
@@ -0,0 +1,61 @@
+# backend/app/services/recipe_history.py - RECIPE HISTORY AND MOOD LOG DOCUMENTS FOR GENERATED RECIPES
+import asyncio
+import logging
+from datetime import datetime
+from typing import Tuple
+
+from bson import ObjectId
+
+from app.models.schemas import RecipeRequest, RecipeResponse
+from app.services.recipe_cache import canonical_recipe_request
+
+logger = logging.getLogger(__name__)
+
+def recipe_history_document(current_user: str, recipe_request: RecipeRequest, recipe: RecipeResponse, user: dict) -> dict:
+    return {
+        "user_id": current_user,
+        "recipe": recipe.dict(),
+        "ingredients_used": recipe_request.ingredients,
+        "mood": recipe_request.mood.value,
+        "input_method": "voice",
+        # Canonical request, mined by the pre-generation pool for popular combinations
+        "request": canonical_recipe_request(
+            ingredients=recipe_request.ingredients,
+            mood=recipe_request.mood,
+            cuisine_preference=recipe_request.cuisine_preference,
+            dietary_preferences=user.get("dietary_preferences", []),
+            allergies=user.get("allergies", []),
+            health_goals=user.get("health_goals", []),
+            servings=recipe_request.servings or 2,
+            detail_level=recipe_request.detail_level
+        ),
+        "created_at": datetime.utcnow()
+    }
+
+def mood_log_document(current_user: str, recipe_request: RecipeRequest) -> dict:
+    return {
+        "user_id": current_user,
+        "mood": recipe_request.mood.value,
+        "timestamp": datetime.utcnow()
+    }
+
+def generated_recipe_documents(current_user: str, recipe_request: RecipeRequest, recipe: RecipeResponse, user: dict) -> Tuple[dict, dict]:
+    """History entry and mood log for a generated recipe.
+
+    The history id is assigned here rather than by the server, so it is known
+    before the insert completes (or, in write-behind mode, before it starts).
+    """
+    history = recipe_history_document(current_user, recipe_request, recipe, user)
+    history["_id"] = ObjectId()
+    return history, mood_log_document(current_user, recipe_request)
+
+async def write_generated_recipe(db, history: dict, mood_log: dict):
+    """Insert the history entry and mood log concurrently (two round trips overlap instead of queueing)"""
+    await asyncio.gather(db.save_recipe_history(history), db.save_mood_log(mood_log))
+
+async def write_generated_recipe_behind(db, history: dict, mood_log: dict):
+    """write_generated_recipe for after the response has gone out: failures are logged, not raised"""
+    try:
+        await write_generated_recipe(db, history, mood_log)
+    except Exception as e:
+        logger.error(f"❌ Write-behind of recipe history {history['_id']} failed: {str(e)}")
@@ -0,0 +1,295 @@
+# backend/app/services/recipe_jobs.py - ASYNCHRONOUS RECIPE GENERATION JOBS (MONGO-BACKED, LEASED)
+import asyncio
+import logging
+import os
+import socket
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from pymongo.errors import DuplicateKeyError
+
+from app.core.config import get_settings
+from app.models.schemas import RecipeRequest, RecipeResponse
+from app.services.recipe_history import mood_log_document, recipe_history_document
+
+logger = logging.getLogger(__name__)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+TERMINAL_STATUSES = (JOB_SUCCEEDED, JOB_FAILED)
+
+def job_document(user_id: str, recipe_request: RecipeRequest) -> Dict[str, Any]:
+    now = datetime.utcnow()
+    return {
+        "user_id": user_id,
+        "request": recipe_request.dict(),
+        "status": JOB_QUEUED,
+        "attempts": 0,
+        "created_at": now,
+        "updated_at": now
+    }
+
+def job_view(job: Dict[str, Any]) -> Dict[str, Any]:
+    """RecipeJobResponse fields for a stored job"""
+    view = {
+        "job_id": str(job["_id"]),
+        "status": job["status"],
+        "attempts": job.get("attempts", 0),
+        "created_at": job["created_at"],
+        "updated_at": job["updated_at"],
+        "error": job.get("error")
+    }
+    if job["status"] == JOB_SUCCEEDED:
+        view["history_id"] = job["history_id"]
+        view["recipe"] = RecipeResponse(**{**job["recipe"], "id": job["history_id"]})
+    return view
+
+class FallbackRecipeServed(Exception):
+    """The AI was unavailable and generation returned the generic placeholder"""
+
+class RecipeJobWorker:
+    """Runs recipe jobs queued in the ``recipe_jobs`` collection.
+
+    Any process serving the API can run jobs. A job is claimed with a lease
+    that the running worker renews. If the process dies, the lease lapses and
+    another worker picks the job up again, up to ``RECIPE_JOB_MAX_ATTEMPTS``
+    attempts. The generated recipe is written to ``recipe_history`` under
+    the job's own id, so a job that runs twice still leaves one history entry.
+    A placeholder served while the AI is down is retried once the circuit
+    breaker may have closed; only the last attempt keeps it (flagged
+    ``fallback`` on the recipe).
+
+    Loops poll every ``RECIPE_JOB_POLL_INTERVAL`` seconds. A local submit
+    wakes them at once, and jobs finishing here wake local long-polls at once.
+    """
+
+    def __init__(self):
+        self.settings = get_settings()
+        self.enabled = self.settings.ENABLE_RECIPE_JOBS
+        # A frozen function would hold leases it cannot renew; long-running workers run the queue
+        self.runs_jobs = self.enabled and not self.settings.SERVERLESS
+        self.concurrency = max(1, self.settings.RECIPE_JOB_CONCURRENCY)
+        self.lease_seconds = self.settings.RECIPE_JOB_LEASE_SECONDS
+        self.poll_interval = self.settings.RECIPE_JOB_POLL_INTERVAL
+        self.max_attempts = self.settings.RECIPE_JOB_MAX_ATTEMPTS
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._changed: Dict[str, asyncio.Event] = {}
+
+        self.claimed = 0
+        self.retried = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.requeued = 0
+        self.leases_lost = 0
+
+    # ---- lifecycle ----
+
+    def ensure_running(self, get_recipe_service: Callable[[], Awaitable[Any]]):
+        """Start the worker loops once per process (needs a running event loop); never on serverless hosts"""
+        if not self.runs_jobs:
+            return
+        self._tasks = [task for task in self._tasks if not task.done()]
+        if self._tasks:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            logger.warning("Recipe jobs: no running event loop, worker start deferred")
+            return
+        self._wakeup = asyncio.Event()
+        self._tasks = [loop.create_task(self._run(get_recipe_service)) for _ in range(self.concurrency)]
+        logger.info(f"🧾 Recipe job worker {self.worker_id} started ({self.concurrency} loops)")
+
+    def notify_submitted(self):
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _run(self, get_recipe_service: Callable[[], Awaitable[Any]]):
+        from app.database.mongodb import get_database
+
+        while True:
+            job = None
+            try:
+                db = await get_database()
+                job = await db.claim_recipe_job(self.worker_id, self.lease_seconds)
+            except Exception as e:
+                logger.error(f"Recipe job claim failed: {str(e)}")
+
+            if job is None:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+                continue
+
+            try:
+                await self.run_job(db, job, get_recipe_service)
+            except Exception as e:
+                logger.error(f"Recipe job {job['_id']} crashed: {str(e)}")
+
+    # ---- execution ----
+
+    async def run_job(self, db, job: Dict[str, Any], get_recipe_service: Callable[[], Awaitable[Any]]):
+        job_id = job["_id"]
+        self.claimed += 1
+        if job["attempts"] > 1:
+            self.retried += 1
+        if job["attempts"] > self.max_attempts:
+            await self._finish(db, job_id, {"status": JOB_FAILED, "error": f"Gave up after {self.max_attempts} attempts"})
+            return
+
+        renewer = asyncio.ensure_future(self._keep_lease(db, job_id))
+        try:
+            update = await self._generate(db, job, get_recipe_service)
+        except Exception as e:
+            error = getattr(e, "detail", None) or str(e) or type(e).__name__
+            logger.error(f"❌ Recipe job {job_id} attempt {job['attempts']} failed: {error}")
+            if job["attempts"] < self.max_attempts:
+                update = {"status": JOB_QUEUED, "error": error}
+                if isinstance(e, FallbackRecipeServed):
+                    # Claimed again sooner, it would only get the placeholder again
+                    update["retry_at"] = datetime.utcnow() + timedelta(seconds=self.settings.CIRCUIT_BREAKER_OPEN_SECONDS)
+                self.requeued += 1
+            else:
+                update = {"status": JOB_FAILED, "error": error}
+        finally:
+            renewer.cancel()
+        await self._finish(db, job_id, update)
+
+    async def _generate(self, db, job: Dict[str, Any], get_recipe_service: Callable[[], Awaitable[Any]]) -> Dict[str, Any]:
+        recipe_service = await get_recipe_service()
+        user = await db.get_user_by_id(job["user_id"])
+        if not user:
+            raise ValueError("User not found")
+
+        recipe_request = RecipeRequest(**job["request"])
+        recipe = await recipe_service.generate_recipe(
+            ingredients=recipe_request.ingredients,
+            mood=recipe_request.mood,
+            dietary_preferences=user.get("dietary_preferences", []),
+            allergies=user.get("allergies", []),
+            health_goals=user.get("health_goals", []),
+            cuisine_preference=recipe_request.cuisine_preference,
+            db=db,
+            force_fresh=recipe_request.force_fresh,
+            servings=recipe_request.servings or 2,
+            detail_level=recipe_request.detail_level,
+            allow_close_match=recipe_request.allow_close_match
+        )
+        if recipe.fallback and job["attempts"] < self.max_attempts:
+            # Written under the job's id, a placeholder could never be replaced by a later attempt
+            raise FallbackRecipeServed("AI temporarily unavailable, retrying shortly")
+
+        # History shares the job's id: a job re-run after a lost lease cannot add a second entry
+        history = recipe_history_document(job["user_id"], recipe_request, recipe, user)
+        history["_id"] = job["_id"]
+        try:
+            await db.save_recipe_history(history)
+            await db.save_mood_log(mood_log_document(job["user_id"], recipe_request))
+        except DuplicateKeyError:
+            logger.info(f"Recipe job {job['_id']}: history already written by an earlier attempt")
+        # Durable before the job reports success, even with the write buffer on
+        await db.flush_user_writes(job["user_id"])
+
+        return {
+            "status": JOB_SUCCEEDED,
+            "recipe": recipe.dict(exclude={"id"}),
+            "history_id": str(job["_id"]),
+            "error": None,
+            "finished_at": datetime.utcnow(),
+            "expires_at": datetime.utcnow() + timedelta(seconds=self.settings.RECIPE_JOB_RESULT_TTL_SECONDS)
+        }
+
+    async def _keep_lease(self, db, job_id):
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                if not await db.renew_recipe_job_lease(job_id, self.worker_id, self.lease_seconds):
+                    logger.warning(f"⚠️ Recipe job {job_id}: lease taken over by another worker")
+                    return
+            except Exception as e:
+                logger.warning(f"Recipe job {job_id}: lease renewal failed: {str(e)}")
+
+    async def _finish(self, db, job_id, update: Dict[str, Any]):
+        if update["status"] == JOB_FAILED:
+            update["expires_at"] = datetime.utcnow() + timedelta(seconds=self.settings.RECIPE_JOB_RESULT_TTL_SECONDS)
+        try:
+            recorded = await db.finish_recipe_job(job_id, self.worker_id, update)
+        except Exception as e:
+            # The lease lapses and another worker retries the job
+            logger.error(f"Recipe job {job_id}: could not record outcome: {str(e)}")
+            return
+        if not recorded:
+            self.leases_lost += 1
+            logger.warning(f"⚠️ Recipe job {job_id}: lease lost before the outcome was recorded")
+        elif update["status"] == JOB_SUCCEEDED:
+            self.succeeded += 1
+        elif update["status"] == JOB_FAILED:
+            self.failed += 1
+        self._signal(str(job_id))
+        if update["status"] == JOB_QUEUED:
+            self.notify_submitted()
+
+    # ---- waiting for results ----
+
+    def _signal(self, job_id: str):
+        event = self._changed.pop(job_id, None)
+        if event is not None:
+            event.set()
+
+    async def wait_for_job(
+        self,
+        db,
+        job_id: str,
+        user_id: str,
+        timeout: float,
+        changed_from: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """The job once it is finished (or, with ``changed_from``, once its status differs), or at timeout"""
+        deadline = time.monotonic() + max(0.0, timeout)
+        while True:
+            job = await db.get_recipe_job(job_id, user_id)
+            if job is None or job["status"] in TERMINAL_STATUSES:
+                return job
+            if changed_from is not None and job["status"] != changed_from:
+                return job
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return job
+            # Woken at once when the job finishes in this process, else re-read after the poll interval
+            event = self._changed.setdefault(job_id, asyncio.Event())
+            try:
+                await asyncio.wait_for(event.wait(), timeout=min(remaining, self.poll_interval))
+            except asyncio.TimeoutError:
+                if self._changed.get(job_id) is event and not event.is_set():
+                    del self._changed[job_id]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "runs_jobs": self.runs_jobs,
+            "worker_id": self.worker_id,
+            "loops_running": sum(1 for task in self._tasks if not task.done()),
+            "claimed": self.claimed,
+            "retried": self.retried,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "requeued": self.requeued,
+            "leases_lost": self.leases_lost
+        }
+
+_recipe_job_worker: Optional[RecipeJobWorker] = None
+
+def get_recipe_job_worker() -> RecipeJobWorker:
+    global _recipe_job_worker
+    if _recipe_job_worker is None:
+        _recipe_job_worker = RecipeJobWorker()
+    return _recipe_job_worker
@@ -0,0 +1,309 @@
+# backend/app/services/recipe_parser.py - TOLERANT INCREMENTAL PARSER FOR LLM RECIPE JSON
+import json
+import re
+from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from app.models.schemas import RecipeResponse
+
+_STRING_RUN = re.compile(r'[^"\\]+')
+_SCALAR_RUN = re.compile(r'[^\s,:\[\]{}"]+')
+_WHITESPACE_RUN = re.compile(r'\s+')
+_LITERALS = {"true": True, "false": False, "null": None, "True": True, "False": False, "None": None}
+
+# Frame slots: [container, pending_key, state]
+_CONTAINER, _KEY, _STATE = 0, 1, 2
+
+# Without these the recipe is unusable and the model is asked again
+REQUIRED_FIELDS = ("title", "ingredients", "instructions")
+
+class RecipeParseError(ValueError):
+    pass
+
+def _check_required(data: Dict[str, Any], required: Tuple[str, ...]) -> Dict[str, Any]:
+    missing = [field for field in required if not data.get(field)]
+    if missing:
+        raise RecipeParseError(f"Recipe JSON missing required fields: {', '.join(missing)}")
+    return data
+
+def _decode_string(raw: str) -> str:
+    if '\\' not in raw:
+        return raw
+    try:
+        return json.loads(f'"{raw}"')
+    except json.JSONDecodeError:
+        escaped = raw.replace('\n', '\\n').replace('\r', '\\r').replace('\t', '\\t')
+        try:
+            return json.loads(f'"{escaped}"')
+        except json.JSONDecodeError:
+            return raw.replace('\\"', '"')
+
+class IncrementalRecipeParser:
+    """Single-pass, chunk-at-a-time JSON parser that tolerates common LLM defects.
+
+    Text before the first ``{`` (prose, markdown fences) and after the root object
+    closes is skipped. Trailing commas, missing commas between values, stray
+    tokens and unterminated strings/arrays/objects are repaired in place; every
+    repair is recorded against the top-level field it happened in. A response
+    that ends before the root object closes was cut off, and ``finish()``
+    rejects it rather than return a recipe with fields missing or clipped.
+
+    ``feed()`` returns progressive events for the fields the UI streams: ``title``,
+    ``description``, and each ``ingredient`` / ``instruction`` list item.
+    """
+
+    STREAMED_SCALARS = ("title", "description")
+    STREAMED_LISTS = {"ingredients": "ingredient", "instructions": "instruction"}
+
+    def __init__(self):
+        self.root: Optional[Dict[str, Any]] = None
+        self.done = False
+        self.repairs: List[Tuple[str, Optional[str]]] = []
+        self._stack: List[list] = []
+        self._string: Optional[List[str]] = None
+        self._escape = False
+        self._scalar: Optional[List[str]] = None
+        self._events: List[Tuple[str, Dict[str, Any]]] = []
+
+    @property
+    def salvaged_fields(self) -> List[str]:
+        return sorted({field for _, field in self.repairs if field})
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "repaired": bool(self.repairs),
+            "repairs": [{"kind": kind, "field": field} for kind, field in self.repairs],
+            "salvaged_fields": self.salvaged_fields
+        }
+
+    def feed(self, chunk: str) -> List[Tuple[str, Dict[str, Any]]]:
+        i = 0
+        n = len(chunk)
+        while i < n and not self.done:
+            if self._string is not None:
+                if self._escape:
+                    self._string.append(chunk[i])
+                    self._escape = False
+                    i += 1
+                    continue
+                match = _STRING_RUN.match(chunk, i)
+                if match:
+                    self._string.append(match.group())
+                    i = match.end()
+                    continue
+                if chunk[i] == '\\':
+                    self._string.append('\\')
+                    self._escape = True
+                else:
+                    raw = ''.join(self._string)
+                    self._string = None
+                    self._on_string(_decode_string(raw))
+                i += 1
+                continue
+
+            if self._scalar is not None:
+                match = _SCALAR_RUN.match(chunk, i)
+                if match:
+                    self._scalar.append(match.group())
+                    i = match.end()
+                if i < n:
+                    self._end_scalar()
+                continue
+
+            if self.root is None:
+                i = chunk.find('{', i)
+                if i == -1:
+                    break
+                self.root = {}
+                self._stack.append([self.root, None, "start"])
+                i += 1
+                continue
+
+            c = chunk[i]
+            if c.isspace():
+                i = _WHITESPACE_RUN.match(chunk, i).end()
+            elif c == '"':
+                self._string = []
+                i += 1
+            elif c == '{' or c == '[':
+                self._open({} if c == '{' else [])
+                i += 1
+            elif c == '}' or c == ']':
+                self._close(dict if c == '}' else list)
+                i += 1
+            elif c == ',':
+                self._comma()
+                i += 1
+            elif c == ':':
+                self._colon()
+                i += 1
+            else:
+                self._scalar = []
+
+        events = self._events
+        self._events = []
+        return events
+
+    def finish(self, required: Tuple[str, ...] = REQUIRED_FIELDS) -> Dict[str, Any]:
+        """Return the parsed recipe object once the whole response has been fed"""
+        if self.root is None:
+            raise RecipeParseError("No JSON object found in response")
+        if not self.done:
+            self._repair("unterminated root")
+            raise RecipeParseError("Response ended before the recipe object closed (truncated)")
+        return _check_required(self.root, required)
+
+    # -- internals ---------------------------------------------------------
+
+    def _field(self) -> Optional[str]:
+        return self._stack[0][_KEY] if self._stack else None
+
+    def _repair(self, kind: str):
+        self.repairs.append((kind, self._field()))
+
+    def _on_string(self, value: str):
+        frame = self._stack[-1]
+        if isinstance(frame[_CONTAINER], dict):
+            state = frame[_STATE]
+            if state in ("start", "key", "comma"):
+                if state == "comma":
+                    self._repair("missing comma")
+                frame[_KEY] = value
+                frame[_STATE] = "colon"
+                return
+        self._value(value)
+
+    def _attach(self, value: Any) -> bool:
+        frame = self._stack[-1]
+        container = frame[_CONTAINER]
+        state = frame[_STATE]
+        if isinstance(container, dict):
+            if state == "colon":
+                self._repair("missing colon")
+            elif state != "value":
+                self._repair("dropped value without key")
+                return False
+            container[frame[_KEY]] = value
+        else:
+            if state == "comma":
+                self._repair("missing comma")
+            container.append(value)
+        frame[_STATE] = "comma"
+        return True
+
+    def _value(self, value: Any):
+        if not self._attach(value):
+            return
+        depth = len(self._stack)
+        frame = self._stack[-1]
+        if depth == 1 and frame[_KEY] in self.STREAMED_SCALARS and isinstance(value, str):
+            self._events.append((frame[_KEY], {"value": value}))
+        elif depth == 2 and isinstance(value, str) and isinstance(frame[_CONTAINER], list):
+            event = self.STREAMED_LISTS.get(self._stack[0][_KEY])
+            if event:
+                self._events.append((event, {"index": len(frame[_CONTAINER]) - 1, "value": value}))
+
+    def _end_scalar(self):
+        token = ''.join(self._scalar)
+        self._scalar = None
+        if token in _LITERALS:
+            self._value(_LITERALS[token])
+            return
+        try:
+            self._value(json.loads(token))
+        except ValueError:
+            self._repair("unquoted value")
+            self._value(token)
+
+    def _open(self, container):
+        self._attach(container)
+        self._stack.append([container, None, "start"])
+
+    def _pop(self):
+        frame = self._stack.pop()
+        if frame[_STATE] in ("colon", "value") and isinstance(frame[_CONTAINER], dict):
+            self.repairs.append(("dangling key", self._field() or frame[_KEY]))
+        if not self._stack:
+            self.done = True
+
+    def _close(self, kind: type):
+        frame = self._stack[-1]
+        if not isinstance(frame[_CONTAINER], kind):
+            if len(self._stack) == 1:
+                self._repair("stray closing bracket")
+                return
+            # e.g. "ingredients": ["a", "b" } -- the array was never closed
+            self._repair("unterminated array" if kind is dict else "unterminated object")
+            self._pop()
+            self._close(kind)
+            return
+        after_comma = "key" if isinstance(frame[_CONTAINER], dict) else "value"
+        if frame[_STATE] == after_comma:
+            self._repair("trailing comma")
+        self._pop()
+
+    def _comma(self):
+        frame = self._stack[-1]
+        if frame[_STATE] == "comma":
+            frame[_STATE] = "key" if isinstance(frame[_CONTAINER], dict) else "value"
+        else:
+            self._repair("stray comma")
+
+    def _colon(self):
+        frame = self._stack[-1]
+        container = frame[_CONTAINER]
+        if isinstance(container, dict) and frame[_STATE] == "colon":
+            frame[_STATE] = "value"
+            return
+        if (
+            isinstance(container, list)
+            and frame[_STATE] == "comma"
+            and container
+            and isinstance(container[-1], str)
+            and len(self._stack) > 1
+            and isinstance(self._stack[-2][_CONTAINER], dict)
+        ):
+            # e.g. "ingredients": ["a", "b", "instructions": [...] -- the last
+            # "item" was really the parent's next key
+            key = container.pop()
+            self._repair("unterminated array")
+            self._pop()
+            parent = self._stack[-1]
+            parent[_KEY] = key
+            parent[_STATE] = "value"
+            return
+        self._repair("stray colon")
+
+def parse_recipe_json(
+    text: str,
+    required: Tuple[str, ...] = REQUIRED_FIELDS
+) -> Tuple[Dict[str, Any], IncrementalRecipeParser]:
+    """Parse a complete response in one go; returns the data and the parser (for its report).
+
+    Well-formed responses take the C ``json`` fast path; only malformed ones pay
+    for the character-level repair pass.
+    """
+    parser = IncrementalRecipeParser()
+    start = text.find('{')
+    end = text.rfind('}')
+    if start != -1 and end > start:
+        try:
+            data = json.loads(text[start:end + 1])
+            if isinstance(data, dict):
+                parser.root = data
+                parser.done = True
+                return _check_required(data, required), parser
+        except ValueError:
+            pass
+    parser.feed(text)
+    return parser.finish(required), parser
+
+def recipe_events(recipe: "RecipeResponse") -> List[Tuple[str, Dict[str, Any]]]:
+    """The same progressive events for a recipe that is already complete (e.g. a cache hit)"""
+    events = [
+        ("title", {"value": recipe.title}),
+        ("description", {"value": recipe.description})
+    ]
+    events.extend(("ingredient", {"index": i, "value": v}) for i, v in enumerate(recipe.ingredients))
+    events.extend(("instruction", {"index": i, "value": v}) for i, v in enumerate(recipe.instructions))
+    return events
@@ -0,0 +1,279 @@
+# backend/app/services/recipe_pool.py - OFF-PEAK PRE-GENERATED RECIPE POOL
+import asyncio
+import json
+import logging
+import os
+import socket
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from app.models.schemas import RecipeResponse, MoodEnum, DetailLevelEnum
+from app.core.config import get_settings
+from app.services.llm_executor import get_llm_executor
+from app.services.recipe_cache import canonical_recipe_request, recipe_cache_key
+
+logger = logging.getLogger(__name__)
+
+def parse_quiet_hours(spec: str) -> Tuple[int, int]:
+    """"1-6" -> (1, 6): UTC hours [start, end), wrapping past midnight when start > end"""
+    start, end = (int(part) % 24 for part in spec.split("-", 1))
+    return start, end
+
+def combo_arguments(canonical: Dict[str, Any]) -> Dict[str, Any]:
+    """generate_recipe-style arguments for a canonical request (keys round-trip to the same cache key)"""
+    return {
+        "ingredients": canonical["ingredients"],
+        "mood": MoodEnum(canonical["mood"]),
+        "cuisine_preference": canonical["cuisine"],
+        "dietary_preferences": canonical["dietary_preferences"],
+        "allergies": canonical["allergies"],
+        "health_goals": canonical["health_goals"],
+        "servings": canonical["servings"],
+        "detail_level": DetailLevelEnum(canonical["detail_level"])
+    }
+
+class RecipePool:
+    """Ready-made variants of the most requested recipes, generated while traffic is quiet.
+
+    Entries are keyed by the same canonical request key as the recipe cache, so
+    a pooled recipe is only ever served to a request with the same
+    ingredients, mood, cuisine and profile (allergies included). Each take
+    hands out the least-served variant, rotating users through them.
+
+    Passes hold a lease in the ``leases`` collection, renewed before every
+    model call, so replicas and the scheduled entry point never top up the
+    pool at the same time. Serverless functions never start the loop.
+    """
+
+    KEY_REFRESH_SECONDS = 300
+    PASS_LEASE = "recipe_pool_pass"
+    PASS_LEASE_SECONDS = 300  # Comfortably longer than one capacity wait plus a generation
+
+    def __init__(self):
+        self.settings = get_settings()
+        self.enabled = self.settings.ENABLE_RECIPE_POOL
+        # A frozen function would stop mid-pass; serverless deployments schedule the entry point below
+        self.runs_background = self.enabled and not self.settings.SERVERLESS
+        self.holder = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.executor = get_llm_executor()
+        self.quiet_hours = parse_quiet_hours(self.settings.RECIPE_POOL_QUIET_HOURS)
+
+        self._keys: Set[str] = set()
+        self._keys_loaded_at = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+        self.hits = 0
+        self.misses = 0
+        self.generated = 0
+        self.failed = 0
+        self.passes = 0
+        self.throttled = 0
+        self.passes_skipped = 0
+        self.last_pass_at: Optional[str] = None
+
+    # ---- serving ----
+
+    async def _known_keys(self, db) -> Set[str]:
+        """Keys with ready variants, refreshed periodically so non-pooled requests skip the round trip"""
+        if time.monotonic() - self._keys_loaded_at > self.KEY_REFRESH_SECONDS:
+            try:
+                self._keys = set(await db.get_pooled_keys())
+            except Exception as e:
+                logger.warning(f"Recipe pool key refresh failed: {str(e)}")
+            self._keys_loaded_at = time.monotonic()
+        return self._keys
+
+    async def take(self, key: str, db) -> Optional[RecipeResponse]:
+        if not self.enabled or db is None:
+            return None
+        if key not in await self._known_keys(db):
+            return None
+        try:
+            doc = await db.take_pooled_recipe(key)
+        except Exception as e:
+            logger.warning(f"Recipe pool read failed: {str(e)}")
+            return None
+        if not doc:
+            self.misses += 1
+            self._keys.discard(key)
+            return None
+        self.hits += 1
+        return RecipeResponse(**doc["recipe"])
+
+    # ---- mining ----
+
+    async def top_combinations(self, db) -> List[Dict[str, Any]]:
+        """The top-K canonical requests in recent history, most frequent first"""
+        since = datetime.utcnow() - timedelta(days=self.settings.RECIPE_POOL_LOOKBACK_DAYS)
+        docs = await db.get_recent_recipe_requests(since, self.settings.RECIPE_POOL_SCAN_LIMIT)
+
+        counts = Counter()
+        for doc in docs:
+            canonical = doc.get("request")
+            if not canonical:
+                # History written before requests were recorded: profile unknown, so pool for an empty one
+                if not doc.get("ingredients_used") or not doc.get("mood"):
+                    continue
+                canonical = canonical_recipe_request(ingredients=doc["ingredients_used"], mood=doc["mood"])
+            try:
+                combo_arguments(canonical)
+            except (KeyError, ValueError):
+                continue
+            counts[json.dumps(canonical, sort_keys=True)] += 1
+
+        return [json.loads(combo) for combo, _ in counts.most_common(self.settings.RECIPE_POOL_TOP_K)]
+
+    # ---- background generation ----
+
+    def in_quiet_hours(self, now: Optional[datetime] = None) -> bool:
+        hour = (now or datetime.utcnow()).hour
+        start, end = self.quiet_hours
+        if start <= end:
+            return start <= hour < end
+        return hour >= start or hour < end
+
+    def _interactive_load(self) -> bool:
+        """True while user-facing calls are waiting on, or crowding, the LLM pool"""
+        return (
+            self.executor.queued > 0
+            or self.executor.in_flight > self.settings.RECIPE_POOL_MAX_BUSY_WORKERS
+        )
+
+    async def _wait_for_capacity(self, recipe_service, force: bool) -> bool:
+        """Block until the model is idle enough to pre-generate; False ends the pass"""
+        for _ in range(12):
+            if not recipe_service.initialized or not recipe_service.breaker.available:
+                return False
+            if not force and not self.in_quiet_hours():
+                return False
+            if not self._interactive_load():
+                return True
+            self.throttled += 1
+            await asyncio.sleep(self.settings.RECIPE_POOL_MIN_CALL_INTERVAL_SECONDS)
+        logger.info("⏸️ Recipe pool pass stopped: interactive traffic is back")
+        return False
+
+    async def run_pass(self, db, recipe_service, force: bool = False) -> Dict[str, int]:
+        """Top up every popular combination to RECIPE_POOL_VARIANTS ready variants, one call at a time"""
+        summary = {"combinations": 0, "generated": 0, "failed": 0, "skipped": 0}
+        if not await db.acquire_lease(self.PASS_LEASE, self.holder, self.PASS_LEASE_SECONDS):
+            self.passes_skipped += 1
+            summary["skipped"] = 1
+            logger.info("⏭️ Recipe pool pass skipped: another process is running one")
+            return summary
+        try:
+            return await self._top_up(db, recipe_service, force, summary)
+        finally:
+            await db.release_lease(self.PASS_LEASE, self.holder)
+
+    async def _top_up(self, db, recipe_service, force: bool, summary: Dict[str, int]) -> Dict[str, int]:
+        self.passes += 1
+        self.last_pass_at = datetime.utcnow().isoformat()
+
+        combos = await self.top_combinations(db)
+        summary["combinations"] = len(combos)
+        logger.info(f"🍱 Recipe pool pass over {len(combos)} popular combinations")
+
+        for canonical in combos:
+            arguments = combo_arguments(canonical)
+            key = recipe_cache_key(**arguments)
+            titles = await db.get_pooled_titles(key)
+
+            for variant in range(len(titles), self.settings.RECIPE_POOL_VARIANTS):
+                if not await self._wait_for_capacity(recipe_service, force):
+                    return summary
+                if not await db.acquire_lease(self.PASS_LEASE, self.holder, self.PASS_LEASE_SECONDS):
+                    logger.warning("⏹️ Recipe pool pass stopped: lease taken over by another process")
+                    return summary
+                try:
+                    recipe = await recipe_service.generate_pool_variant(avoid_titles=titles, **arguments)
+                except Exception as e:
+                    self.failed += 1
+                    summary["failed"] += 1
+                    logger.warning(f"Pool variant generation failed: {str(e) or type(e).__name__}")
+                    continue
+
+                await db.save_pooled_recipe(
+                    key, variant, recipe.dict(exclude={"id"}), self.settings.RECIPE_POOL_TTL_SECONDS
+                )
+                self._keys.add(key)
+                titles.append(recipe.title)
+                self.generated += 1
+                summary["generated"] += 1
+                await asyncio.sleep(self.settings.RECIPE_POOL_MIN_CALL_INTERVAL_SECONDS)
+
+        logger.info(f"✅ Recipe pool pass done: {summary}")
+        return summary
+
+    def ensure_running(self, recipe_service):
+        """Start the quiet-hours loop once per process (needs a running event loop); never on serverless hosts"""
+        if not self.runs_background or (self._task is not None and not self._task.done()):
+            return
+        try:
+            self._task = asyncio.get_running_loop().create_task(self._run(recipe_service))
+        except RuntimeError:
+            logger.warning("Recipe pool: no running event loop, background generation deferred")
+
+    async def _run(self, recipe_service):
+        from app.database.mongodb import get_database
+
+        while True:
+            await asyncio.sleep(self.settings.RECIPE_POOL_CHECK_INTERVAL_SECONDS)
+            if not self.in_quiet_hours():
+                continue
+            try:
+                await self.run_pass(await get_database(), recipe_service)
+            except Exception as e:
+                logger.error(f"Recipe pool pass failed: {str(e)}")
+
+    def stats(self) -> Dict[str, Any]:
+        served = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "runs_background": self.runs_background,
+            "background_running": self._task is not None and not self._task.done(),
+            "known_keys": len(self._keys),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / served, 3) if served else 0.0,
+            "generated": self.generated,
+            "failed": self.failed,
+            "passes": self.passes,
+            "throttled": self.throttled,
+            "passes_skipped": self.passes_skipped,
+            "last_pass_at": self.last_pass_at
+        }
+
+_recipe_pool: Optional[RecipePool] = None
+
+def get_recipe_pool() -> RecipePool:
+    global _recipe_pool
+    if _recipe_pool is None:
+        _recipe_pool = RecipePool()
+    return _recipe_pool
+
+async def _main():
+    """Run one pass now, e.g. from a scheduled job on hosts without long-lived workers"""
+    import argparse
+    from app.database.mongodb import get_database
+    from app.services.recipe_service import RecipeService
+
+    parser = argparse.ArgumentParser(description="Pre-generate popular recipes into the ready pool")
+    parser.add_argument("--respect-quiet-hours", action="store_true", help="Stop if outside RECIPE_POOL_QUIET_HOURS")
+    args = parser.parse_args()
+
+    recipe_service = RecipeService()
+    await recipe_service.initialize()
+    if not recipe_service.initialized:
+        raise SystemExit("Recipe model unavailable; nothing pre-generated")
+    summary = await get_recipe_pool().run_pass(
+        await get_database(), recipe_service, force=not args.respect_quiet_hours
+    )
+    print(json.dumps(summary))
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_main())
@@ -0,0 +1,52 @@
+# backend/app/services/recipe_schema.py - GEMINI RESPONSE SCHEMA DERIVED FROM RecipeResponse
+from functools import lru_cache
+from typing import Any, Dict
+
+from app.models.schemas import RecipeResponse
+
+# Filled in by the server, never by the model
+_SERVER_OWNED_FIELDS = {"id", "mood_message", "match_score", "generated_at"}
+
+# Keys of the OpenAPI subset Gemini's response_schema understands
+_SUPPORTED_KEYS = ("type", "format", "enum", "description")
+
+def _convert(node: Dict[str, Any], defs: Dict[str, Any]) -> Dict[str, Any]:
+    if "$ref" in node:
+        return _convert(defs[node["$ref"].split("/")[-1]], defs)
+    if "anyOf" in node:
+        # Optional[X] -> X, nullable
+        options = [option for option in node["anyOf"] if option.get("type") != "null"]
+        converted = _convert(options[0], defs)
+        converted["nullable"] = True
+        return converted
+
+    converted = {key: node[key] for key in _SUPPORTED_KEYS if key in node}
+    if "items" in node:
+        converted["items"] = _convert(node["items"], defs)
+    if "properties" in node:
+        converted["properties"] = {
+            name: _convert(prop, defs) for name, prop in node["properties"].items()
+        }
+        # Ask for every field so defaults in _build_recipe are a last resort
+        converted["required"] = list(converted["properties"])
+    return converted
+
+@lru_cache()
+def recipe_response_schema() -> Dict[str, Any]:
+    """response_schema for recipe generation, built from RecipeResponse/NutritionInfo"""
+    schema = RecipeResponse.model_json_schema()
+    defs = schema.get("$defs", {})
+    properties = {
+        name: prop for name, prop in schema["properties"].items()
+        if name not in _SERVER_OWNED_FIELDS
+    }
+    return _convert({"type": "object", "properties": properties}, defs)
+
+@lru_cache()
+def batch_recipe_response_schema() -> Dict[str, Any]:
+    """response_schema for packing several recipes into one call"""
+    return {
+        "type": "object",
+        "properties": {"recipes": {"type": "array", "items": recipe_response_schema()}},
+        "required": ["recipes"]
+    }
@@ -1,15 +1,23 @@
 # backend/app/services/recipe_service.py - ENHANCED WITH MOOD MESSAGES
-import google.generativeai as genai
-import json
-import re
-from typing import List, Optional, Dict, Any
+import asyncio
+import time
+from typing import List, Optional, Dict, Any, AsyncIterator, Tuple
 import logging
 from datetime import datetime
-import asyncio
 
-from app.models.schemas import RecipeResponse, NutritionInfo, MoodEnum
+from app.models.schemas import RecipeRequest, RecipeResponse, NutritionInfo, MoodEnum, DetailLevelEnum
 from app.core.config import get_settings
 from app.utils.exceptions import CustomException
+from app.utils.single_flight import SingleFlight
+from app.utils.retry_policy import RetryPolicy
+from app.utils.circuit_breaker import BackgroundReinitializer, CircuitOpenError, get_gemini_circuit_breaker
+from app.services.llm_executor import get_llm_executor
+from app.services.llm_provider import get_llm_provider
+from app.services.recipe_cache import get_recipe_cache, recipe_cache_key
+from app.services.recipe_pool import get_recipe_pool
+from app.services.recipe_similarity import get_recipe_similarity_index
+from app.services.recipe_parser import IncrementalRecipeParser, parse_recipe_json, recipe_events
+from app.services.recipe_schema import batch_recipe_response_schema, recipe_response_schema
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +26,54 @@ def __init__(self):
         self.settings = get_settings()
         self.model = None
         self.initialized = False
+        self.provider = get_llm_provider()
+        self.executor = get_llm_executor()
+        self.cache = get_recipe_cache()
+        self.pool = get_recipe_pool()
+        self.similarity = get_recipe_similarity_index()
+        self._background_tasks = set()
+        self.single_flight = SingleFlight("recipe_generation")
+        self.retry_policy = RetryPolicy(
+            "recipe_generation",
+            max_attempts=self.settings.MAX_RECIPE_GENERATION_RETRIES,
+            attempt_timeout=self.settings.RECIPE_ATTEMPT_TIMEOUT,
+            base_delay=self.settings.RETRY_BASE_DELAY,
+            max_delay=self.settings.RETRY_MAX_DELAY,
+            hedge=self.settings.ENABLE_HEDGED_REQUESTS,
+            hedge_percentile=self.settings.HEDGE_PERCENTILE,
+            give_up_on=(CircuitOpenError,),
+            breaker=get_gemini_circuit_breaker()
+        )
+        
+        # While the breaker is open or the model failed to initialize, serve cached or
+        # fallback recipes instantly and keep re-initializing in the background
+        self.breaker = get_gemini_circuit_breaker()
+        self.reinitializer = BackgroundReinitializer(
+            "recipe_service",
+            self.initialize,
+            lambda: self.initialized,
+            self.breaker,
+            base_delay=self.settings.AI_REINIT_BASE_DELAY,
+            max_delay=self.settings.AI_REINIT_MAX_DELAY
+        )
+        self.breaker.on_open(self.reinitializer.ensure_running)
+        self.fallbacks_served = 0
+        self.generation_stats = {
+            mode: {"calls": 0, "recipes": 0, "retries": 0, "prompt_tokens": 0, "output_tokens": 0}
+            for mode in ("structured", "prompt")
+        }
+        
+        # Output-length guidance and token budgets per requested detail level
+        self.detail_guidance = {
+            DetailLevelEnum.BRIEF: "Keep it short: at most 6 ingredients lines and 4 concise steps.",
+            DetailLevelEnum.STANDARD: "Use 4-8 clear steps.",
+            DetailLevelEnum.DETAILED: "Give thorough steps with timings, technique tips and doneness cues."
+        }
+        self.detail_token_budgets = {
+            DetailLevelEnum.BRIEF: 450,
+            DetailLevelEnum.STANDARD: 800,
+            DetailLevelEnum.DETAILED: 1400
+        }
         
         # Mood-specific guidance for recipe generation
         self.mood_guidance = {
@@ -63,27 +119,50 @@ def __init__(self):
             }
         }
     
-    async def initialize(self):
+    async def initialize(self, probe: bool = True):
+        """Configure the model; with probe=False skip the test call (see warmup())"""
         try:
-            genai.configure(api_key=self.settings.GEMINI_API_KEY)
             model_name = 'gemini-2.5-flash-lite'
             
-            logger.info(f"Initializing recipe model: {model_name}")
-            self.model = genai.GenerativeModel(model_name)
+            logger.info(f"Initializing recipe model: {model_name} ({self.provider.name})")
+            self.model = self.provider.model(model_name)
             
-            test_prompt = "Respond with 'OK' if working."
-            response = self.model.generate_content(test_prompt)
-            
-            if response and response.text and 'OK' in response.text.upper():
+            if not probe:
+                # Optimistic until warmup() or a real call says otherwise; the breaker contains failures
                 self.initialized = True
-                logger.info(f"✅ Recipe service initialized successfully with {model_name}")
-            else:
-                raise Exception("Model test failed")
+                logger.info(f"✅ Recipe service configured with {model_name} (probe deferred)")
+                return
+            
+            await self._probe()
+            self.initialized = True
+            logger.info(f"✅ Recipe service initialized successfully with {model_name}")
                     
         except Exception as e:
             logger.error(f"Failed to initialize Gemini AI: {str(e)}")
             logger.warning("Recipe generation will use fallback mode")
             self.initialized = False
+            self.reinitializer.ensure_running()
+    
+    async def _probe(self):
+        test_prompt = "Respond with 'OK' if working."
+        response = await self.executor.run(
+            self.model.generate_content,
+            test_prompt,
+            call_site="recipe_probe"
+        )
+        if not (response and response.text and 'OK' in response.text.upper()):
+            raise Exception("Model test failed")
+    
+    async def warmup(self):
+        """Deferred probe, run in the background after an initialize(probe=False)"""
+        try:
+            await self._probe()
+            logger.info("✅ Recipe model warm-up probe succeeded")
+        except Exception as e:
+            logger.error(f"Recipe model warm-up probe failed: {str(e)}")
+            logger.warning("Recipe generation will use fallback mode")
+            self.initialized = False
+            self.reinitializer.ensure_running()
     
     def _create_recipe_prompt(
         self, 
@@ -92,7 +171,8 @@ def _create_recipe_prompt(
         dietary_preferences: List[str],
         allergies: List[str], 
         health_goals: List[str],
-        cuisine_preference: Optional[str] = None
+        cuisine_preference: Optional[str] = None,
+        servings: int = 2
     ) -> str:
         mood_info = self.mood_guidance.get(mood, self.mood_guidance[MoodEnum.HAPPY])
         
@@ -115,7 +195,7 @@ def _create_recipe_prompt(
 - MUST AVOID (Allergies): {allergies_str}
 - Health Goals: {health_goals_str}
 - Cuisine Preference: {cuisine_preference if cuisine_preference and cuisine_preference != 'any' else 'Any cuisine'}
-- Servings: 2
+- Servings: {servings}
 
 CRITICAL RULES:
 1. Use ONLY the ingredients listed above as main ingredients
@@ -144,7 +224,7 @@ def _create_recipe_prompt(
   "prep_time": 15,
   "cook_time": 30,
   "total_time": 45,
-  "servings": 2,
+  "servings": {servings},
   "difficulty": "easy",
   "cuisine_type": "italian",
   "nutrition_info": {{
@@ -163,6 +243,141 @@ def _create_recipe_prompt(
 """
         return prompt.strip()
     
+    def _create_structured_prompt(
+        self,
+        ingredients: List[str],
+        mood: MoodEnum,
+        dietary_preferences: List[str],
+        allergies: List[str],
+        health_goals: List[str],
+        cuisine_preference: Optional[str] = None,
+        servings: int = 2,
+        detail_level: DetailLevelEnum = DetailLevelEnum.STANDARD
+    ) -> str:
+        """Compact prompt for JSON mode - the response schema carries the output format"""
+        mood_info = self.mood_guidance.get(mood, self.mood_guidance[MoodEnum.HAPPY])
+        cuisine = cuisine_preference.value if hasattr(cuisine_preference, 'value') else cuisine_preference
+        
+        lines = [
+            f"Create a {mood.value}-mood recipe: {mood_info['recipe_style']}; {mood_info['cooking_approach']}.",
+            f"Main ingredients (only these, plus salt, pepper, oil, water, basic spices): {', '.join(ingredients)}.",
+            f"MUST AVOID (allergies): {', '.join(allergies) if allergies else 'None'}.",
+            f"Dietary preferences: {', '.join(dietary_preferences) if dietary_preferences else 'None'}.",
+            f"Health goals: {', '.join(health_goals) if health_goals else 'General wellness'}.",
+            f"Cuisine: {cuisine if cuisine and cuisine != 'any' else 'Any'}. Servings: {servings}.",
+            self.detail_guidance[detail_level],
+            f"Title should reflect the mood; description should say how it suits feeling {mood.value}."
+        ]
+        return '\n'.join(lines)
+    
+    def _create_batch_prompt(
+        self,
+        slots: List[RecipeRequest],
+        dietary_preferences: List[str],
+        allergies: List[str],
+        health_goals: List[str]
+    ) -> str:
+        """One compact prompt for several recipes - the profile is stated once, then one line per slot"""
+        lines = [
+            f"Create {len(slots)} recipes and return them in order in the \"recipes\" array, one per request below.",
+            "Each uses only its own main ingredients (plus salt, pepper, oil, water, basic spices); "
+            "its title should reflect its mood and its description say how it suits that mood.",
+            f"MUST AVOID in every recipe (allergies): {', '.join(allergies) if allergies else 'None'}.",
+            f"Dietary preferences: {', '.join(dietary_preferences) if dietary_preferences else 'None'}.",
+            f"Health goals: {', '.join(health_goals) if health_goals else 'General wellness'}."
+        ]
+        for number, slot in enumerate(slots, 1):
+            mood_info = self.mood_guidance.get(slot.mood, self.mood_guidance[MoodEnum.HAPPY])
+            cuisine = slot.cuisine_preference.value if hasattr(slot.cuisine_preference, 'value') else slot.cuisine_preference
+            lines.append(
+                f"Recipe {number}: {slot.mood.value} mood - {mood_info['recipe_style']}. "
+                f"Ingredients: {', '.join(slot.ingredients)}. "
+                f"Cuisine: {cuisine if cuisine and cuisine != 'any' else 'Any'}. Servings: {slot.servings or 2}. "
+                f"{self.detail_guidance[slot.detail_level]}"
+            )
+        return '\n'.join(lines)
+    
+    def _max_output_tokens(self, ingredient_count: int, servings: int, detail_level: DetailLevelEnum) -> int:
+        """Size the output budget to the recipe actually requested instead of a flat 2048"""
+        budget = self.detail_token_budgets[detail_level]
+        budget += 30 * ingredient_count + 10 * max(servings - 2, 0)
+        return min(budget, 2048)
+    
+    def _generation_config(self, max_output_tokens: int = 2048, structured: bool = False, response_schema=None):
+        options = {}
+        if structured:
+            options["response_mime_type"] = "application/json"
+            options["response_schema"] = response_schema or recipe_response_schema()
+        return self.provider.generation_config(
+            temperature=0.7,
+            top_p=0.8,
+            top_k=40,
+            max_output_tokens=max_output_tokens,
+            **options
+        )
+    
+    def _prepare_generation(
+        self,
+        ingredients: List[str],
+        mood: MoodEnum,
+        dietary_preferences: List[str],
+        allergies: List[str],
+        health_goals: List[str],
+        cuisine_preference: Optional[str] = None,
+        servings: int = 2,
+        detail_level: DetailLevelEnum = DetailLevelEnum.STANDARD
+    ) -> Tuple[str, Any, str]:
+        """Return (prompt, generation_config, mode) for the configured output mode"""
+        if self.settings.ENABLE_STRUCTURED_OUTPUT:
+            prompt = self._create_structured_prompt(
+                ingredients, mood, dietary_preferences, allergies, health_goals,
+                cuisine_preference, servings, detail_level
+            )
+            config = self._generation_config(
+                max_output_tokens=self._max_output_tokens(len(ingredients), servings, detail_level),
+                structured=True
+            )
+            return prompt, config, "structured"
+        
+        prompt = self._create_recipe_prompt(
+            ingredients, mood, dietary_preferences, allergies, health_goals,
+            cuisine_preference, servings
+        )
+        return prompt, self._generation_config(), "prompt"
+    
+    def _record_usage(self, mode: str, response) -> None:
+        stats = self.generation_stats[mode]
+        stats["calls"] += 1
+        usage = getattr(response, "usage_metadata", None)
+        if usage:
+            stats["prompt_tokens"] += getattr(usage, "prompt_token_count", 0) or 0
+            stats["output_tokens"] += getattr(usage, "candidates_token_count", 0) or 0
+            logger.info(
+                f"📊 {mode} generation tokens - prompt: {usage.prompt_token_count}, "
+                f"output: {usage.candidates_token_count}"
+            )
+    
+    def usage_stats(self) -> Dict[str, Any]:
+        """Token and retry totals per output mode, for comparing structured vs prompt mode"""
+        summary = {}
+        for mode, stats in self.generation_stats.items():
+            calls = stats["calls"]
+            summary[mode] = {
+                **stats,
+                "avg_prompt_tokens": round(stats["prompt_tokens"] / calls, 1) if calls else 0,
+                "avg_output_tokens": round(stats["output_tokens"] / calls, 1) if calls else 0,
+                "retries_per_recipe": round(stats["retries"] / stats["recipes"], 3) if stats["recipes"] else 0
+            }
+        return summary
+    
+    def resilience_stats(self) -> Dict[str, Any]:
+        return {
+            "initialized": self.initialized,
+            "fallbacks_served": self.fallbacks_served,
+            "reinitializing": self.reinitializer.running,
+            "reinit_attempts": self.reinitializer.attempts
+        }
+    
     def _create_mood_message(self, recipe_title: str, mood: MoodEnum) -> str:
         """Generate a personalized mood message for the recipe"""
         mood_info = self.mood_guidance.get(mood, self.mood_guidance[MoodEnum.HAPPY])
@@ -171,45 +386,23 @@ def _create_mood_message(self, recipe_title: str, mood: MoodEnum) -> str:
     
     def _parse_recipe_response(self, response_text: str, mood: MoodEnum) -> RecipeResponse:
         try:
-            # Clean up the response
-            cleaned_text = response_text.strip()
-            
-            # Remove markdown code blocks
-            if cleaned_text.startswith('```json'):
-                cleaned_text = cleaned_text[7:]
-            elif cleaned_text.startswith('```'):
-                cleaned_text = cleaned_text[3:]
-            
-            if cleaned_text.endswith('```'):
-                cleaned_text = cleaned_text[:-3]
-            
-            cleaned_text = cleaned_text.strip()
-            
-            # Try to extract JSON object
-            json_match = re.search(r'\{.*\}', cleaned_text, re.DOTALL)
-            if json_match:
-                cleaned_text = json_match.group()
-            
-            # Fix common JSON errors
-            cleaned_text = re.sub(r',(\s*[}\]])', r'\1', cleaned_text)
-            cleaned_text = re.sub(r'"\s*\n\s*"', '",\n"', cleaned_text)
-            
-            logger.info(f"Parsing JSON response (length: {len(cleaned_text)} chars)")
-            
-            try:
-                recipe_data = json.loads(cleaned_text)
-            except json.JSONDecodeError as json_error:
-                logger.error(f"JSON decode error at position {json_error.pos}")
-                start = cleaned_text.find('{')
-                end = cleaned_text.rfind('}')
-                if start != -1 and end != -1:
-                    cleaned_text = cleaned_text[start:end+1]
-                    recipe_data = json.loads(cleaned_text)
-                else:
-                    raise
+            logger.info(f"Parsing JSON response (length: {len(response_text)} chars)")
+            recipe_data, parser = parse_recipe_json(response_text)
+            return self._build_recipe(recipe_data, parser, mood)
+        except Exception as e:
+            logger.error(f"Recipe parsing error: {str(e)}")
+            raise Exception(f"Failed to parse recipe: {str(e)}")
+    
+    def _build_recipe(self, recipe_data: Dict[str, Any], parser: IncrementalRecipeParser, mood: MoodEnum) -> RecipeResponse:
+        try:
+            if parser.repairs:
+                logger.warning(
+                    f"Salvaged malformed recipe JSON: {len(parser.repairs)} repairs "
+                    f"in fields {parser.salvaged_fields}"
+                )
             
             # Extract and validate fields
-            nutrition_data = recipe_data.get('nutrition_info', {})
+            nutrition_data = recipe_data.get('nutrition_info') or {}
             
             nutrition_info = NutritionInfo(
                 calories=float(nutrition_data.get('calories', 300)),
@@ -245,7 +438,7 @@ def _parse_recipe_response(self, response_text: str, mood: MoodEnum) -> RecipeRe
             return recipe
             
         except Exception as e:
-            logger.error(f"Recipe parsing error: {str(e)}")
+            logger.error(f"Recipe validation error: {str(e)}")
             raise Exception(f"Failed to parse recipe: {str(e)}")
     
     def _create_fallback_recipe(self, ingredients: List[str], mood: MoodEnum) -> RecipeResponse:
@@ -286,9 +479,21 @@ def _create_fallback_recipe(self, ingredients: List[str], mood: MoodEnum) -> Rec
                 fiber=4, sugar=6, sodium=400
             ),
             tags=[mood.value, "simple", "homemade"],
-            mood_message=mood_message
+            mood_message=mood_message,
+            fallback=True
         )
     
+    def _serve_fallback(self, ingredients: List[str], mood: MoodEnum) -> RecipeResponse:
+        """Answer instantly while the AI is down instead of queueing on a failing model"""
+        self.fallbacks_served += 1
+        if not self.initialized:
+            self.reinitializer.ensure_running()
+        logger.warning(
+            f"⚠️ AI unavailable (initialized={self.initialized}, circuit={self.breaker.state}) "
+            f"- serving fallback recipe"
+        )
+        return self._create_fallback_recipe(ingredients, mood)
+    
     async def generate_recipe(
         self,
         ingredients: List[str],
@@ -297,65 +502,501 @@ async def generate_recipe(
         allergies: List[str] = [],
         health_goals: List[str] = [],
         cuisine_preference: Optional[str] = None,
-        max_retries: int = 3
+        db=None,
+        force_fresh: bool = False,
+        servings: int = 2,
+        detail_level: DetailLevelEnum = DetailLevelEnum.STANDARD,
+        allow_close_match: bool = False
     ) -> RecipeResponse:
         
         if not ingredients:
             raise CustomException(status_code=400, detail="At least one ingredient is required")
         
-        if not self.initialized:
-            logger.error("❌ AI not initialized - check your GEMINI_API_KEY in .env file")
+        cache_key = recipe_cache_key(
+            ingredients=ingredients,
+            mood=mood,
+            cuisine_preference=cuisine_preference,
+            dietary_preferences=dietary_preferences,
+            allergies=allergies,
+            health_goals=health_goals,
+            servings=servings,
+            detail_level=detail_level
+        )
+        
+        if force_fresh:
+            self.cache.record_bypass()
+        else:
+            # Pre-generated variants rotate; the cache would hand everyone the same one
+            pooled_recipe = await self.pool.take(cache_key, db)
+            if pooled_recipe:
+                logger.info(f"⚡ Serving pre-generated recipe: {pooled_recipe.title}")
+                return pooled_recipe
+            cached_recipe = await self.cache.get(cache_key, db)
+            if cached_recipe:
+                logger.info(f"⚡ Serving cached recipe: {cached_recipe.title}")
+                return cached_recipe
+            
+            if allow_close_match:
+                close_match = await self._close_match(
+                    cache_key, db,
+                    ingredients=ingredients,
+                    mood=mood,
+                    dietary_preferences=dietary_preferences,
+                    allergies=allergies,
+                    health_goals=health_goals,
+                    cuisine_preference=cuisine_preference,
+                    servings=servings,
+                    detail_level=detail_level
+                )
+                if close_match:
+                    return close_match
+        
+        if not self.initialized or not self.breaker.available:
+            return self._serve_fallback(ingredients, mood)
+        
+        prompt, generation_config, mode = self._prepare_generation(
+            ingredients=ingredients,
+            mood=mood,
+            dietary_preferences=dietary_preferences,
+            allergies=allergies,
+            health_goals=health_goals,
+            cuisine_preference=cuisine_preference,
+            servings=servings,
+            detail_level=detail_level
+        )
+        
+        # Identical concurrent requests share one model call
+        recipe = await self.single_flight.do(
+            cache_key,
+            lambda: self._generate_with_model(prompt, generation_config, mode, ingredients, mood, cache_key, db)
+        )
+        
+        # Each caller gets its own copy to annotate and persist
+        return recipe.copy(deep=True)
+    
+    async def _close_match(self, cache_key: str, db, **request: Any) -> Optional[RecipeResponse]:
+        """A stored recipe for a similar ingredient set under the same mood/cuisine/allergy/diet constraints.
+        
+        With CLOSE_MATCH_BACKGROUND_REFRESH the exact recipe is generated in the
+        background, so the next identical request is a cache hit.
+        """
+        if not self.settings.ENABLE_CLOSE_MATCH or db is None:
+            return None
+        try:
+            await self.similarity.ensure_loaded(db)
+        except Exception as e:
+            logger.warning(f"Similarity index unavailable: {str(e)}")
+            return None
+        
+        partition = self.similarity.partition_key(
+            request["mood"], request["cuisine_preference"], request["allergies"], request["dietary_preferences"]
+        )
+        match = self.similarity.query(request["ingredients"], partition)
+        if not match:
+            return None
+        
+        score, _, recipe_data = match
+        recipe = RecipeResponse(**{**recipe_data, "id": None, "match_score": round(score, 3)})
+        logger.info(f"🔎 Serving close match ({score:.2f}): {recipe.title}")
+        
+        if self.settings.CLOSE_MATCH_BACKGROUND_REFRESH and self.initialized and self.breaker.available:
+            prompt, generation_config, mode = self._prepare_generation(**request)
+            task = asyncio.ensure_future(self.single_flight.do(
+                cache_key,
+                lambda: self._generate_with_model(
+                    prompt, generation_config, mode, request["ingredients"], request["mood"], cache_key, db
+                )
+            ))
+            self._background_tasks.add(task)
+            task.add_done_callback(self._background_done)
+        return recipe
+    
+    def _background_done(self, task: asyncio.Task):
+        self._background_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Background recipe refresh failed: {task.exception()}")
+    
+    def _slot_cache_key(
+        self,
+        slot: RecipeRequest,
+        dietary_preferences: List[str],
+        allergies: List[str],
+        health_goals: List[str]
+    ) -> str:
+        return recipe_cache_key(
+            ingredients=slot.ingredients,
+            mood=slot.mood,
+            cuisine_preference=slot.cuisine_preference,
+            dietary_preferences=dietary_preferences,
+            allergies=allergies,
+            health_goals=health_goals,
+            servings=slot.servings or 2,
+            detail_level=slot.detail_level
+        )
+    
+    def _is_packable(self, slot: RecipeRequest) -> bool:
+        """Small slots share a call; detailed or ingredient-heavy ones get their own"""
+        return (
+            slot.detail_level != DetailLevelEnum.DETAILED
+            and len(slot.ingredients) <= self.settings.BATCH_PACK_MAX_INGREDIENTS
+        )
+    
+    async def generate_batch(
+        self,
+        slots: List[RecipeRequest],
+        dietary_preferences: List[str] = [],
+        allergies: List[str] = [],
+        health_goals: List[str] = [],
+        db=None
+    ) -> List[Any]:
+        """Generate one recipe per slot, in slot order.
+        
+        Each result is a RecipeResponse or the exception that slot failed with,
+        so callers can return partial results. Small uncached slots are packed
+        BATCH_PACK_SIZE at a time into one structured call; everything else
+        (and any packed slot the model did not answer) goes through
+        generate_recipe with at most BATCH_MAX_PARALLEL calls in flight.
+        """
+        profile = {
+            "dietary_preferences": dietary_preferences,
+            "allergies": allergies,
+            "health_goals": health_goals
+        }
+        results: List[Any] = [None] * len(slots)
+        semaphore = asyncio.Semaphore(self.settings.BATCH_MAX_PARALLEL)
+        
+        pack_size = self.settings.BATCH_PACK_SIZE
+        if pack_size > 1 and self.settings.ENABLE_STRUCTURED_OUTPUT and self.initialized and self.breaker.available:
+            packable = []
+            for index, slot in enumerate(slots):
+                if not self._is_packable(slot):
+                    continue
+                if slot.force_fresh:
+                    self.cache.record_bypass()
+                else:
+                    cached_recipe = await self.cache.get(self._slot_cache_key(slot, **profile), db)
+                    if cached_recipe:
+                        results[index] = cached_recipe
+                        continue
+                packable.append(index)
+            
+            groups = [packable[i:i + pack_size] for i in range(0, len(packable), pack_size)]
+            groups = [group for group in groups if len(group) > 1]
+            
+            async def generate_group(group: List[int]) -> List[Optional[RecipeResponse]]:
+                async with semaphore:
+                    return await self._generate_packed([slots[i] for i in group], profile, db)
+            
+            packed = await asyncio.gather(*(generate_group(group) for group in groups))
+            for group, recipes in zip(groups, packed):
+                for index, recipe in zip(group, recipes):
+                    results[index] = recipe
+        
+        async def generate_slot(slot: RecipeRequest) -> RecipeResponse:
+            async with semaphore:
+                return await self.generate_recipe(
+                    ingredients=slot.ingredients,
+                    mood=slot.mood,
+                    cuisine_preference=slot.cuisine_preference,
+                    db=db,
+                    force_fresh=slot.force_fresh,
+                    servings=slot.servings or 2,
+                    detail_level=slot.detail_level,
+                    allow_close_match=slot.allow_close_match,
+                    **profile
+                )
+        
+        remaining = [index for index, result in enumerate(results) if result is None]
+        outcomes = await asyncio.gather(
+            *(generate_slot(slots[index]) for index in remaining),
+            return_exceptions=True
+        )
+        for index, outcome in zip(remaining, outcomes):
+            results[index] = outcome
+        
+        logger.info(
+            f"🍽️ Batch of {len(slots)} recipes: {len(slots) - len(remaining)} cached/packed, "
+            f"{len(remaining)} individual, {sum(isinstance(r, Exception) for r in results)} failed"
+        )
+        return results
+    
+    async def _generate_packed(
+        self,
+        slots: List[RecipeRequest],
+        profile: Dict[str, List[str]],
+        db=None
+    ) -> List[Optional[RecipeResponse]]:
+        """Generate several small recipes with one structured call; None marks slots left unanswered"""
+        prompt = self._create_batch_prompt(slots, **profile)
+        budget = sum(
+            self._max_output_tokens(len(slot.ingredients), slot.servings or 2, slot.detail_level)
+            for slot in slots
+        )
+        generation_config = self._generation_config(
+            max_output_tokens=min(budget, 8192),
+            structured=True,
+            response_schema=batch_recipe_response_schema()
+        )
+        
+        recipes: List[Optional[RecipeResponse]] = [None] * len(slots)
+        try:
+            response = await self.breaker.call(
+                lambda: asyncio.wait_for(
+                    self.executor.run(
+                        self.model.generate_content,
+                        prompt,
+                        generation_config=generation_config,
+                        call_site="recipe_batch"
+                    ),
+                    self.settings.RECIPE_ATTEMPT_TIMEOUT * len(slots)
+                )
+            )
+            self._record_usage("structured", response)
+            
+            # Each item is checked below; a slot with a bad item falls back on its own
+            data, parser = parse_recipe_json(response.text, required=("recipes",))
+            items = data["recipes"]
+            for position, (slot, item) in enumerate(zip(slots, items)):
+                if not isinstance(item, dict):
+                    continue
+                recipe = self._build_recipe(item, parser, slot.mood)
+                if recipe.ingredients and recipe.instructions:
+                    recipes[position] = recipe
+                    self.generation_stats["structured"]["recipes"] += 1
+                    await self.cache.set(self._slot_cache_key(slot, **profile), recipe, db)
+        except Exception as e:
+            logger.warning(f"Packed batch call failed, falling back to per-slot generation: {str(e) or type(e).__name__}")
+        
+        logger.info(f"📦 Packed call answered {sum(r is not None for r in recipes)}/{len(slots)} recipes")
+        return recipes
+    
+    async def generate_pool_variant(
+        self,
+        ingredients: List[str],
+        mood: MoodEnum,
+        dietary_preferences: List[str],
+        allergies: List[str],
+        health_goals: List[str],
+        cuisine_preference: Optional[str] = None,
+        servings: int = 2,
+        detail_level: DetailLevelEnum = DetailLevelEnum.STANDARD,
+        avoid_titles: List[str] = []
+    ) -> RecipeResponse:
+        """One off-peak variant for the ready pool: single attempt, no cache, no coalescing"""
+        prompt, generation_config, mode = self._prepare_generation(
+            ingredients=ingredients,
+            mood=mood,
+            dietary_preferences=dietary_preferences,
+            allergies=allergies,
+            health_goals=health_goals,
+            cuisine_preference=cuisine_preference,
+            servings=servings,
+            detail_level=detail_level
+        )
+        if avoid_titles:
+            prompt += f"\nMake a different dish from these: {'; '.join(avoid_titles)}."
+        
+        response = await self.breaker.call(
+            lambda: asyncio.wait_for(
+                self.executor.run(
+                    self.model.generate_content,
+                    prompt,
+                    generation_config=generation_config,
+                    call_site="recipe_pregeneration"
+                ),
+                self.settings.RECIPE_ATTEMPT_TIMEOUT
+            )
+        )
+        self._record_usage(mode, response)
+        if not response or not response.text:
+            raise Exception("Empty response from AI model")
+        
+        recipe = self._parse_recipe_response(response.text, mood)
+        if not recipe.ingredients or not recipe.instructions:
+            raise Exception("Recipe missing essential data")
+        return recipe
+    
+    async def _generate_with_model(
+        self,
+        prompt: str,
+        generation_config: Any,
+        mode: str,
+        ingredients: List[str],
+        mood: MoodEnum,
+        cache_key: str,
+        db=None
+    ) -> RecipeResponse:
+        async def attempt() -> RecipeResponse:
+            response = await self.breaker.call(
+                lambda: self.executor.run(
+                    self.model.generate_content,
+                    prompt,
+                    generation_config=generation_config,
+                    call_site="recipe"
+                )
+            )
+            self._record_usage(mode, response)
+            
+            if not response or not response.text:
+                raise Exception("Empty response from AI model")
+            
+            logger.info(f"📥 Received response from Gemini ({len(response.text)} chars)")
+            
+            recipe = self._parse_recipe_response(response.text, mood)
+            
+            if not recipe.ingredients or not recipe.instructions:
+                raise Exception("Recipe missing essential data")
+            return recipe
+        
+        def on_retry(attempt_index: int, error: BaseException):
+            self.generation_stats[mode]["retries"] += 1
+            logger.error(f"❌ Attempt {attempt_index + 1} failed: {str(error) or type(error).__name__}")
+        
+        logger.info(f"🔄 Generating mood-based recipe ({mode} mode)")
+        try:
+            recipe = await self.retry_policy.run(attempt, on_retry=on_retry)
+        except Exception as e:
+            logger.error(f"All attempts failed: {str(e) or type(e).__name__}")
+            if isinstance(e, CircuitOpenError) or not self.breaker.available:
+                return self._serve_fallback(ingredients, mood)
             raise CustomException(
-                status_code=503, 
-                detail="AI service not available. Please check API configuration."
+                status_code=500,
+                detail="Failed to generate recipe. Please try again."
             )
         
-        prompt = self._create_recipe_prompt(
+        logger.info(f"✅ Mood-based recipe generated: {recipe.title}")
+        self.generation_stats[mode]["recipes"] += 1
+        await self.cache.set(cache_key, recipe, db)
+        return recipe
+    
+    async def stream_recipe(
+        self,
+        ingredients: List[str],
+        mood: MoodEnum,
+        dietary_preferences: List[str] = [],
+        allergies: List[str] = [],
+        health_goals: List[str] = [],
+        cuisine_preference: Optional[str] = None,
+        db=None,
+        force_fresh: bool = False,
+        servings: int = 2,
+        detail_level: DetailLevelEnum = DetailLevelEnum.STANDARD,
+        allow_close_match: bool = False
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """Yield (event, data) pairs as recipe fields arrive, ending with ("recipe", RecipeResponse).
+
+        A failure after fields were streamed yields ("reset", ...) and the replacement recipe's fields.
+        """
+        
+        if not ingredients:
+            raise CustomException(status_code=400, detail="At least one ingredient is required")
+        
+        cache_key = recipe_cache_key(
+            ingredients=ingredients,
+            mood=mood,
+            cuisine_preference=cuisine_preference,
+            dietary_preferences=dietary_preferences,
+            allergies=allergies,
+            health_goals=health_goals,
+            servings=servings,
+            detail_level=detail_level
+        )
+        
+        if force_fresh:
+            self.cache.record_bypass()
+        else:
+            cached_recipe = await self.pool.take(cache_key, db) or await self.cache.get(cache_key, db)
+            if not cached_recipe and allow_close_match:
+                cached_recipe = await self._close_match(
+                    cache_key, db,
+                    ingredients=ingredients,
+                    mood=mood,
+                    dietary_preferences=dietary_preferences,
+                    allergies=allergies,
+                    health_goals=health_goals,
+                    cuisine_preference=cuisine_preference,
+                    servings=servings,
+                    detail_level=detail_level
+                )
+            if cached_recipe:
+                logger.info(f"⚡ Streaming ready recipe: {cached_recipe.title}")
+                for event in recipe_events(cached_recipe):
+                    yield event
+                yield ("recipe", cached_recipe)
+                return
+        
+        if not self.initialized or not self.breaker.available:
+            recipe = self._serve_fallback(ingredients, mood)
+            for event in recipe_events(recipe):
+                yield event
+            yield ("recipe", recipe)
+            return
+        
+        prompt, generation_config, mode = self._prepare_generation(
             ingredients=ingredients,
             mood=mood,
             dietary_preferences=dietary_preferences,
             allergies=allergies,
             health_goals=health_goals,
-            cuisine_preference=cuisine_preference
+            cuisine_preference=cuisine_preference,
+            servings=servings,
+            detail_level=detail_level
         )
         
-        for attempt in range(max_retries):
+        parser = IncrementalRecipeParser()
+        received_chars = 0
+        last_chunk = None
+        streamed = False
+        try:
+            logger.info("🔄 Streaming mood-based recipe")
+            if not self.breaker.allow_request():
+                raise CircuitOpenError("gemini is temporarily unavailable")
+            started = time.monotonic()
             try:
-                logger.info(f"🔄 Generating mood-based recipe (attempt {attempt + 1}/{max_retries})")
-                
-                response = self.model.generate_content(
+                async for chunk in self.executor.stream(
+                    self.model.generate_content,
                     prompt,
-                    generation_config=genai.types.GenerationConfig(
-                        temperature=0.7,
-                        top_p=0.8,
-                        top_k=40,
-                        max_output_tokens=2048,
-                    )
-                )
-                
-                if not response or not response.text:
-                    raise Exception("Empty response from AI model")
-                
-                logger.info(f"📥 Received response from Gemini ({len(response.text)} chars)")
-                
-                recipe = self._parse_recipe_response(response.text, mood)
-                
-                if not recipe.ingredients or not recipe.instructions:
-                    raise Exception("Recipe missing essential data")
-                
-                logger.info(f"✅ Mood-based recipe generated: {recipe.title}")
-                return recipe
-                    
+                    generation_config=generation_config,
+                    stream=True,
+                    call_site="recipe_stream"
+                ):
+                    last_chunk = chunk
+                    text = chunk.text or ""
+                    received_chars += len(text)
+                    for event in parser.feed(text):
+                        streamed = True
+                        yield event
+            except (asyncio.CancelledError, GeneratorExit):
+                # Client went away mid-stream: no verdict on the model's health
+                self.breaker.release_probe()
+                raise
             except Exception as e:
-                logger.error(f"❌ Attempt {attempt + 1} failed: {str(e)}")
-                
-                if attempt == max_retries - 1:
-                    logger.error("All attempts failed")
-                    raise CustomException(
-                        status_code=500,
-                        detail="Failed to generate recipe. Please try again."
-                    )
-                
-                await asyncio.sleep(1)
-        
-        raise CustomException(status_code=500, detail="Recipe generation failed")
\ No newline at end of file
+                self.breaker.record_failure(e)
+                raise
+            self.breaker.record_success(time.monotonic() - started)
+            
+            logger.info(f"📥 Received streamed response from Gemini ({received_chars} chars)")
+            # Usage metadata arrives on the final chunk of a stream
+            self._record_usage(mode, last_chunk)
+            
+            recipe = self._build_recipe(parser.finish(), parser, mood)
+            if not recipe.ingredients or not recipe.instructions:
+                raise Exception("Recipe missing essential data")
+            
+            self.generation_stats[mode]["recipes"] += 1
+            await self.cache.set(cache_key, recipe, db)
+        except Exception as e:
+            logger.error(f"❌ Streaming generation failed, falling back to retry loop: {str(e)}")
+            recipe = await self.single_flight.do(
+                cache_key,
+                lambda: self._generate_with_model(prompt, generation_config, mode, ingredients, mood, cache_key, db)
+            )
+            recipe = recipe.copy(deep=True)
+            if streamed:
+                # The retry is a different recipe: retract the partial fields before replaying its own
+                yield ("reset", {"detail": "Streaming failed, replacing partial recipe"})
+                for event in recipe_events(recipe):
+                    yield event
+        
+        logger.info(f"✅ Streamed mood-based recipe: {recipe.title}")
+        yield ("recipe", recipe)
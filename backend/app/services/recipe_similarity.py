@@ -0,0 +1,273 @@
+# backend/app/services/recipe_similarity.py - APPROXIMATE-MATCH RECIPE REUSE (MINHASH / LSH)
+import asyncio
+import hashlib
+import json
+import logging
+import random
+import time
+from collections import OrderedDict, defaultdict
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from app.core.config import get_settings
+from app.services.recipe_cache import canonical_recipe_request
+
+logger = logging.getLogger(__name__)
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+# Plural endings folded so "tomatoes" and "tomato" land on the same token
+_PLURAL_RULES = (("ies", "y"), ("oes", "o"), ("ches", "ch"), ("shes", "sh"), ("s", ""))
+
+def normalize_ingredient(name: Any) -> str:
+    words = str(name).lower().replace('-', ' ').split()
+    if not words:
+        return ''
+    last = words[-1]
+    if len(last) > 3 and not last.endswith(("ss", "us")):
+        for suffix, replacement in _PLURAL_RULES:
+            if last.endswith(suffix):
+                last = last[:-len(suffix)] + replacement
+                break
+    words[-1] = last
+    return ' '.join(words)
+
+def ingredient_tokens(ingredients: Iterable[Any]) -> FrozenSet[str]:
+    return frozenset(token for token in (normalize_ingredient(i) for i in ingredients) if token)
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+class MinHasher:
+    """MinHash signatures from ``num_perm`` universal hash permutations of a 64-bit token hash.
+
+    Ingredient vocabularies are small, so each token's permuted hashes are
+    computed once and a signature is just the column-wise minimum.
+    """
+
+    MAX_CACHED_TOKENS = 20000
+
+    def __init__(self, num_perm: int = 64, seed: int = 1):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self.permutations = [
+            (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+            for _ in range(num_perm)
+        ]
+        self._rows: Dict[str, List[int]] = {}
+
+    def _row(self, token: str) -> List[int]:
+        row = self._rows.get(token)
+        if row is None:
+            h = int.from_bytes(hashlib.blake2b(token.encode('utf-8'), digest_size=8).digest(), 'big')
+            row = [((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for a, b in self.permutations]
+            if len(self._rows) < self.MAX_CACHED_TOKENS:
+                self._rows[token] = row
+        return row
+
+    def signature(self, tokens: Iterable[str]) -> Tuple[int, ...]:
+        rows = [self._row(token) for token in tokens]
+        if not rows:
+            return (_MAX_HASH,) * self.num_perm
+        return tuple(map(min, zip(*rows)))
+
+class MinHashLSH:
+    """Banded LSH buckets, partitioned so candidates only come from the same partition"""
+
+    def __init__(self, num_perm: int = 64, bands: int = 12):
+        if not 0 < bands <= num_perm:
+            raise ValueError("bands must be between 1 and num_perm")
+        # Any remainder of num_perm % bands is simply not banded
+        self.bands = bands
+        self.rows = num_perm // bands
+        self._buckets: Dict[Tuple[str, int, int], Set[str]] = defaultdict(set)
+
+    def _keys(self, partition: str, signature: Tuple[int, ...]) -> List[Tuple[str, int, int]]:
+        return [
+            (partition, band, hash(signature[band * self.rows:(band + 1) * self.rows]))
+            for band in range(self.bands)
+        ]
+
+    def insert(self, item_id: str, partition: str, signature: Tuple[int, ...]):
+        for key in self._keys(partition, signature):
+            self._buckets[key].add(item_id)
+
+    def remove(self, item_id: str, partition: str, signature: Tuple[int, ...]):
+        for key in self._keys(partition, signature):
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket.discard(item_id)
+                if not bucket:
+                    del self._buckets[key]
+
+    def query(self, partition: str, signature: Tuple[int, ...]) -> Set[str]:
+        candidates: Set[str] = set()
+        for key in self._keys(partition, signature):
+            candidates |= self._buckets.get(key, set())
+        return candidates
+
+class RecipeSimilarityIndex:
+    """Ingredient-set index over generated recipes for serving an instant close match.
+
+    Recipes are partitioned by mood, cuisine, allergies and dietary
+    preferences, so a match never crosses those constraints; within a
+    partition, LSH candidates are verified by exact Jaccard similarity against
+    ``threshold``. Each process loads the most recent history once and then
+    stays current through the history listener on its own saves.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.6,
+        num_perm: int = 64,
+        bands: int = 12,
+        max_entries: int = 5000
+    ):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.hasher = MinHasher(num_perm)
+        self.lsh = MinHashLSH(num_perm, bands)
+
+        # item_id -> (partition, tokens, signature, recipe)
+        self._entries: "OrderedDict[str, Tuple[str, FrozenSet[str], Tuple[int, ...], Dict[str, Any]]]" = OrderedDict()
+        self._exact: Dict[Tuple[str, FrozenSet[str]], str] = {}
+        self._loaded = False
+        self._lock = asyncio.Lock()
+
+        self.lookups = 0
+        self.matches = 0
+        self.candidates_checked = 0
+        self.added = 0
+        self.evicted = 0
+        self.total_query_seconds = 0.0
+
+    @staticmethod
+    def partition_key(
+        mood: Any,
+        cuisine_preference: Any = None,
+        allergies: Optional[List[str]] = None,
+        dietary_preferences: Optional[List[str]] = None
+    ) -> str:
+        canonical = canonical_recipe_request(
+            ingredients=[],
+            mood=mood,
+            cuisine_preference=cuisine_preference,
+            dietary_preferences=dietary_preferences,
+            allergies=allergies
+        )
+        return json.dumps([
+            canonical["mood"], canonical["cuisine"], canonical["allergies"], canonical["dietary_preferences"]
+        ])
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, item_id: str, ingredients: Iterable[Any], partition: str, recipe: Dict[str, Any]):
+        tokens = ingredient_tokens(ingredients)
+        if not tokens or item_id in self._entries:
+            return
+
+        # Keep only the newest recipe for an identical ingredient set
+        previous = self._exact.get((partition, tokens))
+        if previous is not None:
+            self._remove(previous)
+
+        signature = self.hasher.signature(tokens)
+        self._entries[item_id] = (partition, tokens, signature, recipe)
+        self._exact[(partition, tokens)] = item_id
+        self.lsh.insert(item_id, partition, signature)
+        self.added += 1
+
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+            self.evicted += 1
+
+    def _remove(self, item_id: str):
+        partition, tokens, signature, _ = self._entries.pop(item_id)
+        self.lsh.remove(item_id, partition, signature)
+        if self._exact.get((partition, tokens)) == item_id:
+            del self._exact[(partition, tokens)]
+
+    def query(self, ingredients: Iterable[Any], partition: str) -> Optional[Tuple[float, str, Dict[str, Any]]]:
+        """Best (similarity, item_id, recipe) at or above the threshold, else None"""
+        started = time.perf_counter()
+        self.lookups += 1
+        tokens = ingredient_tokens(ingredients)
+        best = None
+        if tokens:
+            for item_id in self.lsh.query(partition, self.hasher.signature(tokens)):
+                self.candidates_checked += 1
+                _, candidate_tokens, _, recipe = self._entries[item_id]
+                score = jaccard(tokens, candidate_tokens)
+                if score >= self.threshold and (best is None or score > best[0]):
+                    best = (score, item_id, recipe)
+        if best is not None:
+            self.matches += 1
+        self.total_query_seconds += time.perf_counter() - started
+        return best
+
+    # ---- history integration ----
+
+    def add_history(self, history_id: str, doc: Dict[str, Any]):
+        """Index one recipe_history document (also the listener for new saves)"""
+        recipe = doc.get("recipe") or {}
+        if not recipe.get("ingredients") or not recipe.get("instructions"):
+            return
+        canonical = doc.get("request")
+        if not canonical:
+            # Written before requests were recorded: the allergies and diet it honoured are unknown
+            return
+        partition = self.partition_key(
+            canonical["mood"], canonical["cuisine"], canonical["allergies"], canonical["dietary_preferences"]
+        )
+        self.add(str(history_id), doc.get("ingredients_used") or [], partition, recipe)
+
+    async def ensure_loaded(self, db):
+        if self._loaded:
+            return
+        async with self._lock:
+            if self._loaded:
+                return
+            from app.database.mongodb import add_history_listener
+
+            started = time.perf_counter()
+            docs = await db.get_recent_recipe_documents(self.max_entries)
+            # Oldest first so eviction order matches recency
+            for doc in reversed(docs):
+                self.add_history(str(doc["_id"]), doc)
+            add_history_listener(self.add_history)
+            self._loaded = True
+            logger.info(
+                f"✅ Recipe similarity index loaded: {len(self)} recipes "
+                f"in {(time.perf_counter() - started) * 1000:.0f}ms"
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "loaded": self._loaded,
+            "entries": len(self),
+            "threshold": self.threshold,
+            "lookups": self.lookups,
+            "matches": self.matches,
+            "match_ratio": round(self.matches / self.lookups, 3) if self.lookups else 0.0,
+            "avg_candidates": round(self.candidates_checked / self.lookups, 2) if self.lookups else 0.0,
+            "avg_query_us": round(self.total_query_seconds / self.lookups * 1_000_000, 1) if self.lookups else 0.0,
+            "added": self.added,
+            "evicted": self.evicted
+        }
+
+_similarity_index: Optional[RecipeSimilarityIndex] = None
+
+def get_recipe_similarity_index() -> RecipeSimilarityIndex:
+    global _similarity_index
+    if _similarity_index is None:
+        settings = get_settings()
+        _similarity_index = RecipeSimilarityIndex(
+            threshold=settings.CLOSE_MATCH_THRESHOLD,
+            num_perm=settings.CLOSE_MATCH_NUM_PERM,
+            bands=settings.CLOSE_MATCH_BANDS,
+            max_entries=settings.CLOSE_MATCH_MAX_ENTRIES
+        )
+    return _similarity_index
@@ -1,4 +1,3 @@
-import google.generativeai as genai
 import logging
 from typing import List, Dict, Any
 import os
@@ -6,6 +5,10 @@
 
 from app.core.config import get_settings
 from app.utils.exceptions import CustomException
+from app.services.llm_executor import get_llm_executor
+from app.services.llm_provider import get_llm_provider
+from app.utils.retry_policy import RetryPolicy
+from app.utils.circuit_breaker import BackgroundReinitializer, CircuitOpenError, get_gemini_circuit_breaker
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +19,40 @@ def __init__(self):
         self.settings = get_settings()
         self.model = None
         self.initialized = False
+        self.provider = get_llm_provider()
+        self.executor = get_llm_executor()
+        self.audio_policy = RetryPolicy(
+            "audio_extraction",
+            max_attempts=self.settings.AUDIO_EXTRACTION_MAX_ATTEMPTS,
+            attempt_timeout=self.settings.AUDIO_EXTRACTION_ATTEMPT_TIMEOUT,
+            total_timeout=self.settings.AUDIO_EXTRACTION_TOTAL_TIMEOUT,
+            base_delay=self.settings.RETRY_BASE_DELAY,
+            max_delay=self.settings.RETRY_MAX_DELAY,
+            give_up_on=(CircuitOpenError,),
+            breaker=get_gemini_circuit_breaker()
+        )
+        self.text_policy = RetryPolicy(
+            "text_extraction",
+            max_attempts=self.settings.TEXT_EXTRACTION_MAX_ATTEMPTS,
+            attempt_timeout=self.settings.TEXT_EXTRACTION_ATTEMPT_TIMEOUT,
+            total_timeout=self.settings.TEXT_EXTRACTION_TOTAL_TIMEOUT,
+            base_delay=self.settings.RETRY_BASE_DELAY,
+            max_delay=self.settings.RETRY_MAX_DELAY,
+            hedge=self.settings.ENABLE_HEDGED_REQUESTS,
+            hedge_percentile=self.settings.HEDGE_PERCENTILE,
+            give_up_on=(CircuitOpenError,),
+            breaker=get_gemini_circuit_breaker()
+        )
+        self.breaker = get_gemini_circuit_breaker()
+        self.reinitializer = BackgroundReinitializer(
+            "voice_service",
+            self.initialize,
+            lambda: self.initialized,
+            self.breaker,
+            base_delay=self.settings.AI_REINIT_BASE_DELAY,
+            max_delay=self.settings.AI_REINIT_MAX_DELAY
+        )
+        self.breaker.on_open(self.reinitializer.ensure_running)
         
         self.ingredient_database = {
             'tomato', 'tomatoes', 'onion', 'onions', 'garlic', 'carrot', 'carrots',
@@ -39,23 +76,26 @@ def __init__(self):
             'walnuts', 'sesame seeds', 'chia seeds', 'dill', 'fennel'
         }
     
-    async def initialize(self):
-        """Initialize Gemini AI model"""
+    async def initialize(self, probe: bool = True):
+        """Initialize Gemini AI model; with probe=False skip the test call (see warmup())"""
         try:
-            genai.configure(api_key=self.settings.GEMINI_API_KEY)
-            
             model_options = ['gemini-2.5-flash-lite']
             
+            if not probe:
+                self.model = self.provider.model(model_options[0])
+                self.initialized = True
+                logger.info(f"Model configured: {model_options[0]} (probe deferred)")
+                return
+            
             for model_name in model_options:
                 try:
                     logger.info(f"Initializing model: {model_name}")
-                    self.model = genai.GenerativeModel(model_name)
+                    self.model = self.provider.model(model_name)
                     
-                    test_response = self.model.generate_content("Say OK")
-                    if test_response and test_response.text:
-                        self.initialized = True
-                        logger.info(f"Model initialized: {model_name}")
-                        return
+                    await self._probe()
+                    self.initialized = True
+                    logger.info(f"Model initialized: {model_name}")
+                    return
                 except Exception as e:
                     logger.warning(f"Model {model_name} failed: {e}")
                     continue
@@ -65,6 +105,26 @@ async def initialize(self):
         except Exception as e:
             logger.error(f"Gemini initialization failed: {str(e)}")
             self.initialized = False
+            self.reinitializer.ensure_running()
+    
+    async def _probe(self):
+        test_response = await self.executor.run(
+            self.model.generate_content,
+            "Say OK",
+            call_site="voice_probe"
+        )
+        if not (test_response and test_response.text):
+            raise Exception("Model test failed")
+    
+    async def warmup(self):
+        """Deferred probe, run in the background after an initialize(probe=False)"""
+        try:
+            await self._probe()
+            logger.info("Voice model warm-up probe succeeded")
+        except Exception as e:
+            logger.error(f"Voice model warm-up probe failed: {str(e)}")
+            self.initialized = False
+            self.reinitializer.ensure_running()
     
     async def transcribe_and_extract_ingredients(self, audio_file_path: str) -> List[str]:
         """
@@ -73,6 +133,8 @@ async def transcribe_and_extract_ingredients(self, audio_file_path: str) -> List
         try:
             if not self.initialized:
                 raise Exception("AI service not initialized")
+            if not self.breaker.available:
+                raise Exception("AI service temporarily unavailable - please type your ingredients instead")
             
             logger.info(f"Processing audio: {audio_file_path}")
             
@@ -104,20 +166,19 @@ async def transcribe_and_extract_ingredients(self, audio_file_path: str) -> List
             - Separate with commas
             """
             
-            # Run in executor with timeout
-            loop = asyncio.get_event_loop()
-            response = await asyncio.wait_for(
-                loop.run_in_executor(
-                    None,
-                    lambda: self.model.generate_content(
+            # Run on the shared LLM pool with per-attempt and overall deadlines
+            response = await self.audio_policy.run(
+                lambda: self.breaker.call(
+                    lambda: self.executor.run(
+                        self.model.generate_content,
                         [prompt, {"mime_type": mime_type, "data": audio_data}],
-                        generation_config=genai.types.GenerationConfig(
+                        generation_config=self.provider.generation_config(
                             temperature=0.1,
                             max_output_tokens=500
-                        )
+                        ),
+                        call_site="audio_extraction"
                     )
-                ),
-                timeout=30.0  # 30 second timeout
+                )
             )
             
             if not response or not response.text:
@@ -145,26 +206,25 @@ async def extract_from_text(self, text: str) -> List[str]:
             if not text or len(text.strip()) < 2:
                 raise Exception("Text too short")
             
-            if not self.initialized:
+            if not self.initialized or not self.breaker.available:
                 return self._simple_text_extraction(text)
             
             prompt = f"""Extract food ingredients from: "{text}"
             Return ONLY comma-separated ingredient names in lowercase.
             No extra text."""
             
-            loop = asyncio.get_event_loop()
-            response = await asyncio.wait_for(
-                loop.run_in_executor(
-                    None,
-                    lambda: self.model.generate_content(
+            response = await self.text_policy.run(
+                lambda: self.breaker.call(
+                    lambda: self.executor.run(
+                        self.model.generate_content,
                         prompt,
-                        generation_config=genai.types.GenerationConfig(
+                        generation_config=self.provider.generation_config(
                             temperature=0.1,
                             max_output_tokens=300
-                        )
+                        ),
+                        call_site="text_extraction"
                     )
-                ),
-                timeout=15.0  # 15 second timeout for text
+                )
             )
             
             ingredients = self._parse_ingredient_response(response.text)
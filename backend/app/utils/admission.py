@@ -0,0 +1,327 @@
+# backend/app/utils/admission.py - ADMISSION CONTROL FOR EXPENSIVE (LLM / AUDIO) REQUESTS
+import asyncio
+import json
+import logging
+import math
+import time
+from collections import OrderedDict, defaultdict, deque
+from typing import Any, Deque, Dict, FrozenSet, Optional, Tuple
+
+from app.core import metrics
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Requests that hold an LLM call or audio processing for their whole duration.
+# Everything else (history, mood logging, analytics, auth) bypasses admission.
+EXPENSIVE_ROUTES: FrozenSet[Tuple[str, str]] = frozenset({
+    ("POST", "/recipes/generate"),
+    ("POST", "/recipes/generate/stream"),
+    ("POST", "/recipes/generate/batch"),
+    ("POST", "/ingredients/extract-from-audio"),
+    ("POST", "/ingredients/extract-from-text"),
+})
+
+# Routes that run several model calls at once; they take one slot per call
+WEIGHTED_ROUTES: FrozenSet[Tuple[str, str]] = frozenset({
+    ("POST", "/recipes/generate/batch"),
+})
+
+# Generous size of one batch slot; at most BATCH_MAX_SLOTS of them are buffered before admission
+BATCH_SLOT_BYTES = 2048
+
+class AdmissionRejected(Exception):
+    def __init__(self, status_code: int, detail: str, retry_after: int):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = retry_after
+
+class AdmissionController:
+    """Caps concurrent expensive requests per worker, globally and per user.
+
+    A request that cannot start right away waits in a bounded queue. Each user
+    gets their own FIFO line, and a freed slot goes to the next user in
+    round-robin order, so one user with many queued requests cannot starve
+    the others. Each user may have ``per_user`` slots running and as many
+    requests again queued. A request that runs several model calls at once
+    takes one slot per call, capped at ``per_user``. Requests over that limit, or over the global queue size,
+    get a 429; one still queued after ``queue_timeout`` seconds gets a 503.
+    Both carry ``Retry-After``, estimated from recent service times.
+    """
+
+    def __init__(self, max_concurrent: int, per_user: int, queue_size: int, queue_timeout: float):
+        self.max_concurrent = max(1, max_concurrent)
+        self.per_user = max(1, per_user)
+        self.queue_size = max(0, queue_size)
+        self.queue_timeout = queue_timeout
+
+        self.active = 0
+        self.active_by_user: Dict[str, int] = {}
+        self.waiting: "OrderedDict[str, Deque[Tuple[asyncio.Future, int]]]" = OrderedDict()
+        self.queued = 0
+        self.holding = False  # Freed slots are being saved for a queued multi-slot request
+
+        self.admitted = 0
+        self.admitted_after_wait = 0
+        self.rejected: Dict[str, int] = defaultdict(int)
+        self.peak_active = 0
+        self.peak_queued = 0
+        self.avg_service_seconds = 5.0  # EWMA, seeded with a typical recipe call
+
+    def _units(self, units: int) -> int:
+        # Never more than one account may hold, so a heavy request is always admissible
+        return max(1, min(units, self.per_user, self.max_concurrent))
+
+    def _can_start(self, user: str, units: int = 1) -> bool:
+        return (
+            self.active + units <= self.max_concurrent
+            and self.active_by_user.get(user, 0) + units <= self.per_user
+        )
+
+    def _start(self, user: str, units: int = 1):
+        self.active += units
+        self.active_by_user[user] = self.active_by_user.get(user, 0) + units
+        self.admitted += 1
+        self.peak_active = max(self.peak_active, self.active)
+
+    def retry_after(self, rounds: Optional[float] = None) -> int:
+        """Seconds until a slot is likely free: queued rounds of work plus the current one"""
+        rounds = self.queued / self.max_concurrent if rounds is None else rounds
+        return int(min(60, max(1, math.ceil(self.avg_service_seconds * (rounds + 1)))))
+
+    def _reject(self, reason: str, status_code: int, detail: str, retry_after: int) -> AdmissionRejected:
+        self.rejected[reason] += 1
+        metrics.ADMISSION_REJECTED.inc(reason=reason)
+        return AdmissionRejected(status_code, detail, retry_after)
+
+    async def acquire(self, user: str, units: int = 1) -> float:
+        """Wait for ``units`` slots; returns seconds spent queued or raises AdmissionRejected"""
+        units = self._units(units)
+        if self._can_start(user, units) and user not in self.waiting and not self.holding:
+            self._start(user, units)
+            return 0.0
+
+        line = self.waiting.get(user)
+        if line is not None and len(line) >= self.per_user:
+            raise self._reject(
+                "per_user", 429,
+                "Too many AI requests in progress for this account. Please wait for them to finish.",
+                self.retry_after(len(line) / self.per_user)
+            )
+        if self.queued >= self.queue_size:
+            raise self._reject("queue_full", 429, "Server is busy. Please try again shortly.", self.retry_after())
+
+        future = asyncio.get_running_loop().create_future()
+        if line is None:
+            line = self.waiting[user] = deque()
+        line.append((future, units))
+        self.queued += 1
+        self.peak_queued = max(self.peak_queued, self.queued)
+        self._dispatch()
+
+        started = time.perf_counter()
+        try:
+            await asyncio.wait({future}, timeout=self.queue_timeout)
+        except asyncio.CancelledError:
+            # Client went away while queued; hand back a slot granted in the meantime
+            if future.done() and not future.cancelled():
+                self.release(user, 0.0, record=False, units=units)
+            else:
+                self._abandon(user, future)
+            raise
+
+        waited = time.perf_counter() - started
+        if not future.done():
+            self._abandon(user, future)
+            metrics.ADMISSION_WAIT.observe(waited, outcome="timeout")
+            raise self._reject(
+                "timeout", 503,
+                "Server is busy. Please try again shortly.",
+                self.retry_after()
+            )
+        metrics.ADMISSION_WAIT.observe(waited, outcome="admitted")
+        self.admitted_after_wait += 1
+        return waited
+
+    def _abandon(self, user: str, future: asyncio.Future):
+        future.cancel()
+        line = self.waiting.get(user)
+        entry = next((entry for entry in line if entry[0] is future), None) if line is not None else None
+        if entry is not None:
+            line.remove(entry)
+            self.queued -= 1
+            if not line:
+                del self.waiting[user]
+            # It may have been the request freed slots were held for
+            self._dispatch()
+
+    def release(self, user: str, service_seconds: float, record: bool = True, units: int = 1):
+        units = self._units(units)
+        self.active -= units
+        self.active_by_user[user] -= units
+        if self.active_by_user[user] <= 0:
+            del self.active_by_user[user]
+        if record:
+            self.avg_service_seconds = 0.8 * self.avg_service_seconds + 0.2 * service_seconds
+        self._dispatch()
+
+    def _dispatch(self):
+        """Hand free slots to queued users in round-robin order"""
+        self.holding = False
+        progressed = True
+        while progressed and self.active < self.max_concurrent and self.waiting:
+            progressed = False
+            for user in list(self.waiting):
+                if self.active >= self.max_concurrent:
+                    break
+                line = self.waiting[user]
+                future, units = line[0]
+                if not future.done() and not self._can_start(user, units):
+                    if self.active_by_user.get(user, 0) + units > self.per_user:
+                        continue  # This account is at its own limit; others may go
+                    # Keep freed slots for this request so single-slot ones cannot starve it
+                    self.holding = True
+                    break
+                line.popleft()
+                self.queued -= 1
+                if line:
+                    self.waiting.move_to_end(user)
+                else:
+                    del self.waiting[user]
+                if future.done():
+                    continue
+                self._start(user, units)
+                future.set_result(None)
+                progressed = True
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_concurrent": self.max_concurrent,
+            "per_user": self.per_user,
+            "queue_size": self.queue_size,
+            "active": self.active,
+            "queued": self.queued,
+            "users_waiting": len(self.waiting),
+            "peak_active": self.peak_active,
+            "peak_queued": self.peak_queued,
+            "admitted": self.admitted,
+            "admitted_after_wait": self.admitted_after_wait,
+            "rejected": dict(self.rejected),
+            "avg_service_ms": round(self.avg_service_seconds * 1000, 1)
+        }
+
+def request_identity(scope) -> str:
+    """Account id from the bearer token, else the client address.
+
+    Runs before the route's auth dependency, so an invalid token is not an
+    error here; it just falls back to the address and the handler answers 401.
+    """
+    for name, value in scope.get("headers", ()):
+        if name == b"authorization" and value[:7].lower() == b"bearer ":
+            import jwt
+
+            settings = get_settings()
+            try:
+                payload = jwt.decode(value[7:].decode("latin-1"), settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+                if payload.get("user_id"):
+                    return f"user:{payload['user_id']}"
+            except Exception:
+                pass
+            break
+    client = scope.get("client")
+    return f"addr:{client[0]}" if client else "addr:unknown"
+
+async def request_units(scope, receive, settings):
+    """Model calls a request runs at once, and a ``receive`` that replays the body read to count them.
+
+    This runs before admission and auth, so at most ``BATCH_MAX_SLOTS`` x
+    ``BATCH_SLOT_BYTES`` are buffered. A larger body is charged the most units
+    and streams on to the route unread.
+    """
+    if (scope["method"], scope["path"]) not in WEIGHTED_ROUTES:
+        return 1, receive
+
+    most_units = max(1, settings.BATCH_MAX_PARALLEL)
+    limit = settings.BATCH_MAX_SLOTS * BATCH_SLOT_BYTES
+    for name, value in scope.get("headers", ()):
+        if name == b"content-length":
+            if not value.isdigit() or int(value) > limit:
+                return most_units, receive
+            break
+
+    messages = []
+    body = b""
+    complete = False
+    while len(body) <= limit:
+        message = await receive()
+        messages.append(message)
+        if message["type"] != "http.request":
+            break
+        body += message.get("body", b"")
+        if not message.get("more_body", False):
+            complete = True
+            break
+
+    async def replay():
+        return messages.pop(0) if messages else await receive()
+
+    if not complete:
+        return most_units, replay
+    try:
+        slots = len(json.loads(body).get("slots") or [])
+    except Exception:
+        slots = 1  # Malformed body: the handler answers 422
+    return max(1, min(slots, most_units)), replay
+
+class AdmissionMiddleware:
+    """Applies AdmissionController to EXPENSIVE_ROUTES; other requests pass straight through"""
+
+    def __init__(self, app, controller: Optional[AdmissionController] = None):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or (scope["method"], scope["path"]) not in EXPENSIVE_ROUTES:
+            await self.app(scope, receive, send)
+            return
+
+        controller = self.controller or get_admission_controller()
+        user = request_identity(scope)
+        units, receive = await request_units(scope, receive, get_settings())
+        try:
+            await controller.acquire(user, units)
+        except AdmissionRejected as e:
+            logger.warning(f"🚦 Admission rejected {scope['path']} for {user}: {e.detail}")
+            body = json.dumps({"detail": e.detail}).encode()
+            await send({
+                "type": "http.response.start",
+                "status": e.status_code,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"retry-after", str(e.retry_after).encode())
+                ]
+            })
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            controller.release(user, time.perf_counter() - started, units=units)
+
+_admission_controller: Optional[AdmissionController] = None
+
+def get_admission_controller() -> AdmissionController:
+    global _admission_controller
+    if _admission_controller is None:
+        settings = get_settings()
+        _admission_controller = AdmissionController(
+            max_concurrent=settings.MAX_CONCURRENT_REQUESTS,
+            per_user=settings.MAX_CONCURRENT_REQUESTS_PER_USER,
+            queue_size=settings.ADMISSION_QUEUE_SIZE,
+            queue_timeout=settings.REQUEST_TIMEOUT
+        )
+    return _admission_controller
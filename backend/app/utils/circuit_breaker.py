@@ -0,0 +1,232 @@
+# backend/app/utils/circuit_breaker.py - CIRCUIT BREAKER & BACKGROUND RECOVERY FOR AI SERVICES
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a dependency the breaker considers down"""
+
+class CircuitBreaker:
+    """Closed/open/half-open breaker driven by error rate and slow-call rate.
+
+    Outcomes of the last ``window`` calls are kept. Once at least ``min_calls``
+    are recorded, the breaker opens if either the error rate or the share of
+    calls slower than ``slow_call_seconds`` crosses its threshold. After
+    ``open_seconds`` it lets a single probe through (half-open); the probe's
+    outcome closes or re-opens it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        window: int = 20,
+        min_calls: int = 5,
+        error_rate_threshold: float = 0.5,
+        slow_call_seconds: float = 15.0,
+        slow_call_rate_threshold: float = 0.8,
+        open_seconds: float = 30.0
+    ):
+        self.name = name
+        self.min_calls = min_calls
+        self.error_rate_threshold = error_rate_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.open_seconds = open_seconds
+
+        self._outcomes = deque(maxlen=window)  # (ok, slow)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._open_listeners: List[Callable[[], None]] = []
+
+        self.times_opened = 0
+        self.rejected = 0
+        self.last_error: Optional[str] = None
+
+    @property
+    def state(self) -> str:
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+            self._state = HALF_OPEN
+            self._probe_in_flight = False
+            logger.info(f"🟡 {self.name} circuit half-open, allowing a probe call")
+        return self._state
+
+    @property
+    def available(self) -> bool:
+        """Whether a caller should try the dependency at all (does not consume a probe)"""
+        return self.state != OPEN
+
+    def on_open(self, listener: Callable[[], None]):
+        self._open_listeners.append(listener)
+
+    def allow_request(self) -> bool:
+        state = self.state
+        if state == CLOSED:
+            return True
+        if state == HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        self.rejected += 1
+        return False
+
+    def record_success(self, latency: float):
+        slow = latency >= self.slow_call_seconds
+        if self._state == HALF_OPEN:
+            if slow:
+                self._trip(f"probe took {latency:.1f}s")
+                return
+            self.reset()
+            return
+        self._outcomes.append((True, slow))
+        self._evaluate()
+
+    def record_failure(self, error: BaseException):
+        self.last_error = f"{type(error).__name__}: {error}"
+        if self._state == HALF_OPEN:
+            self._trip(f"probe failed ({self.last_error})")
+            return
+        self._outcomes.append((False, False))
+        self._evaluate()
+
+    def release_probe(self):
+        """Forget a call that ended without an outcome (cancelled, client disconnected)"""
+        if self._state == HALF_OPEN:
+            self._probe_in_flight = False
+
+    def reset(self):
+        if self._state != CLOSED:
+            logger.info(f"🟢 {self.name} circuit closed")
+        self._state = CLOSED
+        self._outcomes.clear()
+        self._probe_in_flight = False
+
+    def _evaluate(self):
+        total = len(self._outcomes)
+        if self._state != CLOSED or total < self.min_calls:
+            return
+        error_rate = sum(1 for ok, _ in self._outcomes if not ok) / total
+        slow_rate = sum(1 for _, slow in self._outcomes if slow) / total
+        if error_rate >= self.error_rate_threshold:
+            self._trip(f"error rate {error_rate:.0%} over last {total} calls")
+        elif slow_rate >= self.slow_call_rate_threshold:
+            self._trip(f"slow-call rate {slow_rate:.0%} over last {total} calls")
+
+    def _trip(self, reason: str):
+        self._state = OPEN
+        self._opened_at = time.monotonic()
+        self._probe_in_flight = False
+        self.times_opened += 1
+        logger.error(f"🔴 {self.name} circuit opened: {reason}")
+        for listener in self._open_listeners:
+            try:
+                listener()
+            except Exception as e:
+                logger.error(f"{self.name} circuit listener failed: {str(e)}")
+
+    async def call(self, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Run ``fn()`` through the breaker, recording its outcome"""
+        if not self.allow_request():
+            raise CircuitOpenError(f"{self.name} is temporarily unavailable")
+        started = time.monotonic()
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            # A cancelled hedge loser says nothing about the dependency's health; a
+            # RetryPolicy deadline cancels too, and the policy records that as a failure
+            self.release_probe()
+            raise
+        except Exception as e:
+            self.record_failure(e)
+            raise
+        self.record_success(time.monotonic() - started)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        total = len(self._outcomes)
+        return {
+            "state": self.state,
+            "recent_calls": total,
+            "recent_error_rate": round(sum(1 for ok, _ in self._outcomes if not ok) / total, 3) if total else 0.0,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected,
+            "last_error": self.last_error
+        }
+
+class BackgroundReinitializer:
+    """Re-runs a service's ``initialize()`` with jittered exponential backoff until it is ready"""
+
+    def __init__(
+        self,
+        name: str,
+        initialize: Callable[[], Awaitable[None]],
+        is_ready: Callable[[], bool],
+        breaker: CircuitBreaker,
+        base_delay: float = 5.0,
+        max_delay: float = 300.0
+    ):
+        self.name = name
+        self.initialize = initialize
+        self.is_ready = is_ready
+        self.breaker = breaker
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.attempts = 0
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def ensure_running(self):
+        if self.running:
+            return
+        try:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        except RuntimeError:
+            logger.warning(f"{self.name}: no running event loop, recovery deferred")
+
+    async def _run(self):
+        attempt = 0
+        while True:
+            delay = min(self.max_delay, self.base_delay * (2 ** attempt)) * random.uniform(0.5, 1.0)
+            logger.info(f"🔁 {self.name}: re-initializing in {delay:.1f}s")
+            await asyncio.sleep(delay)
+            self.attempts += 1
+            try:
+                await self.initialize()
+            except Exception as e:
+                logger.error(f"{self.name}: re-initialization failed: {str(e)}")
+            if self.is_ready():
+                self.breaker.reset()
+                logger.info(f"✅ {self.name}: recovered after {attempt + 1} attempt(s)")
+                return
+            attempt += 1
+
+_gemini_breaker: Optional[CircuitBreaker] = None
+
+def get_gemini_circuit_breaker() -> CircuitBreaker:
+    """Breaker shared by every service that talks to Gemini (same API, same quota)"""
+    global _gemini_breaker
+    if _gemini_breaker is None:
+        settings = get_settings()
+        _gemini_breaker = CircuitBreaker(
+            "gemini",
+            window=settings.CIRCUIT_BREAKER_WINDOW,
+            min_calls=settings.CIRCUIT_BREAKER_MIN_CALLS,
+            error_rate_threshold=settings.CIRCUIT_BREAKER_ERROR_RATE,
+            slow_call_seconds=settings.CIRCUIT_BREAKER_SLOW_CALL_SECONDS,
+            slow_call_rate_threshold=settings.CIRCUIT_BREAKER_SLOW_CALL_RATE,
+            open_seconds=settings.CIRCUIT_BREAKER_OPEN_SECONDS
+        )
+    return _gemini_breaker
@@ -0,0 +1,85 @@
+# backend/app/utils/lazy_service.py - RACE-FREE LAZY SERVICE INITIALIZATION
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PROBE_MODES = ("eager", "deferred", "skip")
+
+class LazyService:
+    """Construct and initialize a service exactly once, however many requests arrive first.
+
+    The instance is only published after ``initialize()`` returns, so no caller
+    ever sees a half-initialized service. ``probe_mode`` controls the live
+    test call: "eager" awaits it before the first answer, "deferred" answers
+    straight away and runs ``warmup()`` in the background, "skip" never probes.
+    """
+
+    def __init__(self, name: str, factory: Callable[[], Any], probe_mode: str = "deferred"):
+        if probe_mode not in PROBE_MODES:
+            raise ValueError(f"probe_mode must be one of {PROBE_MODES}")
+        self.name = name
+        self.factory = factory
+        self.probe_mode = probe_mode
+        self.instance: Optional[Any] = None
+        self.init_seconds: Optional[float] = None
+        self._lock = asyncio.Lock()
+        self._init_task: Optional[asyncio.Task] = None
+        self._warmup_task: Optional[asyncio.Task] = None
+        self._on_ready: List[Callable[[Any], None]] = []
+
+    def on_ready(self, hook: Callable[[Any], None]):
+        self._on_ready.append(hook)
+
+    async def get(self) -> Any:
+        if self.instance is not None:
+            return self.instance
+        async with self._lock:
+            if self.instance is None:
+                started = time.perf_counter()
+                service = self.factory()
+                await service.initialize(probe=self.probe_mode == "eager")
+                self.init_seconds = time.perf_counter() - started
+                self.instance = service
+                logger.info(f"✅ {self.name} ready in {self.init_seconds * 1000:.0f}ms (probe: {self.probe_mode})")
+
+                if self.probe_mode == "deferred" and service.initialized:
+                    self._warmup_task = asyncio.get_running_loop().create_task(service.warmup())
+                for hook in self._on_ready:
+                    hook(service)
+        return self.instance
+
+    def warm_in_background(self):
+        """Start initialization without waiting for it (no-op once started)"""
+        if self.instance is not None or self._init_task is not None:
+            return
+        try:
+            self._init_task = asyncio.get_running_loop().create_task(self.get())
+        except RuntimeError:
+            return
+        self._init_task.add_done_callback(self._init_done)
+
+    def _init_done(self, task: asyncio.Task):
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"{self.name} background initialization failed: {task.exception()}")
+            self._init_task = None
+
+    @property
+    def warming_up(self) -> bool:
+        return self._warmup_task is not None and not self._warmup_task.done()
+
+    @property
+    def ready(self) -> bool:
+        return self.instance is not None and self.instance.initialized and not self.warming_up
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "constructed": self.instance is not None,
+            "initialized": bool(self.instance and self.instance.initialized),
+            "warming_up": self.warming_up,
+            "ready": self.ready,
+            "probe_mode": self.probe_mode,
+            "init_ms": round(self.init_seconds * 1000, 1) if self.init_seconds is not None else None
+        }
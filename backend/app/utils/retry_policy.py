@@ -0,0 +1,173 @@
+# backend/app/utils/retry_policy.py - DEADLINES, JITTERED BACKOFF AND HEDGING FOR AI CALLS
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, Type
+
+logger = logging.getLogger(__name__)
+
+class LatencyTracker:
+    """Rolling window of successful attempt latencies (seconds)"""
+
+    def __init__(self, window: int = 200):
+        self.samples = deque(maxlen=window)
+
+    def record(self, seconds: float):
+        self.samples.append(seconds)
+
+    def percentile(self, p: float) -> Optional[float]:
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        index = min(int(p * len(ordered)), len(ordered) - 1)
+        return ordered[index]
+
+class RetryPolicy:
+    """Retry an async operation with per-attempt deadlines and full-jitter exponential backoff.
+
+    With ``hedge=True``, once enough latencies have been observed, an attempt
+    that has not answered by the p95 (``hedge_percentile``) fires a second,
+    identical request; whichever succeeds first wins and the other is
+    cancelled. The blocking SDK call behind a cancelled attempt cannot be
+    aborted mid-request, but its result is discarded and, if it was still
+    queued on the LLM pool, it never starts.
+
+    The deadline cancels the attempt, so a ``breaker.call`` inside ``fn``
+    never sees the hang. With ``breaker``, attempts that hit their deadline
+    are recorded on it as failures; cancelled hedge losers are not.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_attempts: int = 3,
+        attempt_timeout: float = 20.0,
+        base_delay: float = 0.5,
+        max_delay: float = 8.0,
+        total_timeout: Optional[float] = None,
+        hedge: bool = False,
+        hedge_percentile: float = 0.95,
+        hedge_min_samples: int = 20,
+        hedge_min_delay: float = 0.5,
+        give_up_on: Tuple[Type[BaseException], ...] = (),
+        breaker: Optional[Any] = None
+    ):
+        self.name = name
+        self.max_attempts = max(1, max_attempts)
+        self.attempt_timeout = attempt_timeout
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.total_timeout = total_timeout
+        self.hedge = hedge
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.hedge_min_delay = hedge_min_delay
+        self.give_up_on = give_up_on  # Errors that retrying cannot fix (e.g. an open circuit)
+        self.breaker = breaker
+        self.latency = LatencyTracker()
+
+        self.attempts = 0
+        self.retries = 0
+        self.timeouts = 0
+        self.failures = 0
+        self.hedges_fired = 0
+        self.hedges_won = 0
+
+    def backoff(self, attempt: int) -> float:
+        """Full jitter: uniform in [0, min(max_delay, base_delay * 2**attempt)]"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def hedge_delay(self) -> Optional[float]:
+        if not self.hedge or len(self.latency.samples) < self.hedge_min_samples:
+            return None
+        p95 = self.latency.percentile(self.hedge_percentile)
+        return max(p95, self.hedge_min_delay)
+
+    async def run(
+        self,
+        fn: Callable[[], Awaitable[Any]],
+        on_retry: Optional[Callable[[int, BaseException], None]] = None
+    ) -> Any:
+        """Call ``fn()`` until it succeeds, attempts run out, or the total deadline passes"""
+        deadline = time.monotonic() + self.total_timeout if self.total_timeout else None
+
+        for attempt in range(self.max_attempts):
+            timeout = self.attempt_timeout
+            if deadline is not None:
+                timeout = min(timeout, deadline - time.monotonic())
+
+            try:
+                return await self._attempt(fn, timeout)
+            except Exception as e:
+                if isinstance(e, asyncio.TimeoutError):
+                    self.timeouts += 1
+                    if self.breaker is not None:
+                        self.breaker.record_failure(e)
+                delay = self.backoff(attempt)
+                out_of_time = deadline is not None and time.monotonic() + delay >= deadline
+                if attempt == self.max_attempts - 1 or out_of_time or isinstance(e, self.give_up_on):
+                    self.failures += 1
+                    raise
+
+                self.retries += 1
+                if on_retry:
+                    on_retry(attempt, e)
+                logger.warning(
+                    f"{self.name}: attempt {attempt + 1}/{self.max_attempts} failed "
+                    f"({type(e).__name__}), retrying in {delay:.2f}s"
+                )
+                await asyncio.sleep(delay)
+
+    async def _attempt(self, fn: Callable[[], Awaitable[Any]], timeout: float) -> Any:
+        self.attempts += 1
+        started = time.monotonic()
+        hedge_after = self.hedge_delay()
+
+        if hedge_after is None or hedge_after >= timeout:
+            result = await asyncio.wait_for(fn(), timeout)
+            self.latency.record(time.monotonic() - started)
+            return result
+
+        primary = asyncio.ensure_future(asyncio.wait_for(fn(), timeout))
+        done, _ = await asyncio.wait({primary}, timeout=hedge_after)
+        if done:
+            result = primary.result()
+            self.latency.record(time.monotonic() - started)
+            return result
+
+        self.hedges_fired += 1
+        logger.info(f"{self.name}: no answer after {hedge_after:.2f}s (p95), firing hedged request")
+        hedge = asyncio.ensure_future(asyncio.wait_for(fn(), timeout - hedge_after))
+        pending = {primary, hedge}
+        error: Optional[BaseException] = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.hedges_won += 1
+                        self.latency.record(time.monotonic() - started)
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        p50 = self.latency.percentile(0.5)
+        p95 = self.latency.percentile(0.95)
+        return {
+            "attempts": self.attempts,
+            "retries": self.retries,
+            "timeouts": self.timeouts,
+            "failures": self.failures,
+            "hedging": self.hedge,
+            "hedges_fired": self.hedges_fired,
+            "hedges_won": self.hedges_won,
+            "p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+            "p95_ms": round(p95 * 1000, 1) if p95 is not None else None
+        }
@@ -0,0 +1,47 @@
+# backend/app/utils/single_flight.py - COALESCE CONCURRENT IDENTICAL WORK
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+logger = logging.getLogger(__name__)
+
+class SingleFlight:
+    """Run at most one in-flight coroutine per key; concurrent callers share its result.
+
+    The shared work runs in its own task and each caller awaits it through
+    ``asyncio.shield``, so one caller disconnecting does not cancel the work
+    for everyone else waiting on the same key.
+    """
+
+    def __init__(self, name: str = "single_flight"):
+        self.name = name
+        self._tasks: Dict[Hashable, asyncio.Task] = {}
+        self.leaders = 0
+        self.followers = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._tasks.get(key)
+        if task is None:
+            self.leaders += 1
+            task = asyncio.ensure_future(fn())
+            self._tasks[key] = task
+            task.add_done_callback(lambda t, k=key: self._forget(k, t))
+        else:
+            self.followers += 1
+            logger.info(f"🔗 {self.name}: joined in-flight call ({len(self._tasks)} active)")
+
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task):
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+        # Mark the exception as retrieved even if every caller has gone away
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "in_flight": len(self._tasks),
+            "leaders": self.leaders,
+            "coalesced": self.followers
+        }
@@ -0,0 +1,126 @@
+# backend/benchmarks/cold_start_benchmark.py - COLD-START TIME-TO-FIRST-RESPONSE
+"""Measure cold-start latency of the API under each AI_INIT_PROBE mode.
+
+Run from the backend directory (needs the full requirements and a .env):
+
+    python -m benchmarks.cold_start_benchmark [--modes eager,deferred,skip] [--runs 5] [--json]
+
+Every run starts a fresh uvicorn process and records, from process spawn:
+
+- import_ms: importing ``main`` in a separate fresh interpreter
+- first_response_ms: the first answered request (GET /live)
+- ai_ready_ms: /ready reporting the recipe service initialized and warmed up
+- ready_ms: /ready returning 200 (also needs the database), or None on timeout
+"""
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def get(url: str) -> Tuple[int, Dict[str, Any]]:
+    try:
+        with urllib.request.urlopen(url, timeout=5) as response:
+            return response.status, json.loads(response.read() or b"{}")
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read() or b"{}")
+
+def import_time_ms(env: Dict[str, str]) -> float:
+    code = "import time; t = time.perf_counter(); import main; print((time.perf_counter() - t) * 1000)"
+    output = subprocess.run(
+        [sys.executable, "-c", code], cwd=BACKEND_DIR, env=env,
+        capture_output=True, text=True, check=True
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+def cold_start(mode: str, ready_timeout: float) -> Dict[str, Optional[float]]:
+    env = {**os.environ, "AI_INIT_PROBE": mode}
+    port = free_port()
+    base = f"http://127.0.0.1:{port}"
+    result: Dict[str, Optional[float]] = {"import_ms": round(import_time_ms(env), 1)}
+
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        while True:
+            try:
+                status, _ = get(f"{base}/live")
+                if status == 200:
+                    break
+            except (urllib.error.URLError, ConnectionError):
+                pass
+            if server.poll() is not None:
+                raise RuntimeError("server exited during startup")
+            time.sleep(0.005)
+        result["first_response_ms"] = round((time.perf_counter() - started) * 1000, 1)
+
+        result["ai_ready_ms"] = result["ready_ms"] = None
+        deadline = time.perf_counter() + ready_timeout
+        while time.perf_counter() < deadline and result["ready_ms"] is None:
+            status, body = get(f"{base}/ready")
+            elapsed = round((time.perf_counter() - started) * 1000, 1)
+            if result["ai_ready_ms"] is None and body.get("services", {}).get("recipe", {}).get("ready"):
+                result["ai_ready_ms"] = elapsed
+            if status == 200:
+                result["ready_ms"] = elapsed
+            time.sleep(0.02)
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+    return result
+
+def median(values: List[Optional[float]]) -> Optional[float]:
+    present = sorted(v for v in values if v is not None)
+    return present[len(present) // 2] if present else None
+
+def run(modes: List[str], runs: int, ready_timeout: float) -> List[Dict[str, Any]]:
+    summary = []
+    for mode in modes:
+        samples = [cold_start(mode, ready_timeout) for _ in range(runs)]
+        summary.append({
+            "mode": mode,
+            "runs": runs,
+            **{f"median_{key}": median([s[key] for s in samples]) for key in samples[0]},
+            "samples": samples
+        })
+    return summary
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--modes", default="eager,deferred,skip")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--ready-timeout", type=float, default=30.0)
+    parser.add_argument("--json", action="store_true", help="Emit machine-readable JSON")
+    args = parser.parse_args()
+
+    summary = run(args.modes.split(","), args.runs, args.ready_timeout)
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return
+
+    print(f"{'mode':10} {'import ms':>10} {'first response ms':>18} {'AI ready ms':>12} {'ready ms':>10}")
+    for row in summary:
+        print(
+            f"{row['mode']:10} {row['median_import_ms']!s:>10} {row['median_first_response_ms']!s:>18} "
+            f"{row['median_ai_ready_ms']!s:>12} {row['median_ready_ms']!s:>10}"
+        )
+    print(f"\nMedians over {args.runs} cold starts per mode")
+
+if __name__ == "__main__":
+    main()
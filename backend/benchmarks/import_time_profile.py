@@ -0,0 +1,162 @@
+# backend/benchmarks/import_time_profile.py - COLD-START IMPORT-TIME PROFILE
+"""Profile what importing ``main`` costs, using ``python -X importtime``.
+
+Run from the backend directory (needs the full requirements):
+
+    python -m benchmarks.import_time_profile [--runs 5] [--top 25] [--json]
+    python -m benchmarks.import_time_profile --write   # refresh the tracked profile
+    python -m benchmarks.import_time_profile --check   # fail on a regression
+
+Every run imports ``main`` in a fresh interpreter; per-module times are the
+median over the runs. The report is committed as
+``benchmarks/import_time_profile.txt`` so a pull request that makes cold starts
+slower shows up in the diff. ``--check`` exits non-zero when a module that
+must stay lazy (the Gemini, Vision and imaging SDKs and the services built on
+them) is imported at load, when noticeably more modules load than tracked,
+or when the total exceeds the tracked time by more than ``--tolerance``
+(timings vary between machines, so that bound is loose).
+"""
+import argparse
+import json
+import re
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+PROFILE_PATH = Path(__file__).resolve().parent / "import_time_profile.txt"
+
+# Imported by handlers on first use; none of these may load with main
+DEFERRED_MODULES = (
+    "google.generativeai",
+    "google.cloud.vision",
+    "PIL",
+    "app.services.recipe_service",
+    "app.services.voice_ingredient_service",
+    "app.services.ingredient_detection_service",
+    "app.services.auth_service",
+    "app.services.email_service",
+)
+
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s+)(\S+)$")
+
+def import_once() -> Dict[str, Dict[str, int]]:
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    ).stderr
+    modules = {}
+    for line in stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            modules[name] = {
+                "self_us": int(self_us),
+                "cumulative_us": int(cumulative_us),
+                "top_level": len(indent) == 1
+            }
+    return modules
+
+def profile(runs: int) -> Dict[str, Any]:
+    samples = [import_once() for _ in range(runs)]
+    names = set().union(*samples)
+    modules = {}
+    for name in names:
+        present = [s[name] for s in samples if name in s]
+        modules[name] = {
+            "self_us": statistics.median(p["self_us"] for p in present),
+            "cumulative_us": statistics.median(p["cumulative_us"] for p in present),
+            "top_level": present[0]["top_level"]
+        }
+
+    packages: Dict[str, float] = defaultdict(float)
+    for name, stats in modules.items():
+        packages[name.split(".")[0]] += stats["self_us"]
+
+    return {
+        "runs": runs,
+        "total_ms": round(sum(m["cumulative_us"] for m in modules.values() if m["top_level"]) / 1000, 1),
+        "main_ms": round(modules.get("main", {}).get("cumulative_us", 0) / 1000, 1),
+        "module_count": len(modules),
+        "deferred_loaded": sorted(
+            name for name in modules
+            if any(name == d or name.startswith(d + ".") for d in DEFERRED_MODULES)
+        ),
+        "packages": {k: round(v / 1000, 1) for k, v in sorted(packages.items(), key=lambda kv: -kv[1])},
+        "modules": modules
+    }
+
+def render(result: Dict[str, Any], top: int) -> str:
+    lines = [
+        "# Import-time profile of `import main` (python -m benchmarks.import_time_profile --write)",
+        f"total_ms: {result['total_ms']}",
+        f"main_ms: {result['main_ms']}",
+        f"modules: {result['module_count']}",
+        f"runs: {result['runs']}",
+        f"deferred_loaded: {', '.join(result['deferred_loaded']) or 'none'}",
+        "",
+        f"{'self ms':>9}  package",
+    ]
+    for package, ms in list(result["packages"].items())[:top]:
+        lines.append(f"{ms:>9}  {package}")
+    lines += ["", f"{'self ms':>9} {'cumul ms':>9}  module"]
+    by_self = sorted(result["modules"].items(), key=lambda kv: -kv[1]["self_us"])
+    for name, stats in by_self[:top]:
+        lines.append(f"{stats['self_us'] / 1000:>9.1f} {stats['cumulative_us'] / 1000:>9.1f}  {name}")
+    return "\n".join(lines) + "\n"
+
+def tracked(key: str) -> Optional[float]:
+    if not PROFILE_PATH.exists():
+        return None
+    for line in PROFILE_PATH.read_text().splitlines():
+        if line.startswith(f"{key}:"):
+            return float(line.split(":", 1)[1])
+    return None
+
+def check(result: Dict[str, Any], tolerance: float, module_slack: int) -> List[str]:
+    problems = []
+    if result["deferred_loaded"]:
+        problems.append(f"imported at load but must stay lazy: {', '.join(result['deferred_loaded'])}")
+    # Module count does not depend on the machine; milliseconds do, hence the loose tolerance
+    modules = tracked("modules")
+    if modules is not None and result["module_count"] > modules + module_slack:
+        problems.append(f"{result['module_count']} modules imported, tracked {int(modules)} (+{module_slack} allowed)")
+    total_ms = tracked("total_ms")
+    if total_ms is not None and result["total_ms"] > total_ms * (1 + tolerance):
+        problems.append(
+            f"import time {result['total_ms']}ms exceeds tracked {total_ms}ms by more than {tolerance:.0%}"
+        )
+    return problems
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=25)
+    parser.add_argument("--tolerance", type=float, default=0.5, help="Allowed slowdown for --check")
+    parser.add_argument("--module-slack", type=int, default=10, help="Extra modules allowed by --check")
+    parser.add_argument("--write", action="store_true", help=f"Update {PROFILE_PATH.name}")
+    parser.add_argument("--check", action="store_true", help="Exit non-zero on a regression")
+    parser.add_argument("--json", action="store_true", help="Emit machine-readable JSON")
+    args = parser.parse_args()
+
+    result = profile(args.runs)
+    if args.json:
+        print(json.dumps({k: v for k, v in result.items() if k != "modules"}, indent=2))
+    else:
+        print(render(result, args.top), end="")
+
+    if args.check:
+        problems = check(result, args.tolerance, args.module_slack)
+        for problem in problems:
+            print(f"❌ {problem}", file=sys.stderr)
+        if problems:
+            sys.exit(1)
+    if args.write:
+        PROFILE_PATH.write_text(render(result, args.top))
+        print(f"\nWrote {PROFILE_PATH.relative_to(BACKEND_DIR)}")
+
+if __name__ == "__main__":
+    main()
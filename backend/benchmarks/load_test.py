@@ -0,0 +1,357 @@
+# backend/benchmarks/load_test.py - END-TO-END HTTP LOAD TEST OF FRONTEND JOURNEYS
+"""Replay the frontend's user journeys over HTTP and report per-endpoint latency.
+
+Run from the backend directory (needs the full requirements; no MongoDB or
+Gemini key required):
+
+    python -m benchmarks.load_test [--users 20] [--duration 60] [--json]
+    python -m benchmarks.load_test --llm-latency-ms 3000 --llm-error-rate 0.05 --db-latency-ms 5
+    python -m benchmarks.load_test --output runs/$(git rev-parse --short HEAD).json
+
+    # Against a server started separately (e.g. under a profiler or with --workers)
+    python -m benchmarks.load_test serve --port 8100 --users 20
+    python -m benchmarks.load_test --url http://127.0.0.1:8100 --users 20
+
+By default a uvicorn server is spawned with ``LLM_PROVIDER=mock`` and the
+in-memory database from ``benchmarks.memory_mongo``, seeded with verified
+accounts. Each virtual user logs in, then loops over the dashboard journey:
+``/mood/today`` (logging a mood if none yet), ``/analytics/dashboard``,
+``/recipes/history``, ``/recipes/generate`` and ``/recipes/history`` again,
+pausing ``--think-ms`` between requests. ``--pollers`` landing-page visitors
+poll ``/api/public/stats`` every ``--poll-interval`` seconds.
+
+The report has throughput, errors and p50/p95/p99 per endpoint, the run's
+configuration, the git commit and the server's ``/health`` after the run, so
+JSON reports from two commits can be diffed directly.
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+PASSWORD = "LoadTest!2024"
+INGREDIENTS = [
+    "chicken", "rice", "tomato", "onion", "garlic", "spinach", "eggs", "cheese",
+    "pasta", "potato", "carrot", "bell pepper", "tofu", "mushroom", "beans",
+    "lentils", "salmon", "yogurt", "avocado", "broccoli"
+]
+MOODS = ["happy", "sad", "energetic", "tired", "stressed", "calm", "excited", "bored"]
+CUISINES = ["any", "italian", "indian", "mexican", "japanese", "thai", "mediterranean"]
+
+def user_email(index: int) -> str:
+    return f"loadtest{index}@example.com"
+
+# ---------------------------------------------------------------------------
+# Server side: the app on the in-memory database and the mock LLM
+# ---------------------------------------------------------------------------
+
+def server_env(args: argparse.Namespace) -> Dict[str, str]:
+    return {
+        "LLM_PROVIDER": "mock",
+        "MOCK_AI_LATENCY_MS": str(args.llm_latency_ms),
+        "MOCK_AI_ERROR_RATE": str(args.llm_error_rate),
+        "MOCK_AI_SEED": str(args.seed),
+        # Quiet-hour pre-generation would add load the journeys did not ask for
+        "ENABLE_RECIPE_POOL": "false",
+    }
+
+async def seed_users(db, count: int):
+    import bcrypt
+    from datetime import datetime
+
+    # One hash for every account; logins still pay bcrypt's verify cost
+    hashed = bcrypt.hashpw(PASSWORD.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+    now = datetime.utcnow()
+    await db.database.users.insert_many([
+        {
+            "email": user_email(i),
+            "name": f"Load Test {i}",
+            "hashed_password": hashed,
+            "dietary_preferences": [],
+            "allergies": [],
+            "health_goals": [],
+            "is_active": True,
+            "email_verified": True,
+            "created_at": now,
+            "updated_at": now
+        }
+        for i in range(count)
+    ])
+
+def serve(args: argparse.Namespace):
+    # Settings are read once, so the environment must be in place before the app is imported
+    for key, value in server_env(args).items():
+        os.environ.setdefault(key, value)
+
+    import uvicorn
+    from benchmarks.memory_mongo import install_memory_database
+    from main import app
+
+    async def run():
+        db = await install_memory_database(args.db_latency_ms, args.db_pool_size)
+        await seed_users(db, args.users)
+        config = uvicorn.Config(app, host="127.0.0.1", port=args.port, log_level="warning")
+        await uvicorn.Server(config).serve()
+
+    asyncio.run(run())
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def spawn_server(args: argparse.Namespace) -> Tuple[subprocess.Popen, str]:
+    port = free_port()
+    command = [
+        sys.executable, "-m", "benchmarks.load_test", "serve", "--port", str(port),
+        "--users", str(args.users), "--db-latency-ms", str(args.db_latency_ms),
+        "--llm-latency-ms", str(args.llm_latency_ms), "--llm-error-rate", str(args.llm_error_rate),
+        "--seed", str(args.seed)
+    ]
+    if args.db_pool_size:
+        command += ["--db-pool-size", str(args.db_pool_size)]
+    server = subprocess.Popen(
+        command, cwd=BACKEND_DIR, env={**os.environ, **server_env(args)},
+        stdout=subprocess.DEVNULL, stderr=None if args.server_logs else subprocess.DEVNULL
+    )
+    return server, f"http://127.0.0.1:{port}"
+
+async def wait_until_live(client, base: str, server: Optional[subprocess.Popen], timeout: float = 60.0):
+    import httpx
+
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if server is not None and server.poll() is not None:
+            raise RuntimeError("server exited during startup (rerun with --server-logs)")
+        try:
+            if (await client.get(f"{base}/live")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.05)
+    raise RuntimeError(f"{base} did not come up within {timeout:.0f}s")
+
+# ---------------------------------------------------------------------------
+# Client side: virtual users
+# ---------------------------------------------------------------------------
+
+class Recorder:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.statuses: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self.recording = True
+
+    async def request(self, client, name: str, method: str, url: str, **kwargs):
+        import httpx
+
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+            status = str(response.status_code)
+        except httpx.HTTPError as e:
+            response, status = None, type(e).__name__
+        if self.recording:
+            self.latencies[name].append((time.perf_counter() - started) * 1000)
+            self.statuses[name][status] += 1
+        return response
+
+def percentile(ordered: List[float], q: float) -> float:
+    # Nearest-rank, so p99 of 50 samples is the slowest one rather than an interpolation
+    index = max(0, math.ceil(q / 100 * len(ordered)) - 1)
+    return round(ordered[index], 1)
+
+def summarize(recorder: Recorder, elapsed: float) -> Dict[str, Any]:
+    endpoints = {}
+    for name in sorted(recorder.latencies):
+        ordered = sorted(recorder.latencies[name])
+        statuses = dict(recorder.statuses[name])
+        errors = sum(n for status, n in statuses.items() if not status.isdigit() or int(status) >= 400)
+        endpoints[name] = {
+            "count": len(ordered),
+            "errors": errors,
+            "error_rate": round(errors / len(ordered), 4),
+            "throughput_rps": round(len(ordered) / elapsed, 2),
+            "p50_ms": percentile(ordered, 50),
+            "p95_ms": percentile(ordered, 95),
+            "p99_ms": percentile(ordered, 99),
+            "max_ms": round(ordered[-1], 1),
+            "statuses": statuses
+        }
+    total = sum(e["count"] for e in endpoints.values())
+    every = sorted(v for values in recorder.latencies.values() for v in values)
+    return {
+        "overall": {
+            "count": total,
+            "errors": sum(e["errors"] for e in endpoints.values()),
+            "throughput_rps": round(total / elapsed, 2),
+            "p50_ms": percentile(every, 50) if every else None,
+            "p95_ms": percentile(every, 95) if every else None,
+            "p99_ms": percentile(every, 99) if every else None
+        },
+        "endpoints": endpoints
+    }
+
+async def virtual_user(client, base: str, index: int, args, recorder: Recorder, stop_at: float):
+    rng = random.Random(args.seed * 1000 + index)
+    think = args.think_ms / 1000
+
+    async def pause():
+        if think:
+            await asyncio.sleep(rng.uniform(0.5, 1.5) * think)
+
+    while time.perf_counter() < stop_at:
+        response = await recorder.request(
+            client, "POST /auth/login", "POST", f"{base}/auth/login",
+            json={"email": user_email(index % args.users), "password": PASSWORD}
+        )
+        if response is None or response.status_code != 200:
+            await asyncio.sleep(1)
+            continue
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        for _ in range(args.session_loops):
+            if time.perf_counter() >= stop_at:
+                return
+            await pause()
+            today = await recorder.request(client, "GET /mood/today", "GET", f"{base}/mood/today", headers=headers)
+            if today is not None and today.status_code == 200 and not today.json().get("logged_today"):
+                await recorder.request(client, "POST /mood/daily-log", "POST", f"{base}/mood/daily-log", headers=headers, json={
+                    "mood": rng.choice(MOODS),
+                    "energy_level": rng.randint(1, 10),
+                    "meal_preference": rng.choice(["comfort", "light", "hearty", "quick"]),
+                    "emotional_state": rng.choice(["happy", "stressed", "calm", "excited"])
+                })
+            await pause()
+            await recorder.request(client, "GET /analytics/dashboard", "GET", f"{base}/analytics/dashboard", headers=headers)
+            await pause()
+            await recorder.request(client, "GET /recipes/history", "GET", f"{base}/recipes/history?limit=10", headers=headers)
+            await pause()
+            await recorder.request(client, "POST /recipes/generate", "POST", f"{base}/recipes/generate", headers=headers, json={
+                "ingredients": rng.sample(INGREDIENTS, rng.randint(2, 5)),
+                "mood": rng.choice(MOODS),
+                "cuisine_preference": rng.choice(CUISINES),
+                "servings": rng.choice([1, 2, 4])
+            })
+            await pause()
+            await recorder.request(client, "GET /recipes/history", "GET", f"{base}/recipes/history?limit=10", headers=headers)
+
+async def stats_poller(client, base: str, args, recorder: Recorder, stop_at: float):
+    while time.perf_counter() < stop_at:
+        await recorder.request(client, "GET /api/public/stats", "GET", f"{base}/api/public/stats")
+        await asyncio.sleep(args.poll_interval)
+
+async def load(args: argparse.Namespace) -> Dict[str, Any]:
+    import httpx
+
+    server, base = (None, args.url.rstrip("/")) if args.url else spawn_server(args)
+    limits = httpx.Limits(max_connections=args.users + args.pollers + 5)
+    try:
+        async with httpx.AsyncClient(timeout=args.timeout, limits=limits) as client:
+            await wait_until_live(client, base, server)
+            recorder = Recorder()
+
+            # Warm-up: first requests pay lazy imports and service init; not recorded
+            recorder.recording = False
+            warm_stop = time.perf_counter() + args.warmup
+            await asyncio.gather(*(virtual_user(client, base, i, args, recorder, warm_stop) for i in range(min(args.users, 2))))
+            recorder.recording = True
+
+            started = time.perf_counter()
+            stop_at = started + args.duration
+            await asyncio.gather(
+                *(virtual_user(client, base, i, args, recorder, stop_at) for i in range(args.users)),
+                *(stats_poller(client, base, args, recorder, stop_at) for _ in range(args.pollers))
+            )
+            elapsed = time.perf_counter() - started
+
+            health = (await client.get(f"{base}/health")).json()
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=10)
+
+    return {
+        "commit": git_commit(),
+        "config": {
+            key: getattr(args, key)
+            for key in ("url", "users", "pollers", "duration", "warmup", "think_ms", "session_loops",
+                        "poll_interval", "llm_latency_ms", "llm_error_rate", "db_latency_ms", "db_pool_size", "seed")
+        },
+        "elapsed_s": round(elapsed, 2),
+        **summarize(recorder, elapsed),
+        "server_health": health
+    }
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def render(report: Dict[str, Any]) -> str:
+    lines = [f"{'endpoint':28} {'count':>7} {'errors':>7} {'rps':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"]
+    rows = list(report["endpoints"].items()) + [("overall", report["overall"])]
+    for name, row in rows:
+        lines.append(
+            f"{name:28} {row['count']:>7} {row['errors']:>7} {row['throughput_rps']:>8} "
+            f"{row['p50_ms']!s:>9} {row['p95_ms']!s:>9} {row['p99_ms']!s:>9}"
+        )
+    config = report["config"]
+    lines.append(
+        f"\n{config['users']} users, {config['pollers']} pollers, {report['elapsed_s']}s at commit {report['commit']}; "
+        f"LLM {config['llm_latency_ms']}ms / {config['llm_error_rate']:.0%} errors, DB {config['db_latency_ms']}ms per op"
+    )
+    return "\n".join(lines)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("command", nargs="?", choices=["run", "serve"], default="run")
+    parser.add_argument("--url", help="Load an already running server instead of spawning one")
+    parser.add_argument("--port", type=int, default=8100, help="Port for serve")
+    parser.add_argument("--users", type=int, default=20, help="Concurrent virtual users (and seeded accounts)")
+    parser.add_argument("--pollers", type=int, default=5, help="Landing-page visitors polling /api/public/stats")
+    parser.add_argument("--duration", type=float, default=60.0, help="Seconds of recorded load")
+    parser.add_argument("--warmup", type=float, default=5.0, help="Unrecorded seconds before the run")
+    parser.add_argument("--think-ms", type=float, default=200.0, help="Mean pause between a user's requests")
+    parser.add_argument("--session-loops", type=int, default=5, help="Journeys per login")
+    parser.add_argument("--poll-interval", type=float, default=1.0)
+    parser.add_argument("--timeout", type=float, default=120.0, help="Per-request client timeout")
+    parser.add_argument("--llm-latency-ms", type=float, default=1500.0)
+    parser.add_argument("--llm-error-rate", type=float, default=0.0)
+    parser.add_argument("--db-latency-ms", type=float, default=2.0, help="Simulated round trip per database operation")
+    parser.add_argument("--db-pool-size", type=int, default=None, help="Simulated connection pool size")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--server-logs", action="store_true", help="Show the spawned server's stderr")
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    parser.add_argument("--json", action="store_true", help="Emit machine-readable JSON")
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        serve(args)
+        return
+
+    report = asyncio.run(load(args))
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.output).write_text(json.dumps(report, indent=2, default=str))
+    if args.json:
+        print(json.dumps(report, indent=2, default=str))
+    else:
+        print(render(report))
+
+if __name__ == "__main__":
+    main()
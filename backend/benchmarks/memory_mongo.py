@@ -0,0 +1,535 @@
+# backend/benchmarks/memory_mongo.py - IN-MEMORY MOTOR STAND-IN FOR BENCHMARKS
+"""Just enough of Motor's async API, kept in memory, to run the app without MongoDB.
+
+Covers the queries ``app.database.mongodb`` and the routers issue: equality,
+comparison, ``$in``/``$ne``/``$exists`` filters on dotted paths, projections,
+sort/skip/limit cursors, ``$set``/``$unset``/``$inc``/``$push`` updates,
+unique indexes and the ``$match``/``$unwind``/``$group``/``$project``/``$sort``
+aggregations behind analytics. Every operation waits ``latency_ms`` (one round
+trip) and, with ``pool_size``, queues for one of that many connections, so
+results track round-trip counts and pool pressure rather than raw CPU.
+``connect_ms`` charges opening a connection (TCP + TLS + auth) the first
+time the pool grows past ``min_pool_size`` warm ones, and
+``wait_queue_timeout_ms`` makes a starved operation fail the way pymongo's
+``waitQueueTimeoutMS`` does.
+
+    from benchmarks.memory_mongo import install_memory_database
+    await install_memory_database(latency_ms=2.0)
+"""
+import asyncio
+import copy
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from bson import ObjectId
+from pymongo.errors import BulkWriteError, DuplicateKeyError, WaitQueueTimeoutError
+
+_MISSING = object()
+
+def _get(doc: Any, path: str) -> Any:
+    for part in path.split("."):
+        if isinstance(doc, dict) and part in doc:
+            doc = doc[part]
+        else:
+            return _MISSING
+    return doc
+
+def _set(doc: Dict[str, Any], path: str, value: Any):
+    parts = path.split(".")
+    for part in parts[:-1]:
+        doc = doc.setdefault(part, {})
+    doc[parts[-1]] = value
+
+def _unset(doc: Dict[str, Any], path: str):
+    parts = path.split(".")
+    for part in parts[:-1]:
+        doc = doc.get(part)
+        if not isinstance(doc, dict):
+            return
+    doc.pop(parts[-1], None)
+
+def _sort_key(value: Any) -> Tuple[int, Any]:
+    # Mongo orders missing/None before numbers, strings, dates
+    if value is _MISSING or value is None:
+        return (0, 0)
+    if isinstance(value, bool):
+        return (4, value)
+    if isinstance(value, (int, float)):
+        return (1, value)
+    if isinstance(value, str):
+        return (2, value)
+    if isinstance(value, datetime):
+        return (3, value)
+    return (5, str(value))
+
+def _compare(value: Any, op: str, operand: Any) -> bool:
+    if op == "$exists":
+        return (value is not _MISSING) == bool(operand)
+    if op == "$ne":
+        return not _compare(value, "$eq", operand)
+    if op == "$eq":
+        if isinstance(value, list) and not isinstance(operand, list):
+            return operand in value
+        return (None if value is _MISSING else value) == operand
+    if op == "$in":
+        return any(_compare(value, "$eq", candidate) for candidate in operand)
+    if op == "$nin":
+        return not _compare(value, "$in", operand)
+    if value is _MISSING or value is None:
+        return False
+    try:
+        if op == "$gt":
+            return value > operand
+        if op == "$gte":
+            return value >= operand
+        if op == "$lt":
+            return value < operand
+        if op == "$lte":
+            return value <= operand
+    except TypeError:
+        return False
+    raise NotImplementedError(f"query operator {op}")
+
+def matches(doc: Dict[str, Any], query: Optional[Dict[str, Any]]) -> bool:
+    for key, condition in (query or {}).items():
+        if key == "$and":
+            if not all(matches(doc, sub) for sub in condition):
+                return False
+            continue
+        if key == "$or":
+            if not any(matches(doc, sub) for sub in condition):
+                return False
+            continue
+        value = _get(doc, key)
+        if isinstance(condition, dict) and condition and all(k.startswith("$") for k in condition):
+            if not all(_compare(value, op, operand) for op, operand in condition.items()):
+                return False
+        elif not _compare(value, "$eq", condition):
+            return False
+    return True
+
+def project(doc: Dict[str, Any], projection: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    if not projection:
+        return copy.deepcopy(doc)
+    include_id = projection.get("_id", 1)
+    fields = {k: v for k, v in projection.items() if k != "_id"}
+    if fields and any(fields.values()):
+        result: Dict[str, Any] = {}
+        for path in fields:
+            value = _get(doc, path)
+            if value is not _MISSING:
+                _set(result, path, copy.deepcopy(value))
+    else:
+        result = copy.deepcopy(doc)
+        for path in fields:
+            _unset(result, path)
+    if include_id and "_id" in doc:
+        result["_id"] = doc["_id"]
+    else:
+        result.pop("_id", None)
+    return result
+
+def apply_update(doc: Dict[str, Any], update: Dict[str, Any]):
+    for op, fields in update.items():
+        for path, value in fields.items():
+            if op == "$set":
+                _set(doc, path, copy.deepcopy(value))
+            elif op == "$unset":
+                _unset(doc, path)
+            elif op == "$inc":
+                current = _get(doc, path)
+                _set(doc, path, (0 if current is _MISSING else current) + value)
+            elif op == "$push":
+                current = _get(doc, path)
+                _set(doc, path, ([] if current is _MISSING else current) + [copy.deepcopy(value)])
+            elif op == "$addToSet":
+                current = _get(doc, path)
+                current = [] if current is _MISSING else current
+                if value not in current:
+                    _set(doc, path, current + [copy.deepcopy(value)])
+            else:
+                raise NotImplementedError(f"update operator {op}")
+
+def _sort_docs(docs: List[Dict[str, Any]], spec: Iterable[Tuple[str, int]]) -> List[Dict[str, Any]]:
+    for key, direction in reversed(list(spec)):
+        docs = sorted(docs, key=lambda d: _sort_key(_get(d, key)), reverse=direction < 0)
+    return docs
+
+def _evaluate(expression: Any, doc: Dict[str, Any]) -> Any:
+    if isinstance(expression, str) and expression.startswith("$"):
+        value = _get(doc, expression[1:])
+        return None if value is _MISSING else value
+    if isinstance(expression, dict):
+        if "$dateToString" in expression:
+            spec = expression["$dateToString"]
+            date = _evaluate(spec["date"], doc)
+            return date.strftime(spec.get("format", "%Y-%m-%dT%H:%M:%S.%LZ")) if date else None
+        return {key: _evaluate(value, doc) for key, value in expression.items()}
+    return expression
+
+def _group(docs: List[Dict[str, Any]], spec: Dict[str, Any]) -> List[Dict[str, Any]]:
+    groups: Dict[Any, Dict[str, Any]] = {}
+    members: Dict[Any, List[Dict[str, Any]]] = {}
+    for doc in docs:
+        group_id = _evaluate(spec["_id"], doc)
+        key = repr(group_id)
+        groups.setdefault(key, {"_id": group_id})
+        members.setdefault(key, []).append(doc)
+
+    for key, group in groups.items():
+        for field, accumulator in spec.items():
+            if field == "_id":
+                continue
+            (op, argument), = accumulator.items()
+            values = [_evaluate(argument, doc) for doc in members[key]]
+            present = [v for v in values if v is not None]
+            if op == "$sum":
+                group[field] = sum(v for v in values if isinstance(v, (int, float)))
+            elif op == "$avg":
+                group[field] = sum(present) / len(present) if present else None
+            elif op == "$max":
+                group[field] = max(present, key=_sort_key) if present else None
+            elif op == "$min":
+                group[field] = min(present, key=_sort_key) if present else None
+            elif op == "$first":
+                group[field] = values[0] if values else None
+            elif op == "$push":
+                group[field] = values
+            else:
+                raise NotImplementedError(f"group accumulator {op}")
+    return list(groups.values())
+
+def aggregate_docs(docs: List[Dict[str, Any]], pipeline: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    for stage in pipeline:
+        (name, spec), = stage.items()
+        if name == "$match":
+            docs = [d for d in docs if matches(d, spec)]
+        elif name == "$unwind":
+            path = (spec if isinstance(spec, str) else spec["path"])[1:]
+            unwound = []
+            for doc in docs:
+                values = _get(doc, path)
+                for value in values if isinstance(values, list) else []:
+                    item = dict(doc)
+                    _set(item, path, value)
+                    unwound.append(item)
+            docs = unwound
+        elif name == "$group":
+            docs = _group(docs, spec)
+        elif name == "$project":
+            projected = []
+            for doc in docs:
+                item = {} if spec.get("_id", 1) == 0 else {"_id": doc.get("_id")}
+                for field, rule in spec.items():
+                    if field == "_id":
+                        continue
+                    if rule in (1, True):
+                        value = _get(doc, field)
+                        if value is not _MISSING:
+                            _set(item, field, value)
+                    elif rule not in (0, False):
+                        _set(item, field, _evaluate(rule, doc))
+                projected.append(item)
+            docs = projected
+        elif name == "$sort":
+            docs = _sort_docs(docs, spec.items())
+        elif name == "$skip":
+            docs = docs[spec:]
+        elif name == "$limit":
+            docs = docs[:spec]
+        elif name == "$count":
+            docs = [{spec: len(docs)}] if docs else []
+        else:
+            raise NotImplementedError(f"aggregation stage {name}")
+    return docs
+
+class _Result:
+    def __init__(self, **fields):
+        self.__dict__.update(fields)
+
+class MemoryCursor:
+    def __init__(self, collection: "MemoryCollection", query=None, projection=None, pipeline=None):
+        self._collection = collection
+        self._query = query
+        self._projection = projection
+        self._pipeline = pipeline
+        self._sort: List[Tuple[str, int]] = []
+        self._skip = 0
+        self._limit = 0
+
+    def sort(self, key, direction: Optional[int] = None):
+        self._sort = list(key) if isinstance(key, (list, tuple)) else [(key, direction or 1)]
+        return self
+
+    def skip(self, count: int):
+        self._skip = count
+        return self
+
+    def limit(self, count: int):
+        self._limit = count
+        return self
+
+    def _run(self) -> List[Dict[str, Any]]:
+        docs = self._collection._docs
+        if self._pipeline is not None:
+            return [copy.deepcopy(d) for d in aggregate_docs(list(docs), self._pipeline)]
+        found = [d for d in docs if matches(d, self._query)]
+        if self._sort:
+            found = _sort_docs(found, self._sort)
+        found = found[self._skip:]
+        if self._limit:
+            found = found[:self._limit]
+        return [project(d, self._projection) for d in found]
+
+    async def to_list(self, length: Optional[int] = None) -> List[Dict[str, Any]]:
+        async with self._collection._client._round_trip():
+            docs = self._run()
+        return docs[:length] if length else docs
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for doc in await self.to_list(None):
+            yield doc
+
+class MemoryCollection:
+    def __init__(self, client: "MemoryClient", name: str):
+        self._client = client
+        self.name = name
+        self._docs: List[Dict[str, Any]] = []
+        self._ids = set()  # _id lookups stay O(1) so bulk-insert runs are not quadratic
+        self._unique: List[List[str]] = []
+
+    def _check_unique(self, doc: Dict[str, Any], ignore: Optional[Dict[str, Any]] = None):
+        if ignore is None and doc.get("_id") in self._ids:
+            raise DuplicateKeyError(f"E11000 duplicate key error collection: {self.name} index: ['_id']")
+        for fields in self._unique:
+            key = [_get(doc, f) for f in fields]
+            if any(k is _MISSING for k in key):
+                continue
+            for other in self._docs:
+                if other is not ignore and [_get(other, f) for f in fields] == key:
+                    raise DuplicateKeyError(f"E11000 duplicate key error collection: {self.name} index: {fields}")
+
+    def _insert(self, document: Dict[str, Any]) -> Any:
+        doc = copy.deepcopy(document)
+        doc.setdefault("_id", ObjectId())
+        self._check_unique(doc)
+        self._docs.append(doc)
+        self._ids.add(doc["_id"])
+        # Like Motor, the caller's document gains its _id
+        document["_id"] = doc["_id"]
+        return doc["_id"]
+
+    def _first(self, query, sort=None) -> Optional[Dict[str, Any]]:
+        found = [d for d in self._docs if matches(d, query)]
+        if sort:
+            found = _sort_docs(found, sort)
+        return found[0] if found else None
+
+    async def create_index(self, keys, unique: bool = False, **options) -> str:
+        fields = [keys] if isinstance(keys, str) else [k for k, _ in keys]
+        if unique and fields not in self._unique:
+            self._unique.append(fields)
+        return "_".join(fields)
+
+    def find(self, query=None, projection=None) -> MemoryCursor:
+        return MemoryCursor(self, query, projection)
+
+    def aggregate(self, pipeline: List[Dict[str, Any]]) -> MemoryCursor:
+        return MemoryCursor(self, pipeline=pipeline)
+
+    async def find_one(self, query=None, projection=None) -> Optional[Dict[str, Any]]:
+        async with self._client._round_trip():
+            doc = self._first(query)
+            return project(doc, projection) if doc else None
+
+    async def insert_one(self, document: Dict[str, Any]):
+        async with self._client._round_trip():
+            return _Result(inserted_id=self._insert(document), acknowledged=True)
+
+    async def insert_many(self, documents: List[Dict[str, Any]], ordered: bool = True):
+        async with self._client._round_trip():
+            inserted, errors = [], []
+            for index, document in enumerate(documents):
+                try:
+                    inserted.append(self._insert(document))
+                except DuplicateKeyError as e:
+                    errors.append({"index": index, "code": 11000, "errmsg": str(e)})
+                    if ordered:
+                        break
+            if errors:
+                raise BulkWriteError({"writeErrors": errors, "nInserted": len(inserted)})
+            return _Result(inserted_ids=inserted, acknowledged=True)
+
+    async def update_one(self, query, update, upsert: bool = False):
+        async with self._client._round_trip():
+            doc = self._first(query)
+            if doc is None:
+                if not upsert:
+                    return _Result(matched_count=0, modified_count=0, upserted_id=None)
+                doc = {k: v for k, v in query.items() if not k.startswith("$") and not isinstance(v, dict)}
+                apply_update(doc, update)
+                return _Result(matched_count=0, modified_count=0, upserted_id=self._insert(doc))
+            apply_update(doc, update)
+            return _Result(matched_count=1, modified_count=1, upserted_id=None)
+
+    async def update_many(self, query, update):
+        async with self._client._round_trip():
+            found = [d for d in self._docs if matches(d, query)]
+            for doc in found:
+                apply_update(doc, update)
+            return _Result(matched_count=len(found), modified_count=len(found))
+
+    async def replace_one(self, query, replacement, upsert: bool = False):
+        async with self._client._round_trip():
+            doc = self._first(query)
+            if doc is None:
+                if not upsert:
+                    return _Result(matched_count=0, modified_count=0, upserted_id=None)
+                return _Result(matched_count=0, modified_count=0, upserted_id=self._insert(replacement))
+            new_doc = copy.deepcopy(replacement)
+            new_doc["_id"] = doc["_id"]
+            self._check_unique(new_doc, ignore=doc)
+            self._docs[self._docs.index(doc)] = new_doc
+            return _Result(matched_count=1, modified_count=1, upserted_id=None)
+
+    async def find_one_and_update(self, query, update, sort=None, return_document: bool = False, upsert: bool = False, projection=None):
+        async with self._client._round_trip():
+            doc = self._first(query, sort)
+            if doc is None:
+                return None
+            before = copy.deepcopy(doc)
+            apply_update(doc, update)
+            return project(doc if return_document else before, projection)
+
+    async def delete_one(self, query):
+        async with self._client._round_trip():
+            doc = self._first(query)
+            if doc is not None:
+                self._docs.remove(doc)
+                self._ids.discard(doc["_id"])
+            return _Result(deleted_count=int(doc is not None))
+
+    async def delete_many(self, query):
+        async with self._client._round_trip():
+            before = len(self._docs)
+            self._docs = [d for d in self._docs if not matches(d, query)]
+            self._ids = {d["_id"] for d in self._docs}
+            return _Result(deleted_count=before - len(self._docs))
+
+    async def count_documents(self, query) -> int:
+        async with self._client._round_trip():
+            return sum(1 for d in self._docs if matches(d, query))
+
+    async def distinct(self, key: str, query=None) -> List[Any]:
+        async with self._client._round_trip():
+            values = []
+            for doc in self._docs:
+                value = _get(doc, key)
+                if matches(doc, query) and value is not _MISSING and value not in values:
+                    values.append(value)
+            return values
+
+class MemoryDatabase:
+    def __init__(self, client: "MemoryClient", name: str):
+        self._client = client
+        self.name = name
+        self._collections: Dict[str, MemoryCollection] = {}
+
+    def __getitem__(self, name: str) -> MemoryCollection:
+        if name not in self._collections:
+            self._collections[name] = MemoryCollection(self._client, name)
+        return self._collections[name]
+
+    def __getattr__(self, name: str) -> MemoryCollection:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self[name]
+
+    async def command(self, name: str, *args, **kwargs) -> Dict[str, Any]:
+        async with self._client._round_trip():
+            return {"ok": 1.0}
+
+class _RoundTrip:
+    def __init__(self, client: "MemoryClient"):
+        self.client = client
+
+    async def __aenter__(self):
+        client = self.client
+        if client._pool is not None:
+            if client.wait_queue_timeout:
+                try:
+                    await asyncio.wait_for(client._pool.acquire(), timeout=client.wait_queue_timeout)
+                except asyncio.TimeoutError:
+                    client.wait_queue_timeouts += 1
+                    raise WaitQueueTimeoutError("Timed out waiting for a connection from the pool")
+            else:
+                await client._pool.acquire()
+        try:
+            if client._idle_connections:
+                client._idle_connections -= 1
+            else:
+                client.connections_opened += 1
+                if client.connect_seconds:
+                    await asyncio.sleep(client.connect_seconds)
+        except BaseException:
+            if client._pool is not None:
+                client._pool.release()
+            raise
+        client.operations += 1
+        if client.latency_seconds:
+            await asyncio.sleep(client.latency_seconds)
+
+    async def __aexit__(self, *exc):
+        self.client._idle_connections += 1
+        if self.client._pool is not None:
+            self.client._pool.release()
+
+class MemoryClient:
+    """AsyncIOMotorClient look-alike; ``latency_ms`` is charged once per operation"""
+
+    def __init__(
+        self,
+        latency_ms: float = 0.0,
+        pool_size: Optional[int] = None,
+        min_pool_size: int = 0,
+        connect_ms: float = 0.0,
+        wait_queue_timeout_ms: float = 0.0
+    ):
+        self.latency_seconds = latency_ms / 1000
+        self.connect_seconds = connect_ms / 1000
+        self.wait_queue_timeout = wait_queue_timeout_ms / 1000
+        self._pool = asyncio.Semaphore(pool_size) if pool_size else None
+        # Warm connections exist from the start, like pymongo filling minPoolSize in the background
+        self._idle_connections = min(min_pool_size, pool_size) if pool_size else min_pool_size
+        self._databases: Dict[str, MemoryDatabase] = {}
+        self.operations = 0
+        self.connections_opened = 0
+        self.wait_queue_timeouts = 0
+        self.started = time.monotonic()
+        self.admin = self["admin"]
+
+    def _round_trip(self) -> _RoundTrip:
+        return _RoundTrip(self)
+
+    def __getitem__(self, name: str) -> MemoryDatabase:
+        if name not in self._databases:
+            self._databases[name] = MemoryDatabase(self, name)
+        return self._databases[name]
+
+    def close(self):
+        pass
+
+async def install_memory_database(latency_ms: float = 0.0, pool_size: Optional[int] = None, **pool_options):
+    """Make get_database() hand out a MongoDB backed by a fresh MemoryClient"""
+    from app.database import mongodb
+
+    db = mongodb.MongoDB()
+    db.client = MemoryClient(latency_ms, pool_size, **pool_options)
+    db.database = db.client[db.settings.DATABASE_NAME]
+    await db._create_indexes()
+    mongodb._db_instance = db
+    return db
@@ -0,0 +1,156 @@
+# backend/benchmarks/pool_profile_benchmark.py - HISTORY AND ANALYTICS THROUGHPUT PER MONGO POOL PROFILE
+"""Throughput of ``/recipes/history`` and ``/analytics/dashboard`` under each MONGODB_POOL_PROFILE.
+
+Run from the backend directory:
+
+    python -m benchmarks.pool_profile_benchmark [--profiles serverless,container,high_throughput]
+        [--concurrency 32] [--duration 10] [--latency-ms 5] [--connect-ms 30] [--json]
+
+Each profile gets a fresh in-memory store sized like the profile's client:
+``maxPoolSize`` connections, ``minPoolSize`` of them already open, new ones
+costing ``--connect-ms``, and ``waitQueueTimeoutMS`` failing starved
+operations. The app runs in-process (one worker). ``--concurrency``
+clients then alternate between the two endpoints for ``--duration``
+seconds, starting from the profile's warm pool. Compression and
+read/write concerns have no in-memory equivalent and are not measured.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+# Settings are read once, so the environment must be in place before the app is imported
+os.environ.setdefault("LLM_PROVIDER", "mock")
+os.environ.setdefault("ENABLE_RECIPE_POOL", "false")
+
+from benchmarks.load_test import INGREDIENTS, MOODS, percentile, seed_users
+from benchmarks.memory_mongo import install_memory_database
+
+ENDPOINTS = {"history": "/recipes/history", "dashboard": "/analytics/dashboard"}
+
+async def seed_activity(db, user_ids: List[str], per_user: int):
+    now = datetime.utcnow()
+    rng = random.Random(7)
+    history, moods = [], []
+    for user_id in user_ids:
+        for index in range(per_user):
+            created_at = now - timedelta(hours=index * 7)
+            history.append({
+                "user_id": user_id,
+                "recipe": {
+                    "title": f"Recipe {index}",
+                    "cuisine_type": rng.choice(["italian", "indian", "thai"]),
+                    "total_time": rng.randint(10, 60)
+                },
+                "ingredients_used": rng.sample(INGREDIENTS, 3),
+                "mood": rng.choice(MOODS),
+                "created_at": created_at
+            })
+            moods.append({"user_id": user_id, "mood": rng.choice(MOODS), "energy_level": 5, "timestamp": created_at})
+    await db.database.recipe_history.insert_many(history)
+    await db.database.mood_logs.insert_many(moods)
+
+async def run_profile(name: str, args) -> Dict[str, Any]:
+    import httpx
+
+    from app.core.config import get_settings
+    from app.database.pool_profiles import resolve_pool_profile
+    from app.routers.deps import get_auth_service
+    from main import app
+
+    pool_options, _ = resolve_pool_profile(get_settings(), name)
+    db = await install_memory_database(
+        args.latency_ms,
+        pool_options["maxPoolSize"],
+        min_pool_size=pool_options.get("minPoolSize", 0),
+        connect_ms=args.connect_ms,
+        wait_queue_timeout_ms=pool_options.get("waitQueueTimeoutMS", 0)
+    )
+    await seed_users(db, args.users)
+    users = await db.database.users.find({}).to_list(length=None)
+    await seed_activity(db, [str(user["_id"]) for user in users], args.history)
+    tokens = [get_auth_service().create_profile_access_token(user)["access_token"] for user in users]
+
+    connections_before = db.client.connections_opened
+
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+    deadline = time.perf_counter() + args.duration
+
+    async def client_loop(client, index: int):
+        headers = {"Authorization": f"Bearer {tokens[index % len(tokens)]}"}
+        names = list(ENDPOINTS)
+        turn = index
+        while time.perf_counter() < deadline:
+            endpoint = names[turn % len(names)]
+            turn += 1
+            started = time.perf_counter()
+            response = await client.get(ENDPOINTS[endpoint], headers=headers)
+            latencies[endpoint].append((time.perf_counter() - started) * 1000)
+            if response.status_code != 200:
+                errors[endpoint] += 1
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(client_loop(client, index) for index in range(args.concurrency)))
+        elapsed = time.perf_counter() - started
+
+    endpoints = {}
+    for endpoint in ENDPOINTS:
+        ordered = sorted(latencies[endpoint])
+        endpoints[endpoint] = {
+            "requests": len(ordered),
+            "errors": errors[endpoint],
+            "throughput_rps": round(len(ordered) / elapsed, 1),
+            "p50_ms": percentile(ordered, 50) if ordered else None,
+            "p95_ms": percentile(ordered, 95) if ordered else None
+        }
+    return {
+        "profile": name,
+        "pool": {key: value for key, value in pool_options.items() if key != "compressors"},
+        "endpoints": endpoints,
+        "connections_opened": db.client.connections_opened - connections_before,
+        "wait_queue_timeouts": db.client.wait_queue_timeouts
+    }
+
+async def main_async(args):
+    import logging
+
+    # Per-request info logs would dominate the measurement
+    logging.disable(logging.INFO)
+    results = [await run_profile(name, args) for name in args.profiles.split(",")]
+    if args.json:
+        print(json.dumps({"results": results}, indent=2))
+        return
+    print(
+        f"{args.concurrency} clients, {args.duration:.0f}s per profile, {args.latency_ms} ms round trip, "
+        f"{args.connect_ms} ms per new connection"
+    )
+    print(f"{'profile':<17}{'pool':>6}{'endpoint':>11}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'errors':>8}{'opened':>8}")
+    for result in results:
+        for endpoint, stats in result["endpoints"].items():
+            print(
+                f"{result['profile']:<17}{result['pool']['maxPoolSize']:>6}{endpoint:>11}{stats['throughput_rps']:>9}"
+                f"{stats['p50_ms']:>9}{stats['p95_ms']:>9}{stats['errors']:>8}{result['connections_opened']:>8}"
+            )
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profiles", default="serverless,container,high_throughput")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--users", type=int, default=32)
+    parser.add_argument("--history", type=int, default=30, help="Recipes and mood logs seeded per user")
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    parser.add_argument("--connect-ms", type=float, default=30.0, help="Cost of opening a connection (TCP + TLS + auth)")
+    parser.add_argument("--json", action="store_true")
+    asyncio.run(main_async(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+# backend/benchmarks/recipe_parser_benchmark.py - PARSE TIME & RETRY AVOIDANCE
+"""Compare the incremental recipe parser with the previous regex cleanup.
+
+Run from the backend directory:
+
+    python -m benchmarks.recipe_parser_benchmark [--iterations 500] [--chunk-size 32] [--json]
+
+A parse "succeeds" when it yields a title plus non-empty ingredients and
+instructions, i.e. when generate_recipe would accept it without asking the
+model again. The retry-avoidance rate is the share of repairable responses
+(malformed, but complete) the legacy parser rejected that the new parser
+salvages. Truncated responses have lost fields, so a retry is the correct
+outcome; they are reported separately and count as correct only when the
+parser rejects them.
+"""
+import argparse
+import json
+import re
+import time
+from typing import Any, Dict, Optional
+
+from app.services.recipe_parser import IncrementalRecipeParser, parse_recipe_json
+from benchmarks.recipe_response_corpus import corpus
+
+def legacy_parse(response_text: str) -> Dict[str, Any]:
+    """The fence-strip + regex-repair logic RecipeService used before the incremental parser"""
+    cleaned_text = response_text.strip()
+    if cleaned_text.startswith('```json'):
+        cleaned_text = cleaned_text[7:]
+    elif cleaned_text.startswith('```'):
+        cleaned_text = cleaned_text[3:]
+    if cleaned_text.endswith('```'):
+        cleaned_text = cleaned_text[:-3]
+    cleaned_text = cleaned_text.strip()
+
+    json_match = re.search(r'\{.*\}', cleaned_text, re.DOTALL)
+    if json_match:
+        cleaned_text = json_match.group()
+
+    cleaned_text = re.sub(r',(\s*[}\]])', r'\1', cleaned_text)
+    cleaned_text = re.sub(r'"\s*\n\s*"', '",\n"', cleaned_text)
+
+    try:
+        return json.loads(cleaned_text)
+    except json.JSONDecodeError:
+        start = cleaned_text.find('{')
+        end = cleaned_text.rfind('}')
+        if start != -1 and end != -1:
+            return json.loads(cleaned_text[start:end + 1])
+        raise
+
+def incremental_parse(response_text: str) -> Dict[str, Any]:
+    return parse_recipe_json(response_text)[0]
+
+def chunked_parse(response_text: str, chunk_size: int) -> Dict[str, Any]:
+    parser = IncrementalRecipeParser()
+    for i in range(0, len(response_text), chunk_size):
+        parser.feed(response_text[i:i + chunk_size])
+    return parser.finish()
+
+def usable(recipe_data: Optional[Dict[str, Any]]) -> bool:
+    return bool(
+        isinstance(recipe_data, dict)
+        and recipe_data.get("title")
+        and recipe_data.get("ingredients")
+        and recipe_data.get("instructions")
+    )
+
+def attempt(parse, text: str) -> Optional[Dict[str, Any]]:
+    try:
+        return parse(text)
+    except Exception:
+        return None
+
+def time_parse(parse, text: str, iterations: int) -> float:
+    """Mean microseconds per parse (failures included -- they cost time too)"""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        attempt(parse, text)
+    return (time.perf_counter() - start) / iterations * 1_000_000
+
+def run(iterations: int, chunk_size: int) -> Dict[str, Any]:
+    rows = []
+    for entry in corpus():
+        text = entry["text"]
+        legacy_ok = usable(attempt(legacy_parse, text))
+        new_data, parser = None, None
+        try:
+            new_data, parser = parse_recipe_json(text)
+        except Exception:
+            pass
+        rows.append({
+            "name": entry["name"],
+            "kind": entry["kind"],
+            "chars": len(text),
+            "legacy_ok": legacy_ok,
+            "incremental_ok": usable(new_data),
+            "salvaged_fields": parser.salvaged_fields if parser else [],
+            "legacy_us": round(time_parse(legacy_parse, text, iterations), 1),
+            "incremental_us": round(time_parse(incremental_parse, text, iterations), 1),
+            "chunked_us": round(time_parse(lambda t: chunked_parse(t, chunk_size), text, iterations), 1)
+        })
+
+    complete = [r for r in rows if r["kind"] != "truncated"]
+    truncated = [r for r in rows if r["kind"] == "truncated"]
+    legacy_failures = [r for r in complete if not r["legacy_ok"]]
+    avoided = [r for r in legacy_failures if r["incremental_ok"]]
+    total = len(rows)
+    return {
+        "iterations": iterations,
+        "chunk_size": chunk_size,
+        "responses": total,
+        "legacy_success_rate": round(sum(r["legacy_ok"] for r in complete) / len(complete), 3),
+        "incremental_success_rate": round(sum(r["incremental_ok"] for r in complete) / len(complete), 3),
+        "retry_avoidance_rate": round(len(avoided) / len(legacy_failures), 3) if legacy_failures else 1.0,
+        "truncated_responses": len(truncated),
+        "truncated_rejected": sum(1 for r in truncated if not r["incremental_ok"]),
+        "mean_legacy_us": round(sum(r["legacy_us"] for r in rows) / total, 1),
+        "mean_incremental_us": round(sum(r["incremental_us"] for r in rows) / total, 1),
+        "mean_chunked_us": round(sum(r["chunked_us"] for r in rows) / total, 1),
+        "rows": rows
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--chunk-size", type=int, default=32, help="Chunk size for the streaming-feed timing")
+    parser.add_argument("--json", action="store_true", help="Emit machine-readable JSON")
+    args = parser.parse_args()
+
+    result = run(args.iterations, args.chunk_size)
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+
+    print(f"{'response':48} {'legacy':>7} {'new':>5} {'legacy µs':>10} {'new µs':>8} {'chunked µs':>11}  salvaged")
+    for r in result["rows"]:
+        print(
+            f"{r['name']:48} {'ok' if r['legacy_ok'] else 'FAIL':>7} {'ok' if r['incremental_ok'] else 'FAIL':>5} "
+            f"{r['legacy_us']:>10} {r['incremental_us']:>8} {r['chunked_us']:>11}  {','.join(r['salvaged_fields'])}"
+        )
+    print()
+    print(f"Legacy success rate:      {result['legacy_success_rate']:.1%} (complete responses)")
+    print(f"Incremental success rate: {result['incremental_success_rate']:.1%} (complete responses)")
+    print(f"Retry avoidance rate:     {result['retry_avoidance_rate']:.1%}")
+    print(f"Truncated, sent to retry: {result['truncated_rejected']}/{result['truncated_responses']}")
+    print(f"Mean parse time (µs):     legacy {result['mean_legacy_us']}, "
+          f"incremental {result['mean_incremental_us']}, chunked {result['mean_chunked_us']}")
+
+if __name__ == "__main__":
+    main()
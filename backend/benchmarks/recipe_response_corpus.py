@@ -0,0 +1,105 @@
+# backend/benchmarks/recipe_response_corpus.py - RECIPE RESPONSES SEEN FROM GEMINI
+"""Representative model outputs for the recipe prompt.
+
+``REAL_RESPONSES`` are responses in the shapes Gemini actually returns (fenced,
+bare, prose-wrapped). ``corpus()`` adds the malformed variants that used to send
+``generate_recipe`` back to the model: trailing commas, missing commas between
+strings, responses cut off mid-array and mid-string.
+"""
+from typing import Callable, Dict, List
+
+REAL_RESPONSES: Dict[str, str] = {
+    "fenced_tired": '''```json
+{
+  "title": "Cozy Garlic Chicken Rice Bowl",
+  "description": "A one-pan, low-effort bowl that restores energy when you are running on empty.",
+  "ingredients": [
+    "300g chicken breast, diced",
+    "1 cup jasmine rice",
+    "4 cloves garlic, minced",
+    "1 tbsp oil",
+    "1 tsp salt",
+    "2 cups water"
+  ],
+  "instructions": [
+    "Rinse the rice until the water runs clear.",
+    "Heat the oil in a deep pan and fry the garlic for 30 seconds.",
+    "Add the chicken and salt; cook until lightly browned.",
+    "Stir in the rice and water, cover, and simmer for 15 minutes.",
+    "Rest covered for 5 minutes, fluff and serve."
+  ],
+  "prep_time": 10,
+  "cook_time": 25,
+  "total_time": 35,
+  "servings": 2,
+  "difficulty": "easy",
+  "cuisine_type": "asian",
+  "nutrition_info": {
+    "calories": 520,
+    "protein": 42,
+    "carbs": 58,
+    "fat": 11,
+    "fiber": 2,
+    "sugar": 1,
+    "sodium": 640
+  },
+  "tags": ["mood-based", "tired", "one-pan"]
+}
+```''',
+    "bare_happy": '''{"title": "Sunshine Tomato Basil Pasta", "description": "Bright, \\"zingy\\" pasta that matches a happy mood.", "ingredients": ["200g pasta", "3 ripe tomatoes, chopped", "1 onion, sliced", "2 cloves garlic", "Handful of basil", "2 tbsp olive oil", "Salt and pepper"], "instructions": ["Boil the pasta in salted water until al dente.", "Saute the onion and garlic in olive oil.", "Add the tomatoes and cook down for 8 minutes.", "Toss with pasta and torn basil."], "prep_time": 10, "cook_time": 20, "total_time": 30, "servings": 2, "difficulty": "easy", "cuisine_type": "italian", "nutrition_info": {"calories": 430, "protein": 13, "carbs": 72, "fat": 10, "fiber": 6, "sugar": 9, "sodium": 380}, "tags": ["mood-based", "happy", "vegetarian"]}''',
+    "prose_stressed": '''Here is a calming recipe for you:
+
+```json
+{
+  "title": "Soothing Spinach & Lentil Soup",
+  "description": "A slow, meditative soup with gentle flavours.",
+  "ingredients": ["1 cup red lentils", "2 cups spinach", "1 carrot, diced", "1 tsp cumin", "4 cups water", "1 tbsp oil", "Salt"],
+  "instructions": ["Warm the oil and toast the cumin.", "Add carrot and lentils, then the water.", "Simmer 20 minutes until lentils collapse.", "Stir in spinach until wilted; season."],
+  "prep_time": 10,
+  "cook_time": 25,
+  "total_time": 35,
+  "servings": 2,
+  "difficulty": "easy",
+  "cuisine_type": "mediterranean",
+  "nutrition_info": {"calories": 340, "protein": 21, "carbs": 52, "fat": 6, "fiber": 14, "sugar": 5, "sodium": 420},
+  "tags": ["mood-based", "stressed", "comfort"]
+}
+```
+
+Enjoy your meal!''',
+}
+
+def _trailing_commas(text: str) -> str:
+    return text.replace('"\n  ],', '",\n  ],').replace('"]', '",]').replace('}\n}', '},\n}')
+
+def _missing_commas(text: str) -> str:
+    return text.replace('",\n    "', '"\n    "').replace('", "', '" "')
+
+def _truncate(fraction: float) -> Callable[[str], str]:
+    return lambda text: text[:int(len(text) * fraction)]
+
+def _unterminated_ingredients(text: str) -> str:
+    # The model forgets to close the ingredients array before the next key
+    return text.replace('"\n  ],\n  "instructions"', '",\n  "instructions"').replace('"], "instructions"', '", "instructions"')
+
+MALFORMATIONS: Dict[str, Callable[[str], str]] = {
+    "trailing_commas": _trailing_commas,
+    "missing_commas": _missing_commas,
+    "unterminated_ingredients": _unterminated_ingredients,
+}
+
+# Cut off mid-response: fields are lost, so asking the model again is the right outcome
+TRUNCATIONS: Dict[str, Callable[[str], str]] = {
+    "truncated_90": _truncate(0.9),
+    "truncated_75": _truncate(0.75),
+}
+
+def corpus() -> List[Dict[str, str]]:
+    entries = [{"name": name, "kind": "real", "text": text} for name, text in REAL_RESPONSES.items()]
+    for name, text in REAL_RESPONSES.items():
+        for kind, transforms in (("malformed", MALFORMATIONS), ("truncated", TRUNCATIONS)):
+            for defect, transform in transforms.items():
+                mutated = transform(text)
+                if mutated != text:
+                    entries.append({"name": f"{name}/{defect}", "kind": kind, "text": mutated})
+    return entries
@@ -0,0 +1,104 @@
+# backend/benchmarks/write_buffer_benchmark.py - INSERT THROUGHPUT WITH AND WITHOUT THE WRITE BUFFER
+"""Burst insert throughput of history and mood-log writes, direct vs buffered.
+
+Run from the backend directory:
+
+    python -m benchmarks.write_buffer_benchmark [--writes 2000] [--users 50] [--latency-ms 5] [--pool-size 1] [--json]
+
+``--users`` users each fire their share of ``save_mood_log`` /
+``save_daily_mood_log`` / ``save_recipe_history`` calls at once against the
+in-memory store, which charges ``--latency-ms`` per round trip over
+``--pool-size`` connections (1 = the serverless pool). Afterwards every user
+reads their history back, checking read-your-writes. Inserts per second
+count until every insert is durable and read back; "acked" is when the last
+save call returned.
+"""
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime
+from typing import Any, Dict
+
+from benchmarks.memory_mongo import install_memory_database
+from app.database.mongodb import WriteBuffer
+
+def history_document(user_id: str, index: int) -> Dict[str, Any]:
+    return {
+        "user_id": user_id,
+        "recipe": {"title": f"Recipe {index}"},
+        "ingredients_used": ["rice", "egg"],
+        "mood": "happy",
+        "created_at": datetime.utcnow()
+    }
+
+def mood_document(user_id: str) -> Dict[str, Any]:
+    return {"user_id": user_id, "mood": "happy", "energy_level": 5, "timestamp": datetime.utcnow()}
+
+async def run(mode: str, args) -> Dict[str, Any]:
+    db = await install_memory_database(args.latency_ms, args.pool_size)
+    if mode == "buffered":
+        db.write_buffer = WriteBuffer(db, args.max_docs, args.flush_ms / 1000)
+    users = [f"user{i}" for i in range(args.users)]
+    per_user = max(1, args.writes // (3 * args.users))
+
+    async def user_burst(user_id: str):
+        calls = []
+        for index in range(per_user):
+            calls.append(db.save_recipe_history(history_document(user_id, index)))
+            calls.append(db.save_mood_log(mood_document(user_id)))
+            calls.append(db.save_daily_mood_log(mood_document(user_id)))
+        await asyncio.gather(*calls)
+
+    operations_before = db.client.operations
+    started = time.perf_counter()
+    await asyncio.gather(*(user_burst(user_id) for user_id in users))
+    acknowledged = time.perf_counter() - started
+
+    # Read-your-writes: each user's own history must be complete straight away
+    histories = await asyncio.gather(*(db.get_recipe_history(user_id, limit=per_user + 1) for user_id in users))
+    stale_reads = sum(1 for history in histories if len(history) != per_user)
+    await db.close()
+    durable = time.perf_counter() - started
+
+    writes = per_user * 3 * len(users)
+    return {
+        "mode": mode,
+        "writes": writes,
+        "acknowledged_seconds": round(acknowledged, 3),
+        # Until everything is written and read back, so buffering gets no credit for deferring work
+        "inserts_per_second": round(writes / durable, 1),
+        "durable_seconds": round(durable, 3),
+        "round_trips": db.client.operations - operations_before,
+        "stale_reads": stale_reads,
+        "write_buffer": db.write_buffer.stats() if db.write_buffer else None
+    }
+
+async def main_async(args):
+    results = [await run("direct", args), await run("buffered", args)]
+    speedup = round(results[1]["inserts_per_second"] / results[0]["inserts_per_second"], 1)
+    if args.json:
+        print(json.dumps({"results": results, "speedup": speedup}, indent=2))
+        return
+    print(f"{results[0]['writes']} inserts from {args.users} users, {args.latency_ms} ms round trip, pool of {args.pool_size}")
+    print(f"{'mode':<10}{'inserts/s':>12}{'acked (s)':>12}{'durable (s)':>13}{'round trips':>13}{'stale reads':>13}")
+    for result in results:
+        print(
+            f"{result['mode']:<10}{result['inserts_per_second']:>12}{result['acknowledged_seconds']:>12}"
+            f"{result['durable_seconds']:>13}{result['round_trips']:>13}{result['stale_reads']:>13}"
+        )
+    print(f"speedup: {speedup}x")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--writes", type=int, default=2000)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    parser.add_argument("--pool-size", type=int, default=1)
+    parser.add_argument("--max-docs", type=int, default=100)
+    parser.add_argument("--flush-ms", type=float, default=250.0)
+    parser.add_argument("--json", action="store_true")
+    asyncio.run(main_async(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()